@@ -189,7 +189,9 @@ class ArtistFinder:
     def find_all_related_urls(cls, *urls: InfoUrl) -> list[InfoUrl | GalleryUrl]:
         found_artist_urls: list[GalleryUrl | InfoUrl | UnknownUrl] = []
         for url in urls:
-            found_artist_urls += [u for u in cls.extract_related_urls_recursively(url, found_artist_urls) if u not in found_artist_urls]
+            related_urls = cls.extract_related_urls_recursively(url, found_artist_urls)
+            already_found = set(found_artist_urls)  # the recursion appends to found_artist_urls in place
+            found_artist_urls += [u for u in related_urls if u not in already_found]
 
         if unknown := list(filter(lambda x: isinstance(x, UnknownUrl), found_artist_urls)):
             raise NotImplementedError(unknown)
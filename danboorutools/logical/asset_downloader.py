@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import BoundedSemaphore, Lock
+from typing import TYPE_CHECKING
+
+from danboorutools import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from danboorutools.models.file import File
+    from danboorutools.models.url import GalleryUrl, PostUrl, _AssetUrl
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class DomainProgress:
+    def __init__(self) -> None:
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.downloaded_bytes = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def throughput(self) -> float:
+        """Downloaded bytes per second since the first asset of this domain was queued."""
+        return self.downloaded_bytes / max(time.monotonic() - self.started_at, 1e-6)
+
+    def __str__(self) -> str:
+        return (f"{self.done + self.failed}/{self.total} assets ({self.failed} failed), "
+                f"{self.downloaded_bytes / 1024 / 1024:.1f}MB at {self.throughput / 1024 / 1024:.2f}MB/s")
+
+
+class AssetDownloader:
+    """Download the files of many assets concurrently.
+
+    Up to max_workers assets are downloaded at a time, and no more than MAX_CONCURRENT_REQUESTS_PER_DOMAIN of their session
+    from the same domain. Every request still goes through the session's shared rate limit, and interrupted downloads are resumed
+    where they left off by Session.download_file.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+        self.progress: defaultdict[str, DomainProgress] = defaultdict(DomainProgress)
+        self.errors: dict[_AssetUrl, Exception] = {}
+
+        self._lock = Lock()
+        self._domain_semaphores: dict[str, BoundedSemaphore] = {}
+
+    def download(self, assets: Iterable[_AssetUrl]) -> dict[_AssetUrl, list[File]]:
+        """Download every asset and return their files, in the same order. Failed assets are logged and kept in self.errors."""
+        unique_assets = list(dict.fromkeys(assets))
+        for asset in unique_assets:
+            self.progress[asset.parsed_url.domain].total += 1
+
+        results: dict[_AssetUrl, list[File]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._download, asset): asset for asset in unique_assets}
+            for future in as_completed(futures):
+                asset = futures[future]
+                try:
+                    results[asset] = future.result()
+                except Exception as e:  # noqa: BLE001
+                    self.errors[asset] = e
+                    self._record(asset, files=None)
+                    logger.error(f"Failed to download {asset}: {e!r}")
+
+        return {asset: results[asset] for asset in unique_assets if asset in results}
+
+    def download_posts(self, posts: Iterable[PostUrl | GalleryUrl]) -> dict[_AssetUrl, list[File]]:
+        """Download the assets of several posts, extracting the asset lists of the posts concurrently as well."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            asset_lists = list(executor.map(lambda post: post.assets, posts))
+        return self.download(asset for assets in asset_lists for asset in assets)
+
+    def _download(self, asset: _AssetUrl) -> list[File]:
+        with self._semaphore_for(asset):
+            files = asset.files
+        self._record(asset, files)
+        return files
+
+    def _semaphore_for(self, asset: _AssetUrl) -> BoundedSemaphore:
+        domain = asset.parsed_url.domain
+        with self._lock:
+            if (semaphore := self._domain_semaphores.get(domain)) is None:
+                semaphore = self._domain_semaphores[domain] = BoundedSemaphore(asset.session.MAX_CONCURRENT_REQUESTS_PER_DOMAIN)
+        return semaphore
+
+    def _record(self, asset: _AssetUrl, files: list[File] | None) -> None:
+        domain = asset.parsed_url.domain
+        with self._lock:
+            progress = self.progress[domain]
+            if files is None:
+                progress.failed += 1
+            else:
+                progress.done += 1
+                progress.downloaded_bytes += sum(file.file_size for file in files)
+            logger.info(f"[{domain}] {progress}")
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                domain: {
+                    "total": progress.total,
+                    "done": progress.done,
+                    "failed": progress.failed,
+                    "bytes": progress.downloaded_bytes,
+                    "bytes_per_second": progress.throughput,
+                }
+                for domain, progress in self.progress.items()
+            }
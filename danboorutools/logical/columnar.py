@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from types import NoneType, UnionType
+from typing import TYPE_CHECKING, Any, Union, get_args, get_origin
+
+import numpy as np
+
+from danboorutools.util.misc import BaseModel
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from danboorutools.models.danbooru import DanbooruModel
+
+OFFSETS_SUFFIX = ".offsets"
+
+
+class ColumnarResults:
+    """Query results stored as one numpy array per field, instead of one model per row.
+
+    List fields are stored flattened, with an array of offsets marking where the values of each row start,
+    so that they can be aggregated over without looping through the rows.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], offsets: dict[str, np.ndarray]) -> None:
+        self.columns = columns
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def row_lengths(self, name: str) -> np.ndarray:
+        """The number of values each row has in a list column."""
+        return np.diff(self.offsets[name])
+
+    def row_indexes(self, name: str) -> np.ndarray:
+        """The row each value of a list column belongs to, to group them with the other columns."""
+        return np.repeat(np.arange(len(self)), self.row_lengths(name))
+
+    def words(self, name: str) -> np.ndarray:
+        """All the space-separated words of a string column, like tag strings."""
+        return np.array(" ".join(self.columns[name].tolist()).split())
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as file:
+            np.savez_compressed(file, **self.columns, **{name + OFFSETS_SUFFIX: offsets for name, offsets in self.offsets.items()})
+
+    @classmethod
+    def load(cls, path: Path) -> ColumnarResults:
+        with np.load(path) as arrays:
+            columns = {name: arrays[name] for name in arrays.files if not name.endswith(OFFSETS_SUFFIX)}
+            offsets = {name.removesuffix(OFFSETS_SUFFIX): arrays[name] for name in arrays.files if name.endswith(OFFSETS_SUFFIX)}
+        return cls(columns, offsets)
+
+
+def value_counts(values: np.ndarray) -> dict[Any, int]:
+    unique_values, counts = np.unique(values, return_counts=True)
+    return dict(zip(unique_values.tolist(), counts.tolist(), strict=True))
+
+
+class ColumnarBuffer:
+    """Turn pages of raw danbooru json into columns, one page at a time.
+
+    Fields are dotted paths into the json, like `post.uploader_id`, and how they're stored is decided by the model's annotations:
+    ints (floats with NaN if they're optional), floats, bools, strings, datetimes (as UTC datetime64) and lists of those.
+    """
+
+    def __init__(self, model: type[DanbooruModel], fields: list[str]) -> None:
+        self.fields = list(dict.fromkeys(["id", *fields]))
+        self.kinds = {field: _column_kind(model, field) for field in self.fields}
+        self._chunks: dict[str, list[np.ndarray]] = {field: [] for field in self.fields}
+        self._lengths: dict[str, list[np.ndarray]] = {field: [] for field, (_, is_list) in self.kinds.items() if is_list}
+
+    @property
+    def only_string(self) -> str:
+        """The `only` parameter that makes danbooru send just the fields that are stored."""
+        tree: dict = {}
+        for field in self.fields:
+            branch = tree
+            for part in field.split("."):
+                branch = branch.setdefault(part, {})
+        return _only_string(tree)
+
+    def append(self, page: list[dict]) -> None:
+        for field, (dtype, is_list) in self.kinds.items():
+            path = field.split(".")
+            values = [_dig(row, path) for row in page]
+            if is_list:
+                self._lengths[field].append(np.array([len(value or []) for value in values], dtype=np.int64))
+                values = [item for value in values for item in value or []]
+            self._chunks[field].append(_to_array(values, dtype))
+
+    def finish(self) -> ColumnarResults:
+        columns = {field: np.concatenate(chunks) if chunks else _to_array([], self.kinds[field][0]) for field, chunks in self._chunks.items()}
+        offsets = {
+            field: np.concatenate([[0], np.cumsum(np.concatenate(lengths) if lengths else np.array([], dtype=np.int64))])
+            for field, lengths in self._lengths.items()
+        }
+        return ColumnarResults(columns, offsets)
+
+
+def _column_kind(model: type[BaseModel], field: str) -> tuple[str, bool]:
+    *parents, name = field.split(".")
+    for parent in parents:
+        model = _strip_optional(model.model_fields[parent].annotation)[0]
+        assert isinstance(model, type) and issubclass(model, BaseModel), f"{parent} in {field} is not a model."
+
+    annotation, is_optional = _strip_optional(model.model_fields[name].annotation)
+    is_list = get_origin(annotation) is list
+    if is_list:
+        annotation, = get_args(annotation)
+
+    if annotation is bool:
+        return "bool", is_list
+    if annotation is int:
+        return ("float64" if is_optional else "int64"), is_list
+    if annotation is float:
+        return "float64", is_list
+    if annotation is str:
+        return "str", is_list
+    if annotation is datetime:
+        return "datetime", is_list
+    msg = f"Can't store {field} ({annotation}) in a column."
+    raise TypeError(msg)
+
+
+def _strip_optional(annotation: Any) -> tuple[Any, bool]:  # noqa: ANN401
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _dig(row: dict, path: list[str]) -> Any:  # noqa: ANN401
+    value: Any = row
+    for part in path:
+        if value is None:
+            return None
+        value = value.get(part)
+    return value
+
+
+def _to_array(values: list, dtype: str) -> np.ndarray:
+    if dtype == "datetime":
+        return np.array(
+            [datetime.fromisoformat(value).astimezone(UTC).replace(tzinfo=None) if value else None for value in values],
+            dtype="datetime64[ms]",
+        )
+    if dtype == "str":
+        return np.array(["" if value is None else value for value in values], dtype=str)
+    if dtype == "bool":
+        return np.array([bool(value) for value in values], dtype=bool)
+    if dtype == "float64":
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    return np.array(values, dtype=dtype)
+
+
+def _only_string(tree: dict) -> str:
+    return ",".join(f"{name}[{_only_string(children)}]" if children else name for name, children in tree.items())
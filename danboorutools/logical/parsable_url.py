@@ -1,32 +1,163 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from functools import cached_property
+from collections.abc import Iterator, Mapping
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
 from urllib.parse import unquote
 
 from danboorutools.exceptions import NotAnUrlError
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
 url_query_pattern = re.compile(r"(?:\?|\&(?:amp;)*)?([^=]+)=([^&]+)")
 # note: some sites garble and double-encode ampersands
 
 
-@dataclass
+class _HostNode:
+    __slots__ = ("children", "is_ctld", "value")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _HostNode] = {}
+        self.is_ctld = False
+        self.value: Any = None
+
+
+class HostTrie:
+    """A trie of reversed hostname labels, which splits a hostname into subdomain, domain and tld in a single walk."""
+
+    def __init__(self, ctlds: set[str]) -> None:
+        self.root = _HostNode()
+        for ctld in ctlds:
+            self._node_for(ctld).is_ctld = True
+
+    def _node_for(self, suffix: str) -> _HostNode:
+        node = self.root
+        for label in reversed(suffix.lower().split(".")):
+            node = node.children.setdefault(label, _HostNode())
+        return node
+
+    def register(self, domain: str, value: Any) -> None:  # noqa: ANN401
+        self._node_for(domain).value = value
+
+    def resolve(self, hostname: str) -> tuple[str, str, str, Any]:
+        """Return the subdomain, domain, tld and registered value for a hostname."""
+        labels = hostname.split(".")
+        if len(labels) < 2:
+            raise ValueError(hostname)
+
+        tld_node = self.root.children.get(labels[-1].lower())
+        domain_node = tld_node.children.get(labels[-2].lower()) if tld_node else None
+
+        if domain_node and domain_node.is_ctld and len(labels) > 2:
+            tld = f"{labels[-2]}.{labels[-1]}"
+            domain = f"{labels[-3]}.{tld}"
+            subdomain = ".".join(labels[:-3])
+            domain_node = domain_node.children.get(labels[-3].lower())
+        else:
+            tld = labels[-1]
+            domain = f"{labels[-2]}.{tld}"
+            subdomain = ".".join(labels[:-2])
+
+        return subdomain, domain, tld, domain_node.value if domain_node else None
+
+
+class QueryView(Mapping[str, str]):
+    """A read-only view of a query string, which is only decoded and split once a present key is looked up."""
+    __slots__ = ("_parameters", "_raw_query")
+
+    def __init__(self, raw_query: str | None) -> None:
+        self._raw_query = raw_query or ""
+        self._parameters: dict[str, str] | None = None if raw_query else {}
+
+    @property
+    def parameters(self) -> dict[str, str]:
+        if self._parameters is None:
+            query = self._raw_query
+            if "%" in query:
+                query = unquote(query)
+            if "\\u" in query:
+                query = query.encode("utf-8").decode("unicode-escape")
+
+            self._parameters = dict(url_query_pattern.findall(query))
+        return self._parameters
+
+    def _cannot_contain(self, key: object) -> bool:
+        # an undecoded query only has a key if "key=" is literally in it, so misses don't need a full parse
+        if self._parameters is not None or not isinstance(key, str):
+            return False
+        raw_query = self._raw_query
+        return "%" not in raw_query and "\\u" not in raw_query and f"{key}=" not in raw_query
+
+    def __getitem__(self, key: str) -> str:
+        if self._cannot_contain(key):
+            raise KeyError(key)
+        return self.parameters[key]
+
+    def get(self, key: str, default: Any = None) -> Any:  # noqa: ANN401
+        if self._cannot_contain(key):
+            return default
+        return self.parameters.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        if self._cannot_contain(key):
+            return False
+        return key in self.parameters
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.parameters)
+
+    def __len__(self) -> int:
+        return len(self.parameters)
+
+    def copy(self) -> dict[str, str]:
+        return self.parameters.copy()
+
+    def __str__(self) -> str:
+        return f"QueryView[{self._raw_query}]"
+    __repr__ = __str__
+
+
+class _UrlRecord:
+    __slots__ = ("domain", "hostname", "parser", "query", "schema", "subdomain", "tld", "url_parts", "url_without_query")
+
+
 class ParsableUrl:
-    raw_url: str
+    __slots__ = ("_parsed_query", "_record", "raw_url")
+
     ctld = {
         "co.uk",
         "co.jp", "ne.jp", "or.jp",
         "com.tw",
     }
+    host_trie = HostTrie(ctld)
 
-    @cached_property
-    def url_data(self) -> dict:
-        if "?" in self.raw_url:
-            url_without_query, _, url_query = self.raw_url.partition("?")
-        else:
-            url_without_query = self.raw_url
-            url_query = None
+    def __init__(self, raw_url: str) -> None:
+        self.raw_url = raw_url
+        self._record: _UrlRecord | None = None
+        self._parsed_query: QueryView | None = None
+
+    @classmethod
+    def from_many(cls, raw_urls: Iterable[str]) -> list[ParsableUrl]:
+        """Build and pre-split a batch of urls in one pass. Invalid urls still only raise once their parts are accessed."""
+        parsable_urls = []
+        append = parsable_urls.append
+        for raw_url in raw_urls:
+            parsable_url = cls(raw_url)
+            with suppress(NotAnUrlError, ValueError):
+                parsable_url._record = parsable_url._split()
+            append(parsable_url)
+        return parsable_urls
+
+    @property
+    def url_data(self) -> _UrlRecord:
+        if (record := self._record) is None:
+            record = self._record = self._split()
+        return record
+
+    def _split(self) -> _UrlRecord:
+        url_without_query, has_query, url_query = self.raw_url.partition("?")
 
         try:
             [schema, _, hostname, *url_parts] = url_without_query.split("/")
@@ -37,73 +168,63 @@ class ParsableUrl:
             raise NotAnUrlError(self.raw_url)
 
         hostname = hostname.split(":")[0]
-        *subdomains, domain, tld = hostname.split(".")
-        if f"{domain}.{tld}" in self.ctld:
-            subdomains, domain, tld = subdomains[:-1], subdomains[-1], f"{domain}.{tld}"
-
-        subdomain = ".".join(subdomains)
 
-        url_parts = list(filter(bool, url_parts))  # faster than list comprehension
-        return {
-            "schema": schema,
-            "url_parts": url_parts,
-            "hostname": hostname,
-            "query": url_query,
-            "domain": ".".join([domain, tld]),
-            "tld": tld,
-            "subdomain": subdomain,
-            "url_without_query": url_without_query,
-        }
+        record = _UrlRecord()
+        record.subdomain, record.domain, record.tld, record.parser = self.host_trie.resolve(hostname)
+        record.schema = schema
+        record.hostname = hostname
+        record.url_parts = list(filter(bool, url_parts))  # faster than list comprehension
+        record.query = url_query if has_query else None
+        record.url_without_query = url_without_query
+        return record
 
     @property
     def url_without_query(self) -> str:
-        return self.url_data["url_without_query"]
+        return self.url_data.url_without_query
 
     @property
     def hostname(self) -> str:
-        return self.url_data["hostname"]
+        return self.url_data.hostname
 
     @property
     def domain(self) -> str:
-        return self.url_data["domain"]
+        return self.url_data.domain
 
     @property
     def tld(self) -> str:
-        return self.url_data["tld"]
+        return self.url_data.tld
 
     @property
     def subdomain(self) -> str:
-        return self.url_data["subdomain"]
+        return self.url_data.subdomain
 
     @property
     def url_parts(self) -> list[str]:
-        return self.url_data["url_parts"]
+        return self.url_data.url_parts
 
     @property
     def path(self) -> str:
         return self.raw_url.removeprefix(f"{self.schema}//{self.hostname}")
 
-    @cached_property
-    def query(self) -> dict[str, str]:
-        if not (query := self.url_data["query"]):
-            return {}
-
-        if "%" in query:
-            query = unquote(query)
-        if "\\u" in query:
-            query = query.encode("utf-8").decode("unicode-escape")
+    @property
+    def query_string(self) -> str | None:
+        return self.url_data.query
 
-        return dict(url_query_pattern.findall(query))
+    @property
+    def query(self) -> QueryView:
+        if self._parsed_query is None:
+            self._parsed_query = QueryView(self.url_data.query)
+        return self._parsed_query
 
-    @cached_property
+    @property
     def filename(self) -> str:
         return self.url_parts[-1]
 
-    @cached_property
+    @property
     def stem(self) -> str:
         return self.filename.split(".")[0]
 
-    @cached_property
+    @property
     def extension(self) -> str:
         try:
             return self.filename.partition(".")[-1]
@@ -112,7 +233,7 @@ class ParsableUrl:
 
     @property
     def schema(self) -> str:
-        return self.url_data["schema"]
+        return self.url_data.schema
 
     @property
     def is_base_url(self) -> bool:
@@ -122,9 +243,20 @@ class ParsableUrl:
         return f"ParsableUrl[{self.raw_url}]"
     __repr__ = __str__
 
+    def __eq__(self, __o: object) -> bool:
+        if not isinstance(__o, ParsableUrl):
+            return NotImplemented
+        return self.raw_url == __o.raw_url
+
     def __hash__(self) -> int:
         return hash(self.__str__())
 
+    def __getstate__(self) -> str:
+        return self.raw_url
+
+    def __setstate__(self, raw_url: str) -> None:
+        self.__init__(raw_url)  # type: ignore[misc]
+
     def without(self, *parts: str) -> ParsableUrl:
         string = f"{self.schema}//{self.hostname}/" + "/".join(u for u in self.url_parts if u not in parts)
 
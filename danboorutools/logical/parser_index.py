@@ -0,0 +1,159 @@
+# Generated by danboorutools/scripts/generate_parser_index.py. Do not edit manually.
+# Maps each parsable domain to the module in danboorutools/logical/parsers/ that declares its parser.
+
+PARSER_MODULES: dict[str, str] = {
+    "127.net": "lofter",
+    "2nt.com": "fc2",
+    "afdian.net": "afdian",
+    "afdiancdn.com": "afdian",
+    "akamaized.net": "akamaized_net",
+    "amazon.co.jp": "amazon",
+    "amazon.com": "amazon",
+    "amazon.jp": "amazon",
+    "amazonaws.com": "amazon",
+    "amzn.asia": "amazon",
+    "amzn.to": "amazon",
+    "anifty.jp": "anifty",
+    "arca.live": "arca_live",
+    "artstation.com": "artstation",
+    "artworkfolio.com": "deviantart",
+    "baraag.net": "mastodon",
+    "bcy.net": "bcy",
+    "behance.net": "behance",
+    "bigcartel.com": "bigcartel",
+    "bilibili.com": "bilibili",
+    "bilibili.tv": "bilibili",
+    "bit.ly": "bitly",
+    "booth.pm": "booth_pm",
+    "bsky.app": "bluesky",
+    "bsky.social": "bluesky",
+    "carrd.co": "carrd",
+    "circle.ms": "circle_ms",
+    "clip-studio.com": "clipstudio",
+    "cloudfront.net": "cloudfront",
+    "crepu.net": "crepu",
+    "daportfolio.com": "deviantart",
+    "deviantart.com": "deviantart",
+    "deviantart.net": "deviantart",
+    "dlsite.com": "dlsite",
+    "dlsite.jp": "dlsite",
+    "dmm.co.jp": "fanza",
+    "drawr.net": "drawr",
+    "e-hentai.org": "ehentai",
+    "ehgt.org": "ehentai",
+    "emotionflow.com": "emotionflow",
+    "enty.jp": "enty",
+    "exhentai.org": "ehentai",
+    "facebook.com": "facebook",
+    "fanbox.cc": "fanbox",
+    "fantia.jp": "fantia",
+    "fav.me": "deviantart",
+    "fc2.com": "fc2",
+    "fc2blog.net": "fc2",
+    "fc2blog.us": "fc2",
+    "fiverr.com": "fiverr",
+    "foundation.app": "foundation",
+    "furaffinity.net": "furaffinity",
+    "gamer.com.tw": "gamer_tw",
+    "geocities.com": "geocities",
+    "geocities.jp": "geocities",
+    "google.com": "google",
+    "googleapis.com": "googleapis_com",
+    "gumroad.com": "gumroad",
+    "hatena.com": "hatena",
+    "hatena.ne.jp": "hatena",
+    "hatenablog.com": "hatena",
+    "hatenadiary.org": "hatena",
+    "hath.network": "ehentai",
+    "hdslb.com": "bilibili",
+    "hentai-foundry.com": "hentai_foundry",
+    "html.co.jp": "html_co_jp",
+    "imgix.net": "imgix_net",
+    "inprnt.com": "inprnt",
+    "instagram.com": "instagram",
+    "jointhrone.com": "throne",
+    "kakuyomu.jp": "kakuyomu",
+    "ko-fi.com": "ko_fi",
+    "lf127.net": "lofter",
+    "line.me": "line",
+    "linktr.ee": "linktree",
+    "lit.link": "litlink",
+    "livedoor.jp": "livedoor",
+    "lofter.com": "lofter",
+    "marshmallow-qa.com": "marshmallow_qa",
+    "melonbooks.co.jp": "melonbooks",
+    "misskey.io": "misskey",
+    "misskeyusercontent.jp": "misskey",
+    "mixi.jp": "mixi",
+    "mstdn.jp": "mastodon",
+    "myportfolio.com": "myportfolio",
+    "namu.la": "arca_live",
+    "naver.com": "naver",
+    "naver.me": "naver",
+    "newgrounds.com": "newgrounds",
+    "ngfiles.com": "newgrounds",
+    "nico.ms": "nicovideo",
+    "nicomanga.jp": "nicovideo",
+    "nicoseiga.jp": "nicovideo",
+    "nicovideo.jp": "nicovideo",
+    "nijie.info": "nijie",
+    "nijie.net": "nijie",
+    "nimg.jp": "nicovideo",
+    "odaibako.net": "odaibako",
+    "onaco.jp": "onaco",
+    "patreon.com": "patreon",
+    "patreonusercontent.com": "patreon",
+    "pawoo.net": "mastodon",
+    "peing.net": "peing",
+    "piapro.jp": "piapro",
+    "picdig.net": "picdig",
+    "pixiv.cc": "pixiv_cc",
+    "pixiv.me": "pixiv_me",
+    "pixiv.net": "pixiv_net",
+    "plurk.com": "plurk",
+    "poipiku.com": "poipiku",
+    "postype.com": "postype",
+    "potofu.me": "potofu",
+    "privatter.net": "privatter",
+    "profcard.info": "profcard",
+    "pximg.net": "pximg_net",
+    "reddit.com": "reddit",
+    "sakura.ne.jp": "sakura",
+    "sblo.jp": "sblo",
+    "sinaimg.cn": "weibo",
+    "skeb.jp": "skeb_jp",
+    "skima.jp": "skima",
+    "soundcloud.com": "soundcloud",
+    "sta.sh": "sta_sh",
+    "steamcommunity.com": "steamcommunity",
+    "subscribestar.adult": "subscribestar",
+    "t.co": "twitter",
+    "taittsuu.com": "taittsuu",
+    "threads.net": "threads",
+    "throne.com": "throne",
+    "tinami.com": "tinami_com",
+    "tinami.jp": "tinami_com",
+    "togetter.com": "togetter",
+    "toranoana.jp": "toranoana",
+    "tumblr.com": "tumblr",
+    "tw6.jp": "tw6",
+    "twimg.com": "twitter",
+    "twitch.com": "twitch",
+    "twitch.tv": "twitch",
+    "twitter.com": "twitter",
+    "twpf.jp": "twpf",
+    "ungrounded.net": "newgrounds",
+    "vgen.co": "vgen",
+    "vk.com": "vk",
+    "wavebox.me": "wavebox",
+    "webtoons.com": "webtoons",
+    "weibo.cn": "weibo",
+    "weibo.com": "weibo",
+    "wixmp.com": "wixmp_com",
+    "x.com": "twitter",
+    "x0.com": "sakura",
+    "xfolio.jp": "xfolio",
+    "yfrog.com": "yfrog",
+    "youtu.be": "youtube",
+    "youtube.com": "youtube",
+}
@@ -55,7 +55,7 @@ class DeviantartComParser(UrlParser):
 
             # https://www.deviantart.com/users/outgoing?https://vk.com/neo_kitty_art
             case "users", "outgoing":
-                new_url = parsable_url.url_data["query"]
+                new_url = parsable_url.query_string
                 return cls.parse(new_url)
 
             # https://www.deviantart.com/noizave
@@ -1,6 +1,6 @@
 import re
 
-from danboorutools.logical.url_parser import ParsableUrl, UrlParser
+from danboorutools.logical.url_parser import ParsableUrl, UrlParser, UrlPattern
 from danboorutools.logical.urls import google as g
 from danboorutools.logical.urls import google_drive as gd
 from danboorutools.logical.urls import google_photos as gph
@@ -10,6 +10,29 @@ from danboorutools.models.url import UnsupportedUrl, Url, UselessUrl
 
 
 class GoogleComParser(UrlParser):
+    url_patterns = (
+        # https://drive.google.com/drive/folders/1a3ZpLWI8NqStnH6bTmcY7d5GhnV8DiQR
+        # https://drive.google.com/drive/u/0/folders/1-1toeBYF_ZJ7Jgnjf7SVxHDCKkh9L89U
+        UrlPattern("drive", "drive/folders/{folder_id}", gd.GoogleDriveFolderUrl),
+        UrlPattern("drive", "drive/u/{_user_index}/folders/{folder_id}", gd.GoogleDriveFolderUrl),
+        # https://drive.google.com/folderview?id=0Bz5iC3UiWJaGN2xWOERaYXotM28&usp=sharing
+        # https://drive.google.com/open?id=1L3y8MqyDUhZlHi8FzxRzdGhIlerubnej
+        # without an id these can't point to anything, so _match_google_drive doesn't parse them either
+        UrlPattern("drive", "folderview|open?id={folder_id}", gd.GoogleDriveFolderUrl),
+        # https://drive.google.com/file/d/1zItUaRCYpJJz3Rbr0JClK24oQj4LciOP
+        # https://drive.google.com/file/d/1zItUaRCYpJJz3Rbr0JClK24oQj4LciOP/view
+        UrlPattern("drive", "file/d/{file_id}", gd.GoogleDriveFileUrl),
+        UrlPattern("drive", "file/d/{file_id}/view", gd.GoogleDriveFileUrl),
+        # https://drive.google.com/uc?export=download&id=1WpHYbFE8vNL6jzcjXbMf5sVuQKzj7dxq
+        # same as above if the id is missing
+        UrlPattern("drive", "uc?id={file_id}", gd.GoogleDriveFileUrl),
+
+        # http://play.google.com/store/apps/developer?id=K2000
+        UrlPattern("play", "store/apps/developer?id={developer_name}", g.GooglePlayDeveloperUrl),
+        # http://play.google.com/store/apps/dev?id=8287620048499474172
+        UrlPattern("play", "store/apps/dev?id={developer_id:int}", g.GooglePlayDeveloperUrl),
+    )
+
     @classmethod
     def match_url(cls, parsable_url: ParsableUrl) -> Url | None:
         match parsable_url.subdomain:
@@ -190,31 +213,6 @@ class GoogleComParser(UrlParser):
                 return gd.GoogleDriveFolderUrl(parsed_url=parsable_url,
                                                folder_id=folder_id)
 
-            # https://drive.google.com/folderview?id=0Bz5iC3UiWJaGN2xWOERaYXotM28&usp=sharing
-            case "folderview", :
-                return gd.GoogleDriveFolderUrl(parsed_url=parsable_url,
-                                               folder_id=parsable_url.query["id"])
-
-            # https://drive.google.com/file/d/1zItUaRCYpJJz3Rbr0JClK24oQj4LciOP
-            case "file", "d", file_id:
-                return gd.GoogleDriveFileUrl(parsed_url=parsable_url,
-                                             file_id=file_id)
-
-            # https://drive.google.com/file/d/1zItUaRCYpJJz3Rbr0JClK24oQj4LciOP/view
-            case "file", "d", file_id, "view":
-                return gd.GoogleDriveFileUrl(parsed_url=parsable_url,
-                                             file_id=file_id)
-
-            # https://drive.google.com/open?id=1L3y8MqyDUhZlHi8FzxRzdGhIlerubnej
-            case "open", :
-                return gd.GoogleDriveFolderUrl(parsed_url=parsable_url,
-                                               folder_id=parsable_url.query["id"])
-
-            # https://drive.google.com/uc?export=download&id=1WpHYbFE8vNL6jzcjXbMf5sVuQKzj7dxq
-            case "uc", :
-                return gd.GoogleDriveFileUrl(parsed_url=parsable_url,
-                                             file_id=parsable_url.query["id"])
-
             case _:
                 return None
 
@@ -253,14 +251,6 @@ class GoogleComParser(UrlParser):
     @staticmethod
     def _match_google_playstore(parsable_url: ParsableUrl) -> g.GooglePlayDeveloperUrl | UnsupportedUrl | None:
         match parsable_url.url_parts:
-            # http://play.google.com/store/apps/developer?id=K2000
-            case "store", "apps", "developer":
-                return g.GooglePlayDeveloperUrl(parsed_url=parsable_url,
-                                                developer_name=parsable_url.query["id"])
-            # http://play.google.com/store/apps/dev?id=8287620048499474172
-            case "store", "apps", "dev":
-                return g.GooglePlayDeveloperUrl(parsed_url=parsable_url,
-                                                developer_id=int(parsable_url.query["id"]))
             # https://play.google.com/store/apps/details?id=jp.co.craftegg.band
             case "store", "apps", "details":
                 return UnsupportedUrl(parsed_url=parsable_url)
@@ -1,5 +1,5 @@
 from danboorutools.exceptions import UnparsableUrlError
-from danboorutools.logical.url_parser import ParsableUrl, UrlParser
+from danboorutools.logical.url_parser import ParsableUrl, UrlParser, UrlPattern
 from danboorutools.logical.urls import nicoseiga as ns
 from danboorutools.logical.urls import nicovideo as nv
 from danboorutools.logical.urls import nicovideo_3d as n3
@@ -7,12 +7,44 @@ from danboorutools.logical.urls import nicovideo_commons as nc
 from danboorutools.logical.urls import nicovideo_oekaki as no
 
 
+NICOVIDEO_SUBDOMAINS = ("", "www", "q", "nine", "ext", "sp")
+_NICOVIDEO_PATTERN_SUBDOMAINS = "|".join(NICOVIDEO_SUBDOMAINS)
+
+
 class NicovideoJp(UrlParser):
+    url_patterns = (
+        # https://www.nicovideo.jp/user/4572975
+        # https://q.nicovideo.jp/users/18700356
+        UrlPattern(_NICOVIDEO_PATTERN_SUBDOMAINS, "users|user/{user_id:int}", nv.NicovideoArtistUrl),
+        # https://www.nicovideo.jp/user/20446930/mylist/28674289
+        UrlPattern(_NICOVIDEO_PATTERN_SUBDOMAINS, "user/{user_id:int}/mylist/{_list_id}", nv.NicovideoArtistUrl),
+        UrlPattern(_NICOVIDEO_PATTERN_SUBDOMAINS, "thumb_user/{user_id:int}", nv.NicovideoArtistUrl),
+        UrlPattern(_NICOVIDEO_PATTERN_SUBDOMAINS, "mylist/{user_id:int}/{_list_id}", nv.NicovideoArtistUrl),
+        # http://www.nicovideo.jp/mylist/21474275
+        # http://www.nicovideo.jp/mylist/37220827#+sort=1
+        UrlPattern(_NICOVIDEO_PATTERN_SUBDOMAINS, "mylist/{list_id}", nv.NicovideoListUrl, {"list_id": lambda list_id: int(list_id.split("#")[0])}),
+        UrlPattern(_NICOVIDEO_PATTERN_SUBDOMAINS, "my/mylist/#/{list_id:int}", nv.NicovideoListUrl),
+
+        # https://dic.nicovideo.jp/oekaki/176310.png
+        UrlPattern("dic", "oekaki/{post_id}", no.NicovideoOekakiImageUrl, {"post_id": lambda filename: int(filename.split(".")[0])}),
+        # https://dic.nicovideo.jp/oekaki_id/340604
+        UrlPattern("dic", "oekaki_id/{post_id:int}", no.NicovideoOekakiPostUrl),
+        # https://dic.nicovideo.jp/u/11141663
+        UrlPattern("dic", "u/{user_id:int}", no.NicovideoOekakiArtistUrl),
+        # https://dic.nicovideo.jp/r/u/10846063/2063955
+        UrlPattern("dic", "r/u/{user_id:int}/{_post_id}", no.NicovideoOekakiArtistUrl),
+
+        # https://com.nicovideo.jp/community/co24880
+        UrlPattern("com", "community/{community_id}", nv.NicovideoCommunityUrl, {"community_id": lambda co_id: int(co_id.removeprefix("co"))}),
+        # https://game.nicovideo.jp/atsumaru/users/7757217
+        UrlPattern("game", "atsumaru/users/{user_id:int}", nv.NicovideoGameArtistUrl),
+    )
+
     @classmethod
     def match_url(cls, parsable_url: ParsableUrl) -> ns.NicoSeigaUrl | no.NicovideoOekakiUrl | n3.Nicovideo3dUrl | nv.NicovideoUrl | nc.NicovideoCommonsUrl | None:
         if parsable_url.subdomain.endswith("seiga"):
             return cls._match_seiga(parsable_url)
-        elif parsable_url.subdomain in ["", "www", "q", "nine", "ext", "sp"]:
+        elif parsable_url.subdomain in NICOVIDEO_SUBDOMAINS:
             return cls._match_nicovideo(parsable_url)
         elif parsable_url.subdomain == "dic":
             return cls._match_oekaki(parsable_url)
@@ -20,10 +52,6 @@ class NicovideoJp(UrlParser):
             return cls._match_3d(parsable_url)
         elif parsable_url.subdomain.endswith("commons"):
             return cls._match_commons(parsable_url)
-        elif parsable_url.subdomain == "com":
-            return cls._match_com(parsable_url)
-        elif parsable_url.subdomain == "game":
-            return cls._match_game(parsable_url)
 
         # http://ch.nicovideo.jp/finalcake
         # http://nivent.nicovideo.jp/ni1675
@@ -116,40 +144,6 @@ class NicovideoJp(UrlParser):
                 return nv.NicovideoVideoUrl(parsed_url=parsable_url,
                                             video_id=video_id)
 
-            # http://www.nicovideo.jp/mylist/2858074/4602763
-            case "user", user_id, "mylist", _:
-                return nv.NicovideoArtistUrl(parsed_url=parsable_url,
-                                             user_id=int(user_id))
-
-            # https://www.nicovideo.jp/user/4572975
-            # https://www.nicovideo.jp/user/20446930/mylist/28674289
-            # https://q.nicovideo.jp/users/18700356
-            case ("users" | "user"), user_id:
-                return nv.NicovideoArtistUrl(parsed_url=parsable_url,
-                                             user_id=int(user_id))
-
-            # http://www.nicovideo.jp/mylist/21474275
-            # http://www.nicovideo.jp/mylist/37220827#+sort=1
-            case "mylist", list_id_str:
-                try:
-                    list_id = int(list_id_str)
-                except ValueError:
-                    list_id = int(list_id_str.split("#")[0])
-                return nv.NicovideoListUrl(parsed_url=parsable_url,
-                                           list_id=list_id)
-
-            case "mylist", user_id, _:
-                return nv.NicovideoArtistUrl(parsed_url=parsable_url,
-                                             user_id=int(user_id))
-
-            case "my", "mylist", "#", list_id:
-                return nv.NicovideoListUrl(parsed_url=parsable_url,
-                                           list_id=int(list_id))
-
-            case "thumb_user", user_id:
-                return nv.NicovideoArtistUrl(parsed_url=parsable_url,
-                                             user_id=int(user_id))
-
             # http://www.nicovideo.jp/search/東方恥辱日記
             case "search", *_:
                 raise UnparsableUrlError(parsable_url)
@@ -160,26 +154,6 @@ class NicovideoJp(UrlParser):
     @staticmethod
     def _match_oekaki(parsable_url: ParsableUrl) -> no.NicovideoOekakiUrl | None:
         match parsable_url.url_parts:
-            # https://dic.nicovideo.jp/oekaki/176310.png
-            case "oekaki", _filename:
-                return no.NicovideoOekakiImageUrl(parsed_url=parsable_url,
-                                                  post_id=int(parsable_url.stem))
-
-            # https://dic.nicovideo.jp/oekaki_id/340604
-            case "oekaki_id", post_id:
-                return no.NicovideoOekakiPostUrl(parsed_url=parsable_url,
-                                                 post_id=int(post_id))
-
-            # https://dic.nicovideo.jp/u/11141663
-            case "u", user_id:
-                return no.NicovideoOekakiArtistUrl(parsed_url=parsable_url,
-                                                   user_id=int(user_id))
-
-            # https://dic.nicovideo.jp/r/u/10846063/2063955
-            case "r", "u", user_id, _:
-                return no.NicovideoOekakiArtistUrl(parsed_url=parsable_url,
-                                                   user_id=int(user_id))
-
             # http://dic.nicovideo.jp/a/手錠の人
             # http://dic.nicovideo.jp/id/4783847
             # http://dic.nicovideo.jp/l/七姫
@@ -242,28 +216,6 @@ class NicovideoJp(UrlParser):
             case _:
                 return None
 
-    @staticmethod
-    def _match_com(parsable_url: ParsableUrl) -> nv.NicovideoCommunityUrl | None:
-        match parsable_url.url_parts:
-            # https://com.nicovideo.jp/community/co24880
-            case "community", community_id:
-                return nv.NicovideoCommunityUrl(parsed_url=parsable_url,
-                                                community_id=int(community_id.removeprefix("co")))
-
-            case _:
-                return None
-
-    @staticmethod
-    def _match_game(parsable_url: ParsableUrl) -> nv.NicovideoGameArtistUrl | None:
-        match parsable_url.url_parts:
-            # https://game.nicovideo.jp/atsumaru/users/7757217
-            case "atsumaru", "users", user_id:
-                return nv.NicovideoGameArtistUrl(parsed_url=parsable_url,
-                                                 user_id=int(user_id))
-
-            case _:
-                return None
-
 
 class NimgJpParser(UrlParser):
     @classmethod
@@ -2,7 +2,7 @@ import re
 from datetime import UTC, datetime
 
 from danboorutools.exceptions import UnparsableUrlError
-from danboorutools.logical.url_parser import ParsableUrl, UrlParser
+from danboorutools.logical.url_parser import ParsableUrl, UrlParser, UrlPattern
 from danboorutools.logical.urls import fanbox as f
 from danboorutools.logical.urls import pixiv as p
 from danboorutools.logical.urls import pixiv_comic as c
@@ -10,16 +10,45 @@ from danboorutools.logical.urls import pixiv_sketch as s
 from danboorutools.models.url import Url, UselessUrl
 
 img_subdomain_pattern = re.compile(r"^i(?:mg)?\d*$")
+MAIN_SUBDOMAINS = ("www", "")
+_MAIN_PATTERN_SUBDOMAINS = "|".join(MAIN_SUBDOMAINS)
 
 
 class PixivNetParser(UrlParser):
+    # only the exact, most common shapes live here; everything else goes through the hand-written rules below
+    url_patterns = (
+        # https://www.pixiv.net/artworks/46324488
+        # https://www.pixiv.net/en/artworks/46324488
+        # http://www.pixiv.net/i/18557054
+        # page fragments like #big_11 aren't ints, so those are left to _match_no_subdomain
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "artworks|i/{post_id:int}", p.PixivPostUrl),
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "en/artworks/{post_id:int}", p.PixivPostUrl),
+        # https://www.pixiv.net/users/9202877
+        # https://www.pixiv.net/users/76567/novels
+        # https://www.pixiv.net/en/users/9202877
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "u|users|user/{user_id:int}", p.PixivArtistUrl),
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "u|users|user/{user_id:int}/{_tab}", p.PixivArtistUrl),
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "en/users/{user_id:int}", p.PixivArtistUrl),
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "en/users/{user_id:int}/{_tab}", p.PixivArtistUrl),
+        # https://www.pixiv.net/stacc/noizave
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "stacc/{stacc}", p.PixivStaccUrl),
+        # http://www.pixiv.net/member_illust.php?mode=medium&illust_id=18557054
+        # https://www.pixiv.net/index.php?mode=medium\u0026illust_id=612896
+        # without an illust_id these aren't matched at all, here or below
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "member_illust.php|index.php?illust_id={post_id:int}", p.PixivPostUrl),
+        # https://www.pixiv.net/requests/7829
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "requests/{request_id:int}", p.PixivRequestUrl),
+        # https://www.pixiv.net/novel/series/436782
+        UrlPattern(_MAIN_PATTERN_SUBDOMAINS, "novel/series/{series_id:int}", p.PixivNovelSeriesUrl),
+    )
+
     @classmethod
     def match_url(cls, parsable_url: ParsableUrl) -> Url | None:
         if img_subdomain_pattern.match(parsable_url.subdomain):
             return cls._match_i_subdomain(parsable_url)
         if parsable_url.url_parts[0] == "fanbox":
             return cls._match_fanbox_path(parsable_url)
-        if parsable_url.subdomain in ("www", ""):
+        if parsable_url.subdomain in MAIN_SUBDOMAINS:
             return cls._match_no_subdomain(parsable_url)
         elif parsable_url.subdomain in ("sketch", "img-sketch"):
             return cls._match_sketch_subdomain(parsable_url)
@@ -86,20 +115,6 @@ class PixivNetParser(UrlParser):
                                       unlisted=True,
                                       post_id=unlisted_id)
 
-            # https://www.pixiv.net/stacc/noizave
-            case "stacc", stacc:
-                return p.PixivStaccUrl(parsed_url=parsable_url,
-                                       stacc=stacc)
-
-            # http://www.pixiv.net/member_illust.php?mode=medium&illust_id=18557054
-            # http://www.pixiv.net/member_illust.php?mode=big&illust_id=18557054
-            # http://www.pixiv.net/member_illust.php?mode=manga&illust_id=18557054
-            # http://www.pixiv.net/member_illust.php?mode=manga_big&illust_id=18557054&page=1
-            # https://www.pixiv.net/index.php?mode=medium\u0026illust_id=612896
-            case ("member_illust.php" | "index.php"), :
-                return p.PixivPostUrl(parsed_url=parsable_url,
-                                      post_id=int(parsable_url.query["illust_id"]))
-
             # https://www.pixiv.net/member.php?id=339253
             # http://www.pixiv.net/novel/member.php?id=76567
             case *_, "member.php":
@@ -108,11 +123,6 @@ class PixivNetParser(UrlParser):
                 return p.PixivArtistUrl(parsed_url=parsable_url,
                                         user_id=int(parsable_url.query["id"]))
 
-            # https://www.pixiv.net/requests/7829
-            case "requests", request_id:
-                return p.PixivRequestUrl(parsed_url=parsable_url,
-                                         request_id=int(request_id))
-
             # https://www.pixiv.net/novel/show.php?id=8465454
             # https://www.pixiv.net/novel/show.php?id=10008846#8
             case "novel", "show.php":
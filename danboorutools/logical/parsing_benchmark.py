@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from danboorutools.logical.parsable_url import ParsableUrl
+from danboorutools.logical.url_corpus import CorpusEntry, read_corpus, write_corpus
+from danboorutools.logical.url_parser import UrlParser, parsers
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+UNPARSED = "Unparsed"
+MIN_URLS_FOR_COMPARISON = 10
+
+
+def sample_corpus(corpus_file: Path, sample_file: Path, per_domain: int = 200, seed: int = 0) -> int:
+    """Reservoir-sample a fixed number of urls for every parsable domain in the corpus, so that benchmarks are comparable."""
+    UrlParser.setup_subclasses()
+    rng = random.Random(seed)
+    reservoirs: dict[str, list[CorpusEntry]] = defaultdict(list)
+    seen: dict[str, int] = defaultdict(int)
+
+    for entry in read_corpus(corpus_file):
+        if entry.domain not in parsers:
+            continue
+        seen[entry.domain] += 1
+        reservoir = reservoirs[entry.domain]
+        if len(reservoir) < per_domain:
+            reservoir.append(entry)
+        elif (index := rng.randrange(seen[entry.domain])) < per_domain:
+            reservoir[index] = entry
+
+    rows = ((entry.resource_url, entry.url) for domain in sorted(reservoirs) for entry in reservoirs[domain])
+    return write_corpus(sample_file, rows)
+
+
+def benchmark_parsers(sample_file: Path, domain: str | None = None, rounds: int = 5) -> dict[str, dict[str, float]]:
+    """Time the uncached parsing path for each url in the sample and aggregate the results per parser class."""
+    UrlParser.setup_subclasses()
+    latencies: dict[str, list[int]] = defaultdict(list)
+
+    for entry in read_corpus(sample_file, domain=domain):
+        best = None
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            try:
+                UrlParser._parse(ParsableUrl(entry.url))
+            except Exception:  # noqa: S110
+                pass  # failures are what test_parsing's normal mode is for, here only the time matters
+            elapsed = time.perf_counter_ns() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        parser = parsers.get(entry.domain)
+        latencies[parser.__name__ if parser else UNPARSED].append(best or 0)
+
+    return {parser_name: _summarize(values) for parser_name, values in sorted(latencies.items())}
+
+
+def _summarize(latencies_ns: list[int]) -> dict[str, float]:
+    latencies_ns = sorted(latencies_ns)
+    total_seconds = sum(latencies_ns) / 1e9
+    return {
+        "urls": len(latencies_ns),
+        "urls_per_second": round(len(latencies_ns) / total_seconds, 1) if total_seconds else 0.0,
+        "p50_us": round(_percentile(latencies_ns, 50) / 1000, 2),
+        "p99_us": round(_percentile(latencies_ns, 99) / 1000, 2),
+    }
+
+
+def _percentile(sorted_values: list[int], percentile: int) -> float:
+    index = min(len(sorted_values) - 1, round(percentile / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def find_regressions(results: dict[str, dict[str, float]],
+                     baseline: dict[str, dict[str, float]],
+                     threshold: float) -> dict[str, tuple[float, float]]:
+    """Return the parsers whose median latency grew by more than the threshold, with their baseline and current p50."""
+    regressions = {}
+    for parser_name, stats in results.items():
+        if not (previous := baseline.get(parser_name)):
+            continue
+        if min(stats["urls"], previous["urls"]) < MIN_URLS_FOR_COMPARISON:
+            continue
+        if stats["p50_us"] > previous["p50_us"] * (1 + threshold):
+            regressions[parser_name] = (previous["p50_us"], stats["p50_us"])
+    return regressions
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+from functools import cache
+from itertools import batched
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from peewee import BooleanField, IntegerField, Model, SqliteDatabase, TextField, fn
+
+from danboorutools import settings
+from danboorutools.logical.parser_index import PARSER_MODULES
+from danboorutools.logical.url_parser import UrlParser, parsers
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from danboorutools.logical.url_corpus import CorpusEntry
+
+_coverage_database = SqliteDatabase(settings.BASE_FOLDER / "data" / "parsing_coverage.sqlite", pragmas={"journal_mode": "wal"})
+
+# a change to any of these can change every parse result, so they're part of every parser version
+_CORE_FILES = ("parsable_url.py", "url_parser.py", "url_table.py")
+# besides those, a domain's version covers its parser module and every parser or url module it imports, directly or not
+_VERSIONED_PACKAGES = ("parsers", "urls")
+_LOGICAL_FOLDER = Path(__file__).parent
+
+BATCH_SIZE = 5_000
+
+
+class _CoverageModel(Model):
+    class Meta:
+        database = _coverage_database
+        table_name = "coverage"
+
+    url_hash = IntegerField(primary_key=True)
+    url = TextField()
+    domain = TextField(index=True)
+    has_parser = BooleanField()
+    result = TextField()
+    previous_result = TextField(null=True)
+    parser_version = TextField()
+    seen_in_run = IntegerField(index=True)
+    changed_in_run = IntegerField(null=True, index=True)
+
+
+class _CoverageRunModel(Model):
+    class Meta:
+        database = _coverage_database
+        table_name = "coverage_runs"
+
+    run = IntegerField(primary_key=True)
+    total = IntegerField()
+    parsed = IntegerField()
+    changed = IntegerField()
+
+
+class CoverageRun(NamedTuple):
+    run: int
+    total: int
+    parsed: int
+    changed: int
+
+
+class ChangedUrl(NamedTuple):
+    url: str
+    previous_result: str | None
+    result: str
+
+
+def url_hash(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def _imported_modules(file: Path) -> set[Path]:
+    """The parser and url modules imported by a module, either as `from ...urls.x import y` or as `from ...urls import x`."""
+    imported: set[Path] = set()
+    for node in ast.walk(ast.parse(file.read_bytes())):
+        if not isinstance(node, ast.ImportFrom) or not node.module or not node.module.startswith("danboorutools.logical."):
+            continue
+        package, _, module = node.module.removeprefix("danboorutools.logical.").partition(".")
+        if package not in _VERSIONED_PACKAGES:
+            continue
+        modules = [module] if module else [alias.name for alias in node.names]
+        imported |= {_LOGICAL_FOLDER / package / f"{name}.py" for name in modules}
+    return {path for path in imported if path.exists()}
+
+
+@cache
+def _module_closure(file: Path) -> frozenset[Path]:
+    closure = {file}
+    pending = [file]
+    while pending:
+        for imported in _imported_modules(pending.pop()) - closure:
+            closure.add(imported)
+            pending.append(imported)
+    return frozenset(closure)
+
+
+class ParsingCoverage:
+    """An index of the last parse result of every corpus url, so that only new urls or urls whose parser changed get reparsed."""
+
+    def __init__(self) -> None:
+        with _coverage_database.connection_context():
+            _coverage_database.create_tables([_CoverageModel, _CoverageRunModel])
+        self._versions: dict[str | None, str] = {}
+        UrlParser.setup_subclasses()
+
+    @property
+    def last_run(self) -> int:
+        return _CoverageRunModel.select(fn.MAX(_CoverageRunModel.run)).scalar() or 0
+
+    def parser_version(self, domain: str) -> str:
+        """A hash of the code that parses this domain: the core parsing modules, its parser module and the modules that one imports."""
+        module_name = PARSER_MODULES.get(domain.lower())
+        if module_name not in self._versions:
+            digest = hashlib.sha1(usedforsecurity=False)
+            files = [_LOGICAL_FOLDER / core_file for core_file in _CORE_FILES]
+            if module_name:
+                files += sorted(_module_closure(_LOGICAL_FOLDER / "parsers" / f"{module_name}.py"))
+            for file in files:
+                digest.update(f"{file.parent.name}/{file.name}".encode())
+                digest.update(file.read_bytes())
+            self._versions[module_name] = digest.hexdigest()[:12]
+        return self._versions[module_name]
+
+    def update(self, entries: Iterable[CorpusEntry]) -> CoverageRun:
+        """Mark every entry as seen in a new run, and reparse those that are new or whose parser version changed."""
+        run = self.last_run + 1
+        total = parsed = changed = 0
+
+        for batch in batched(entries, BATCH_SIZE):
+            hashes = {url_hash(entry.url): entry for entry in batch}
+            known = {
+                row.url_hash: row for row in
+                _CoverageModel.select(_CoverageModel.url_hash, _CoverageModel.result, _CoverageModel.parser_version)
+                .where(_CoverageModel.url_hash.in_(list(hashes)))
+            }
+
+            to_replace = []
+            for hashed, entry in hashes.items():
+                version = self.parser_version(entry.domain)
+                previous = known.get(hashed)
+                if previous and previous.parser_version == version:
+                    continue
+
+                result = self._parse_result(entry.url)
+                is_changed = previous is not None and previous.result != result
+                to_replace.append({
+                    "url_hash": hashed,
+                    "url": entry.url,
+                    "domain": entry.domain,
+                    "has_parser": entry.domain in parsers,
+                    "result": result,
+                    "previous_result": previous.result if previous else None,
+                    "parser_version": version,
+                    "seen_in_run": run,
+                    "changed_in_run": run if is_changed else None,
+                })
+                changed += is_changed
+
+            with _coverage_database.atomic():
+                if to_replace:
+                    _CoverageModel.replace_many(to_replace).execute()
+                _CoverageModel.update(seen_in_run=run).where(_CoverageModel.url_hash.in_(list(hashes))).execute()
+
+            total += len(hashes)
+            parsed += len(to_replace)
+
+        _CoverageRunModel.create(run=run, total=total, parsed=parsed, changed=changed)
+        return CoverageRun(run, total, parsed, changed)
+
+    @staticmethod
+    def _parse_result(url: str) -> str:
+        try:
+            return UrlParser.parse(url).__class__.__name__
+        except Exception as e:  # noqa: BLE001
+            return f"!{e.__class__.__name__}"
+
+    def unparsed_domains(self, limit: int = 20) -> list[tuple[str, int]]:
+        """The most common domains without a parser among the urls seen in the last run."""
+        count = fn.COUNT(_CoverageModel.url_hash)
+        query = (
+            _CoverageModel.select(_CoverageModel.domain, count.alias("count"))
+            .where((_CoverageModel.seen_in_run == self.last_run) & ~_CoverageModel.has_parser)
+            .group_by(_CoverageModel.domain)
+            .order_by(count.desc())
+            .limit(limit)
+        )
+        return [(row.domain, row.count) for row in query]
+
+    def result_counts(self, run: int | None = None) -> dict[str, int]:
+        count = fn.COUNT(_CoverageModel.url_hash)
+        query = (
+            _CoverageModel.select(_CoverageModel.result, count.alias("count"))
+            .where(_CoverageModel.seen_in_run == (run or self.last_run))
+            .group_by(_CoverageModel.result)
+            .order_by(count.desc())
+        )
+        return {row.result: row.count for row in query}
+
+    def changed_urls(self, run: int | None = None) -> list[ChangedUrl]:
+        """The urls whose parse result changed class in a run (by default the last one)."""
+        query = (
+            _CoverageModel.select(_CoverageModel.url, _CoverageModel.previous_result, _CoverageModel.result)
+            .where(_CoverageModel.changed_in_run == (run or self.last_run))
+            .order_by(_CoverageModel.previous_result, _CoverageModel.result, _CoverageModel.url)
+        )
+        return [ChangedUrl(row.url, row.previous_result, row.result) for row in query]
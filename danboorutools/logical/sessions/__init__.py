@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
@@ -12,14 +13,13 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlencode
 
+import httpx
 import ring
-from backoff import constant, on_exception
+from backoff import constant, on_exception, runtime
 from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
 from cloudscraper import CloudScraper as _CloudScraper
 from cloudscraper.exceptions import CloudflareChallengeError
 from latest_user_agents import get_latest_user_agents
-from pyrate_limiter.limiter import Limiter
-from pyrate_limiter.request_rate import RequestRate
 from requests import Response
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import ConnectTimeout, ReadTimeout
@@ -38,18 +38,40 @@ from danboorutools.exceptions import (
 from danboorutools.logical.browser import Browser
 from danboorutools.logical.parsable_url import ParsableUrl
 from danboorutools.models.file import File, FileSubclass
-from danboorutools.util.misc import load_cookies_for, random_string, save_cookies_for
+from danboorutools.util.async_http import async_client, cookie_header, domain_semaphore, to_requests_response
+from danboorutools.util.cache import BoundedCache
+from danboorutools.util.connection_pool import pooled_adapter
+from danboorutools.util.http_cache import http_cache
+from danboorutools.util.misc import load_cookies_for, save_cookies_for
+from danboorutools.util.rate_limit import DEFAULT_BLOCK, rate_limiter_for, retry_after_seconds
 from danboorutools.util.time import datetime_from_string
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from lxml.html import HtmlElement
+
     from danboorutools.models.url import Url
 
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("SESSION_RESPONSE_CACHE_MAX_BYTES") or 64 * 1024 * 1024)
+
+# selectors that search_json can look up without parsing the page: "script", "script#id" or "#id"
+_RAW_SCRIPT_SELECTOR = re.compile(r"^(?:script)?(?:#([\w-]+))?$")
+_SCRIPT_TAG_PATTERN = re.compile(rb"<script\b([^>]*)>(.*?)</script\s*>", re.DOTALL | re.IGNORECASE)
+_ID_ATTRIBUTE_PATTERN = re.compile(rb"""(?:^|\s)id\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
 
 class ScraperResponse(Response):
-    def __init__(self, response: Response) -> None:  # pylint: disable=super-init-not-called
+    def __init__(self, response: Response, html_parser: str = "html5lib") -> None:  # pylint: disable=super-init-not-called
         self.__setstate__(response.__getstate__())  # type: ignore[attr-defined]
+        self.html_parser = html_parser
+
+    @cached_property
+    def decoded_content(self) -> str:
+        try:
+            # not .text by default because pages like https://soundcloud.com/user-798138171 don't get parsed correctly at the json part
+            return self.content.decode("utf-8")
+        except UnicodeDecodeError:
+            return self.text
 
     @cached_property
     def html(self) -> BeautifulSoup:
@@ -58,12 +80,25 @@ class ScraperResponse(Response):
 
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", XMLParsedAsHTMLWarning)
-            try:
-                # not .text by default because pages like https://soundcloud.com/user-798138171 don't get parsed correctly at the json part
-                decoded_content = self.content.decode("utf-8")
-            except UnicodeDecodeError:
-                decoded_content = self.text
-            return BeautifulSoup(decoded_content, "html5lib")
+            return BeautifulSoup(self.decoded_content, self.html_parser)
+
+    @cached_property
+    def _lxml_tree(self) -> HtmlElement:
+        from lxml.html import document_fromstring  # noqa: PLC0415
+
+        if not self.ok:
+            raise HTTPError(self)
+        try:
+            return document_fromstring(self.decoded_content)
+        except ValueError:  # unicode strings with an encoding declaration aren't supported
+            return document_fromstring(self.content)
+
+    def css(self, selector: str) -> list[HtmlElement]:
+        """Select elements straight from lxml's tree, without building a BeautifulSoup one on top of it.
+
+        Much cheaper than .html for one-off lookups, but the results are lxml elements, not bs4 tags.
+        """
+        return self._lxml_tree.cssselect(selector)
 
     def json(self, **kwargs) -> dict:
         try:
@@ -75,17 +110,18 @@ class ScraperResponse(Response):
             else:
                 raise
 
-    def search_json(self, pattern: str, selector: str | None = None, post_process: Callable[[str], str] | None = None) -> dict:
-        html = self.html
-
-        if not (elements := html.select(selector or "script")):
-            raise ValueError(f"No element with selector {selector or "script"} found in page.")
+    def search_json(self,
+                    pattern: str,
+                    selector: str | None = None,
+                    post_process: Callable[[str], str] | None = None,
+                    marker: str | None = None) -> dict:
+        """Extract the json matched by the first group of `pattern` in the first matching `selector` element (by default any script).
 
-        for script in elements:
-            if (match := re.search(pattern, script.decode_contents())):
-                break
-        else:
-            raise JsonNotFoundError(self)
+        Script selectors are first searched for in the raw page, decoding only the scripts that contain `marker` (if given),
+        so that the whole page doesn't have to be parsed into soup just to find a json blob in it.
+        """
+        if not (match := self._search_raw_scripts(pattern, selector, marker)):
+            match = self._search_elements(pattern, selector)
 
         parsable_json = match.groups()[0]
         if post_process:
@@ -96,12 +132,74 @@ class ScraperResponse(Response):
             raise NotImplementedError(parsable_json) from e
         return parsed_json
 
+    def _search_raw_scripts(self, pattern: str, selector: str | None, marker: str | None) -> re.Match | None:
+        if not (selector_match := _RAW_SCRIPT_SELECTOR.match(selector or "script")):
+            return None
+        if not self.ok:
+            raise HTTPError(self)
+
+        element_id = selector_match.group(1)
+        encoded_marker = marker.encode("utf-8") if marker else None
+        for script in _SCRIPT_TAG_PATTERN.finditer(self.content):
+            attributes, contents = script.groups()
+            if element_id and not ((id_match := _ID_ATTRIBUTE_PATTERN.search(attributes)) and id_match.group(1).decode() == element_id):
+                continue
+            if encoded_marker and encoded_marker not in contents:
+                continue
+            try:
+                decoded_contents = contents.decode("utf-8")
+            except UnicodeDecodeError:
+                decoded_contents = contents.decode(self.encoding or self.apparent_encoding, errors="replace")
+            if (match := re.search(pattern, decoded_contents)):
+                return match
+        # not necessarily missing: the raw scan doesn't handle every kind of broken markup, so let the soup have a look
+        return None
+
+    def _search_elements(self, pattern: str, selector: str | None) -> re.Match:
+        if not (elements := self.html.select(selector or "script")):
+            raise ValueError(f"No element with selector {selector or "script"} found in page.")
+
+        for script in elements:
+            if (match := re.search(pattern, script.decode_contents())):
+                return match
+        raise JsonNotFoundError(self)
+
+
+def _rate_limit_wait(error: RateLimitError) -> float:
+    # wait as long as the server asked to, so that the retry isn't sent while the limiter is still blocked
+    headers = error.response.headers if error.response is not None else {}
+    return retry_after_seconds(headers) or DEFAULT_BLOCK
+
 
 class Session(_CloudScraper):
     DISABLE_AUTOMATIC_CACHE = False
     DEFAULT_USER_AGENT = next(u for u in get_latest_user_agents() if "Chrome/" in u)
     DEFAULT_TIMEOUT = 5
+    # the starting rate: it's lowered on 429s and, while responses stay healthy, probed back up to this many times the starting rate
     MAX_CALLS_PER_SECOND: int | float = 3
+    ADAPTIVE_RATE_CEILING: float = 4
+    MAX_CONCURRENT_REQUESTS_PER_DOMAIN = 4
+    # the BeautifulSoup tree builder used by ScraperResponse.html. lxml is much faster, but it repairs broken markup differently,
+    # so only switch a session to it once benchmark_html_parsers shows identical results on that site's pages
+    HTML_PARSER = "html5lib"
+
+    # responses to GET requests matching this pattern are stored on disk and shared between processes for this many seconds,
+    # after which they're revalidated with If-None-Match/If-Modified-Since if the server sent an ETag/Last-Modified
+    PERSISTENT_CACHE_TTL: float = 0
+    PERSISTENT_CACHE_PATTERN: re.Pattern | None = None
+
+    # in-memory cache of recent responses, bounded by their total body size
+    RESPONSE_CACHE_MAX_BYTES: int = RESPONSE_CACHE_MAX_BYTES
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+
+    # connection pools: how many hosts to keep pools for, how many connections to keep alive per host, and how many times
+    # urllib3 retries failed connections; sessions with the same CONNECTION_POOL name (by default, their class name) share them
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 16
+    POOL_MAX_RETRIES = 0
+    POOL_BLOCK = False
+    KEEP_ALIVE = True
+    CONNECTION_POOL: str | None = None
 
     @property
     def default_headers(self) -> dict:
@@ -129,40 +227,115 @@ class Session(_CloudScraper):
 
         self.session_domain = self.__class__.__name__.removesuffix("Session").removesuffix("Api").lower()  # used in cookie saving
 
-        if self.MAX_CALLS_PER_SECOND < 1:
-            interval = 1 / self.MAX_CALLS_PER_SECOND
-            max_calls = 1.0
-        else:
-            max_calls = self.MAX_CALLS_PER_SECOND
-            interval = 1
-        self.limiter = Limiter(RequestRate(max_calls, interval))  # type: ignore[arg-type]
+        # mounted again on every init, but always the same adapters, so the pools and their kept-alive connections survive it
+        for scheme in ("https", "http"):
+            self.mount(f"{scheme}://", pooled_adapter(
+                self.CONNECTION_POOL or self.__class__.__name__,
+                scheme,
+                pool_connections=self.POOL_CONNECTIONS,
+                pool_maxsize=self.POOL_MAXSIZE,
+                max_retries=self.POOL_MAX_RETRIES,
+                pool_block=self.POOL_BLOCK,
+                cipherSuite=self.cipherSuite,
+                ecdhCurve=self.ecdhCurve,
+                server_hostname=self.server_hostname,
+                source_address=self.source_address,
+                ssl_context=self.ssl_context,
+            ))
+
+        # shared with every other process running this session, through redis if available or a file lock otherwise
+        self.limiter = rate_limiter_for(
+            self.MAX_CALLS_PER_SECOND,
+            namespace=self.__class__.__name__,
+            max_calls_per_second=self.MAX_CALLS_PER_SECOND * self.ADAPTIVE_RATE_CEILING,
+        )
 
     @cached_property
     def browser(self) -> Browser:
         return Browser()
 
+    @cached_property
+    def response_cache(self) -> BoundedCache[str, Response]:
+        # a cached_property, because __init__ runs again every time the cached session is "instantiated"
+        return BoundedCache(
+            max_entries=self.RESPONSE_CACHE_MAX_ENTRIES,
+            max_bytes=self.RESPONSE_CACHE_MAX_BYTES,
+            sizeof=lambda response: len(response.content),
+        )
+
     def request(self, method: str, *args, skip_cache: bool | None = None, **kwargs) -> ScraperResponse:
+        if self._is_persistently_cacheable(method, args, skip_cache, kwargs):
+            return ScraperResponse(self._persistently_cached_request(method, *args, **kwargs), self.HTML_PARSER)
+
+        cache_key = self._response_cache_key(method, args, kwargs)
         if skip_cache is True \
                 or (skip_cache is None and self.DISABLE_AUTOMATIC_CACHE)\
                 or (method.lower() not in ["get", "head"] and skip_cache is not False):
             # always cache every request by default, but discard the cache if a subsequent call is made that does not want a cached version
             # in theory cache access is slower, but who cares, the limiter will always be the request itself anyway
-            self._cached_request.delete(method, *args, **kwargs)
-        response = self._cached_request(method, *args, **kwargs)
-        if response.status_code >= 400 and response.status_code not in [404]:
-            # Don't cache bad responses responses
-            self._cached_request.delete(method, *args, **kwargs)
-        return ScraperResponse(response)
+            self.response_cache.delete(cache_key)
+        elif (cached_response := self.response_cache.get(cache_key)) is not None:
+            return ScraperResponse(cached_response, self.HTML_PARSER)
+
+        response = self._request_with_retries(method, *args, **kwargs)
+        # streamed downloads are never cached, and neither are bad responses other than 404s
+        if (response.status_code < 400 or response.status_code == 404) and not kwargs.get("stream"):
+            self.response_cache.set(cache_key, response)
+        return ScraperResponse(response, self.HTML_PARSER)
+
+    @staticmethod
+    def _response_cache_key(method: str, args: tuple, kwargs: dict) -> str:
+        if args and not isinstance(args[0], str):
+            args = (args[0].normalized_url, *args[1:])
+        return repr((method.lower(), args, sorted(kwargs.items())))
+
+    def _is_persistently_cacheable(self, method: str, args: tuple, skip_cache: bool | None, kwargs: dict) -> bool:
+        if skip_cache is True or (skip_cache is None and self.DISABLE_AUTOMATIC_CACHE):
+            return False
+        if not self.PERSISTENT_CACHE_TTL or method.lower() != "get":
+            return False
+        if not args or kwargs.get("stream") or kwargs.get("data") or kwargs.get("json"):
+            return False
+        url = args[0] if isinstance(args[0], str) else args[0].normalized_url
+        return self.PERSISTENT_CACHE_PATTERN is None or bool(self.PERSISTENT_CACHE_PATTERN.search(url))
+
+    def _persistently_cached_request(self, http_method: str, url: str | Url, *args, **kwargs) -> Response:
+        if not isinstance(url, str):
+            url = url.normalized_url
 
-    @ring.lru()
-    @on_exception(constant, RateLimitError, max_tries=2, interval=30, jitter=None)
+        url_domain = ParsableUrl(url).domain
+        cache_key = http_cache.key_for(http_method, url, kwargs.get("params"))
+        cached = http_cache.get(cache_key)
+
+        if cached and cached.age < self.PERSISTENT_CACHE_TTL:
+            http_cache.record(url_domain, "hits")
+            return cached.to_response()
+
+        if cached:
+            kwargs["headers"] = kwargs.get("headers", {}) | cached.validators
+
+        response = self._request_with_retries(http_method, url, *args, **kwargs)
+
+        if cached and response.status_code == 304:
+            http_cache.record(url_domain, "revalidated")
+            http_cache.refresh(cache_key)
+            return cached.to_response()
+
+        http_cache.record(url_domain, "misses")
+        if response.status_code == 200:
+            http_cache.set(cache_key, url_domain, response)
+        return response
+
+    @on_exception(runtime, RateLimitError, max_tries=2, value=_rate_limit_wait, jitter=None)
     @on_exception(constant, ReadTimeout, max_tries=3, interval=5, jitter=None)
     @on_exception(constant, RequestsConnectionError, max_tries=3, interval=5, jitter=None)
-    def _cached_request(self, http_method: str, url: str | Url, *args, **kwargs) -> Response:
+    def _request_with_retries(self, http_method: str, url: str | Url, *args, **kwargs) -> Response:
         if not isinstance(url, str):
             url = url.normalized_url
 
         kwargs["headers"] = self.default_headers | kwargs.get("headers", {})
+        if not self.KEEP_ALIVE:
+            kwargs["headers"].setdefault("Connection", "close")
 
         url_domain = ParsableUrl(url).domain
         kwargs.setdefault("proxies", self.proxied_domains.get(url_domain))
@@ -189,6 +362,12 @@ class Session(_CloudScraper):
             del sys.tracebacklimit  # fucking cloudscraper
             raise
 
+        self.limiter.feedback(url_domain, response.status_code, response.headers)
+        self._check_response(response)
+        return response
+
+    @staticmethod
+    def _check_response(response: Response) -> None:
         if response.status_code == 401:
             raise NotAuthenticatedError(response)
         if response.status_code == 403:
@@ -202,33 +381,117 @@ class Session(_CloudScraper):
             if "instagram.com/accounts/login" in response.url:
                 raise ShieldedUrlError(response)
             raise RateLimitError(response)
-        return response
 
-    def download_file(self, url: str | Url, *args, download_dir: Path | str | None = None, **kwargs) -> FileSubclass:
+    async def arequest(self, method: str, url: str | Url, *, skip_cache: bool | None = None, **kwargs) -> ScraperResponse:
+        """Make a request on the shared async HTTP/2 client.
+
+        Requests to different domains overlap, while requests to the same domain share the sync path's limiter and are capped
+        at MAX_CONCURRENT_REQUESTS_PER_DOMAIN. Cloudflare challenges are not solved on this path.
+        """
+        cache_key = self._response_cache_key(method, (url, ), kwargs)
+        if skip_cache is True or (skip_cache is None and self.DISABLE_AUTOMATIC_CACHE) or method.lower() not in ["get", "head"]:
+            self.response_cache.delete(cache_key)
+        elif (cached_response := self.response_cache.get(cache_key)) is not None:
+            return ScraperResponse(cached_response, self.HTML_PARSER)
+
+        response = await self._arequest_with_retries(method, url, **kwargs)
+        if response.status_code < 400 or response.status_code == 404:
+            self.response_cache.set(cache_key, response)
+        return ScraperResponse(response, self.HTML_PARSER)
+
+    async def aget(self, url: str | Url, **kwargs) -> ScraperResponse:
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str | Url, **kwargs) -> ScraperResponse:
+        return await self.arequest("POST", url, **kwargs)
+
+    @on_exception(runtime, RateLimitError, max_tries=2, value=_rate_limit_wait, jitter=None)
+    @on_exception(constant, httpx.ReadTimeout, max_tries=3, interval=5, jitter=None)
+    @on_exception(constant, httpx.ConnectError, max_tries=3, interval=5, jitter=None)
+    async def _arequest_with_retries(self, http_method: str, url: str | Url, **kwargs) -> Response:
+        if not isinstance(url, str):
+            url = url.normalized_url
 
-        tmp_filename = Path(tempfile.gettempdir()) / random_string(20)
-        if download_dir is not None:
-            download_dir = Path(download_dir)
+        headers = self.default_headers | kwargs.pop("headers", {})
+        if cookies := cookie_header(self.cookies.get_dict(), kwargs.pop("cookies", None)):
+            headers["Cookie"] = cookies
 
-        kwargs["headers"] = self.default_headers | kwargs.get("headers", {})
+        url_domain = ParsableUrl(url).domain
+        proxies = kwargs.pop("proxies", None) or self.proxied_domains.get(url_domain)
+        client = async_client(proxies["https"] if proxies else None)
+        kwargs.setdefault("timeout", self.DEFAULT_TIMEOUT)
+
+        try:
+            async with domain_semaphore(url_domain, self.MAX_CONCURRENT_REQUESTS_PER_DOMAIN), \
+                    self.limiter.ratelimit(url_domain, delay=True):
+                logger.trace(f"Async {http_method} request made to {url}")
+                httpx_response = await client.request(http_method, url, headers=headers, **kwargs)
+        except httpx.ConnectTimeout as e:
+            raise DeadUrlError(original_url=url, status_code=0) from e
+        except httpx.ConnectError as e:
+            if "Name or service not known" in str(e) or "nodename nor servname" in str(e):
+                raise DeadUrlError(original_url=url, status_code=0) from e
+            raise
+
+        response = to_requests_response(httpx_response, http_method)
+        self.limiter.feedback(url_domain, response.status_code, response.headers)
+        self._check_response(response)
+        return response
 
-        download_stream = self.get(url, *args, timeout=self.DEFAULT_TIMEOUT, stream=True, **kwargs)
+    def download_file(self,
+                      url: str | Url,
+                      *args,
+                      download_dir: Path | str | None = None,
+                      with_sha256: bool = False,
+                      **kwargs) -> FileSubclass:
+        """Download a file into download_dir, named after its md5.
+
+        An interrupted download is resumed with a Range request on the next attempt, as long as the server sent a validator
+        (ETag or Last-Modified) that can prove the rest of the file still belongs to the same one.
+        """
+        if not isinstance(url, str):
+            url = url.normalized_url
+        destination_dir = Path(download_dir) if download_dir is not None else Path(tempfile.gettempdir())
+        destination_dir.mkdir(parents=True, exist_ok=True)
+        partial_path = destination_dir / f".{hashlib.sha1(url.encode("utf-8"), usedforsecurity=False).hexdigest()}.part"
+        validator_path = partial_path.with_suffix(".validator")
+
+        request_headers = kwargs.pop("headers", {})
+        headers = self.default_headers | request_headers
+        if (resume_from := partial_path.stat().st_size if partial_path.exists() else 0) and validator_path.exists():
+            headers |= {"Range": f"bytes={resume_from}-", "If-Range": validator_path.read_text(encoding="utf-8")}
+
+        download_stream = self.get(url, *args, headers=headers, timeout=self.DEFAULT_TIMEOUT, stream=True, **kwargs)
+        if download_stream.status_code == 416 and "Range" in headers:
+            # the partial download doesn't match the file anymore
+            partial_path.unlink()
+            validator_path.unlink()
+            return self.download_file(url, *args, download_dir=download_dir, with_sha256=with_sha256, headers=request_headers, **kwargs)
         if not download_stream.ok:
             raise DownloadError(download_stream)
 
-        tmp_filename.parent.mkdir(parents=True, exist_ok=True)
-        with tmp_filename.open("wb") as dest_buffer:
-            for chunk in download_stream.iter_content(chunk_size=1024 * 1024 * 10):
-                if chunk:  # filter out keep-alive new chunks
-                    dest_buffer.write(chunk)
+        if download_stream.status_code == 206:
+            logger.debug(f"Resuming the download of {url} from {resume_from} bytes.")
+        else:
+            partial_path.unlink(missing_ok=True)
+            etag = download_stream.headers.get("ETag")
+            if validator := (etag if etag and not etag.startswith("W/") else download_stream.headers.get("Last-Modified")):
+                validator_path.write_text(validator, encoding="utf-8")
+            else:
+                validator_path.unlink(missing_ok=True)
+
+        # hashed and identified while it's being written, so that the file never has to be read back or moved
+        chunks = (chunk for chunk in download_stream.iter_content(chunk_size=1024 * 1024 * 10) if chunk)  # filter out keep-alive new chunks
+        downloaded_file = File.from_stream(chunks, destination_dir=destination_dir, with_sha256=with_sha256, resume_path=partial_path)
+        validator_path.unlink(missing_ok=True)
 
         if source_time := download_stream.headers.get("last-modified"):
             # Set modification time based on the source. This is useful when downloading files
             # from sources that do not have an easily available timestamp
             unix_time = time.mktime(datetime_from_string(source_time).timetuple())
-            os.utime(tmp_filename, (unix_time, unix_time))
+            os.utime(downloaded_file.path, (unix_time, unix_time))
 
-        return File.identify(tmp_filename, destination_dir=download_dir, md5_as_filename=True)
+        return downloaded_file
 
     @cached_property
     def browser_cookies(self) -> dict:
@@ -225,6 +225,8 @@ class Ascii2dArtistResult:
 
 class Ascii2dSession(Session):
     MAX_CALLS_PER_SECOND = 0.5
+    # searches are metered by the site, so the rate is never probed above the starting one
+    ADAPTIVE_RATE_CEILING = 1
     DEFAULT_TIMEOUT = 60
 
     def _reverse_search_url(self, url: str) -> list[Ascii2dArtistResult]:
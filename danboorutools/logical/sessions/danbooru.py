@@ -3,7 +3,10 @@ from __future__ import annotations
 import os
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from queue import Full, Queue
+from threading import Event
 from typing import TYPE_CHECKING, Literal, TypeVar, overload
 
 from backoff import expo, on_exception
@@ -18,13 +21,17 @@ from danboorutools.logical.progress_tracker import ProgressTracker
 from danboorutools.logical.sessions import Session
 from danboorutools.models import danbooru as models
 from danboorutools.models.url import UnknownUrl, Url, UselessUrl
+from danboorutools.util.threading import read_ahead
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterator, Sequence
     from pathlib import Path
 
+    from danboorutools.logical.columnar import ColumnarResults
     from danboorutools.models.file import File
 
+MIN_SHARD_SIZE = 1000
+
 GenericDanbooruModel = TypeVar("GenericDanbooruModel", bound=models.DanbooruModel)
 GenericModel = TypeVar("GenericModel", bound=BaseModel)
 
@@ -162,25 +169,252 @@ class DanbooruApi(Session):
         val.value = f"{time.time()},{last_version_time.timestamp() if last_version_time else ""}"
         return last_version_time
 
-    def all_posts(self, tags: list[str]) -> list[models.DanbooruPost]:
-        posts: list[models.DanbooruPost] = []
-        page: int | str = 1
+    def all_posts(self, tags: list[str], shards: int = 0) -> list[models.DanbooruPost]:
+        posts = list(self.paginate(models.DanbooruPost, tags=tags, prefetch=2, shards=shards))
+        logger.info(f"Done. Found {len(posts)} posts.")
+        return posts
+
+    def paginate(self,
+                 model: type[GenericDanbooruModel],
+                 *,
+                 max_items: int | None = None,
+                 progress: ProgressTracker[int] | ProgressTracker[dict[int, int]] | None = None,
+                 ascending: bool = False,
+                 prefetch: int = 0,
+                 shards: int = 0,
+                 lean: bool = False,
+                 keep_raw_data: bool = True,
+                 **search,
+                 ) -> Iterator[GenericDanbooruModel]:
+        """Yield every result of a search, walking it by id with b<id>/a<id> cursors instead of page numbers.
+
+        Deep numbered pages time out and skip or repeat results when the search changes while it's being walked, cursors don't.
+        Posts are searched with `tags`, every other model with the same search[...] kwargs as its endpoint.
+        Only one page is kept in memory at a time, plus up to `prefetch` pages fetched in the background while it's consumed.
+        If a progress tracker is passed, the walk resumes from the id it holds,
+        and the last id of each page is saved to it once the whole page has been consumed.
+
+        With `shards`, the id range of the search is instead split into that many windows that are walked concurrently,
+        and results are yielded in no particular order. The progress tracker then holds the windows left. See _sharded_pages.
+
+        With `lean`, results are built without validation (see BaseModel.construct_trusted), optionally without keeping their _raw_data.
+        """
+        if model is not models.DanbooruPost:
+            assert model.danbooru_model_name
+            search.setdefault("only", self.only_string_defaults.get(model.danbooru_model_name))
+
+        yielded = 0
+        for page in self._pages(model, progress=progress, ascending=ascending, prefetch=prefetch, shards=shards, **search):
+            for model_data in page:
+                if max_items is not None and yielded >= max_items:
+                    return
+                yield _build_model(model, model_data, lean=lean, keep_raw_data=keep_raw_data)
+                yielded += 1
+
+    def export(self,
+               model: type[GenericDanbooruModel],
+               fields: list[str],
+               *,
+               cache: Path | None = None,
+               refresh: bool = False,
+               ascending: bool = False,
+               prefetch: int = 0,
+               shards: int = 0,
+               **search,
+               ) -> ColumnarResults:
+        """Stream the results of a search into one numpy array per field, without building any model, for vectorised aggregations.
+
+        Fields are dotted paths into the json of the model, like `post.uploader_id`, and only those are requested from danbooru.
+        The search is walked like paginate() does. If a cache path is passed, the arrays are saved to it,
+        and later calls load them back from it instead of fetching them again, unless `refresh` is set or fields are missing from it.
+        """
+        from danboorutools.logical.columnar import ColumnarBuffer, ColumnarResults
+
+        if cache and cache.exists() and not refresh:
+            cached = ColumnarResults.load(cache)
+            if set(fields) <= set(cached.columns):
+                logger.info(f"Loaded {len(cached)} cached {model.danbooru_model_name}s from {cache}.")
+                return cached
+
+        buffer = ColumnarBuffer(model, fields)
+        search["only"] = buffer.only_string
+        for page in self._pages(model, ascending=ascending, prefetch=prefetch, shards=shards, **search):
+            buffer.append(page)
+        results = buffer.finish()
+        logger.info(f"Exported {len(results)} {model.danbooru_model_name}s.")
+
+        if cache:
+            results.save(cache)
+        return results
+
+    def _pages(self,
+               model: type[GenericDanbooruModel],
+               progress: ProgressTracker[int] | ProgressTracker[dict[int, int]] | None = None,
+               ascending: bool = False,
+               prefetch: int = 0,
+               shards: int = 0,
+               **search,
+               ) -> Iterator[list[dict]]:
+        if shards:
+            assert not ascending, "Sharded scans have no order."
+            return self._sharded_pages(model, shards, progress=progress, prefetch=prefetch, **search)  # type: ignore[arg-type]
+        return self._keyset_pages(model, progress=progress, ascending=ascending, prefetch=prefetch, **search)  # type: ignore[arg-type]
+
+    def _keyset_pages(self,
+                      model: type[GenericDanbooruModel],
+                      progress: ProgressTracker[int] | None = None,
+                      ascending: bool = False,
+                      prefetch: int = 0,
+                      **search,
+                      ) -> Iterator[list[dict]]:
+        pages = self._fetch_keyset_pages(model, start_id=progress.value if progress else 0, ascending=ascending, **search)
+        if prefetch:
+            # the next cursor is known as soon as a page is fetched, so the following ones can be requested while it's parsed
+            pages = read_ahead(pages, depth=prefetch)
+
+        for page in pages:
+            yield page
+            if progress:
+                progress.value = page[-1]["id"]
+
+    def _sharded_pages(self,
+                       model: type[GenericDanbooruModel],
+                       shards: int,
+                       progress: ProgressTracker[dict[int, int]] | None = None,
+                       prefetch: int = 0,
+                       **search,
+                       ) -> Iterator[list[dict]]:
+        """Split the id range of a search into disjoint id:a..b windows and walk them concurrently, merging their pages as they come.
+
+        Requests still go through the session's rate limit, with at most MAX_CONCURRENT_REQUESTS_PER_DOMAIN windows walked at a time.
+        A window that keeps timing out is split in two, down to MIN_SHARD_SIZE ids.
+        The progress tracker holds the windows that are left, as {lowest id: highest id}, updated whenever a page has been consumed,
+        so an interrupted scan resumes without walking again what was already done. It's cleared once the scan is complete.
+        """
+        windows: dict[int, int] = dict(progress.value) if progress and progress.value else self._id_windows(model, shards, **search)
+        if not windows:
+            return
+
+        events: Queue[tuple] = Queue(maxsize=max(prefetch, shards))
+        stopped = Event()
+        executor = ThreadPoolExecutor(max_workers=min(shards, self.MAX_CONCURRENT_REQUESTS_PER_DOMAIN), thread_name_prefix="shard")
+
+        def emit(*event: object) -> bool:
+            while not stopped.is_set():
+                try:
+                    events.put(event, timeout=0.1)
+                except Full:
+                    continue
+                return True
+            return False
+
+        def walk(lowest_id: int, highest_id: int) -> None:
+            if model is models.DanbooruPost:
+                window_search = search | {"tags": [*search.get("tags", []), f"id:{lowest_id}..{highest_id}"]}
+            else:
+                window_search = search | {"id": f"{lowest_id}..{highest_id}"}
+
+            try:
+                for page in self._fetch_keyset_pages(model, start_id=highest_id + 1, ascending=False, **window_search):
+                    if not emit("page", lowest_id, page):
+                        return
+                    highest_id = page[-1]["id"] - 1
+            except Exception as e:  # noqa: BLE001
+                if not _is_timeout(e) or highest_id - lowest_id < MIN_SHARD_SIZE:
+                    emit("error", e)
+                    return
+                middle_id = (lowest_id + highest_id) // 2
+                logger.info(f"Window {lowest_id}..{highest_id} timed out. Splitting it at {middle_id}.")
+                if emit("split", lowest_id, middle_id, highest_id):
+                    executor.submit(walk, lowest_id, middle_id)
+                    executor.submit(walk, middle_id + 1, highest_id)
+            else:
+                emit("done", lowest_id)
+
+        logger.debug(f"Scanning {model.danbooru_model_name}s for {search} in {len(windows)} windows...")
+        for lowest_id, highest_id in windows.items():
+            executor.submit(walk, lowest_id, highest_id)
+
+        try:
+            while windows:
+                match events.get():
+                    case ("error", error):
+                        raise error
+                    case ("page", lowest_id, page):
+                        yield page
+                        windows[lowest_id] = page[-1]["id"] - 1
+                        if windows[lowest_id] < lowest_id:
+                            del windows[lowest_id]
+                    case ("split", lowest_id, middle_id, highest_id):
+                        windows[lowest_id] = middle_id
+                        windows[middle_id + 1] = highest_id
+                    case ("done", lowest_id):
+                        windows.pop(lowest_id, None)
+
+                if progress:
+                    progress.value = windows.copy()
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if progress:
+            del progress.value
+
+    def _id_windows(self, model: type[GenericDanbooruModel], shards: int, **search) -> dict[int, int]:
+        if model is models.DanbooruPost:
+            search |= {"tags": [*search.get("tags", []), "limit:1"]}
+        else:
+            search |= {"limit": 1, "only": "id"}
+
+        bounds = [
+            next(iter(next(self._fetch_keyset_pages(model, start_id=0, ascending=ascending, **search), [])), None)
+            for ascending in (True, False)
+        ]
+        if None in bounds:
+            return {}
+        lowest_id, highest_id = (bound["id"] for bound in bounds)  # type: ignore[index]
+
+        window_size = -(-(highest_id - lowest_id + 1) // shards)
+        return {start: min(start + window_size - 1, highest_id) for start in range(lowest_id, highest_id + 1, window_size)}
+
+    def _fetch_keyset_pages(self, model: type[GenericDanbooruModel], start_id: int, ascending: bool, **search) -> Iterator[list[dict]]:
+        assert (model_name := model.danbooru_model_name)
+        if model is models.DanbooruPost:
+            tags = search.pop("tags", [])
+            limit = next((int(tag.removeprefix("limit:")) for tag in tags if tag.startswith("limit:")), 200)
+            params = {"tags": " ".join(tags), "limit": limit, **search}
+        else:
+            limit = search.pop("limit", 1000)
+            params = kwargs_to_include(**search, limit=limit)
+
+        last_id = start_id
         while True:
-            logger.info(f"Collecting posts for the search {tags}: at page {page}, found: {len(posts)}")
-            found_posts = self.posts(tags, page=page)
-            if not found_posts:
-                logger.info(f"Done. Found {len(posts)} posts.")
-                return posts
-            posts += found_posts
-            lowest_id = min(found_posts, key=lambda post: post.id).id
-            page = f"b{lowest_id}"
-
-    def _generic_endpoint(self, model_type: type[GenericDanbooruModel], **kwargs) -> list[GenericDanbooruModel]:
+            params["page"] = f"{"a" if ascending else "b"}{last_id}" if last_id or ascending else 1
+            logger.debug(f"Fetching {model_name}s for {search} (page {params["page"]})...")
+            page = self.danbooru_request("GET", f"{model_name}s.json", params=params)
+            assert isinstance(page, list)
+            if not page:
+                return
+
+            page.sort(key=lambda model_data: model_data["id"], reverse=not ascending)
+            yield page
+
+            last_id = page[-1]["id"]
+            # danbooru filters hidden posts out of post pages, so only for the other models does a short page mean the end
+            if model is not models.DanbooruPost and len(page) < limit:
+                return
+
+    def _generic_endpoint(self,
+                          model_type: type[GenericDanbooruModel],
+                          lean: bool = False,
+                          keep_raw_data: bool = True,
+                          **kwargs,
+                          ) -> list[GenericDanbooruModel]:
         assert model_type.danbooru_model_name
         only_string = self.only_string_defaults.get(model_type.danbooru_model_name)
         params = kwargs_to_include(**kwargs, only=only_string)
         response = self.danbooru_request("GET", f"{model_type.danbooru_model_name}s.json", params=params)
-        return [model_type(**model_data) for model_data in response]
+        return [_build_model(model_type, model_data, lean=lean, keep_raw_data=keep_raw_data) for model_data in response]
 
     def artists(self, **kwargs) -> list[models.DanbooruArtist]:
         return self._generic_endpoint(models.DanbooruArtist, **kwargs)
@@ -248,25 +482,20 @@ class DanbooruApi(Session):
     def get_all(self,
                 model: type[GenericDanbooruModel],
                 to_model: type[GenericModel] | None = None,
+                lean: bool = False,
+                keep_raw_data: bool = True,
                 **kwargs,
                 ) -> list[GenericDanbooruModel] | list[GenericModel]:
 
-        object_list: list[GenericDanbooruModel] | list[GenericModel] = []
-        return_model = to_model or model
-        kwargs["page"] = 1
-
         assert (model_name := model.danbooru_model_name)
-        kwargs["limit"] = 200 if model == models.DanbooruPost else 1000
-
-        while True:
-            logger.debug(f"Fetching all {model_name}s (page {kwargs["page"]})...")
-
-            results = danbooru_api.danbooru_request("GET", f"{model_name}s.json", params=kwargs_to_include(**kwargs))
-            object_list += [return_model(**r) for r in results]  # type: ignore[assignment]
-            if len(results) < kwargs["limit"]:
-                logger.info(f"Finished fetching {model_name}s. Total: {len(object_list)}")
-                return object_list
-            kwargs["page"] += 1
+        return_model = to_model or model
+        object_list = [
+            _build_model(return_model, model_data, lean=lean, keep_raw_data=keep_raw_data)  # type: ignore[arg-type]
+            for page in self._keyset_pages(model, prefetch=2, **kwargs)
+            for model_data in page
+        ]
+        logger.info(f"Finished fetching {model_name}s. Total: {len(object_list)}")
+        return object_list  # type: ignore[return-value]
 
     def create_artist(self, name: str, other_names: list[str], urls: Sequence[Url | str]) -> None:
         url_string = self._generate_url_string_for_artist(urls)
@@ -451,6 +680,18 @@ class DanbooruApi(Session):
         return value.strftime(format_string)
 
 
+def _build_model(model: type[GenericDanbooruModel], model_data: dict, lean: bool, keep_raw_data: bool) -> GenericDanbooruModel:
+    if lean:
+        return model.construct_trusted(model_data, keep_raw_data=keep_raw_data)
+    return model(**model_data)
+
+
+def _is_timeout(error: Exception) -> bool:
+    if isinstance(error, ReadTimeout):
+        return True
+    return isinstance(error, DanbooruHTTPError) and error.error_type == "ActiveRecord::QueryCanceled"
+
+
 def kwargs_to_include(**kwargs) -> dict:
     """Turn kwargs into url parameters that Rails can understand."""
     parameters = kwargs.copy()
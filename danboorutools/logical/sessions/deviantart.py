@@ -55,6 +55,7 @@ class DeviantartSession(Session):
         parsed_json = response.search_json(
             pattern=r'window.__INITIAL_STATE__ = JSON.parse\("(.*)"\);',
             post_process=lambda x: x.encode("utf-8").decode("unicode_escape"),
+            marker="__INITIAL_STATE__",
         )
 
         modules = next(iter(parsed_json["@@gruser"]["grusers"].values()))["modules"]
@@ -78,6 +79,7 @@ class DeviantartSession(Session):
         data = page.search_json(
             pattern=r'window.__INITIAL_STATE__ = JSON.parse\("(.*)"\);',
             post_process=lambda x: x.encode("utf-8").decode("unicode_escape"),
+            marker="__INITIAL_STATE__",
         )
         return DeviantartHTMLPostData(**data)
 
@@ -19,6 +19,7 @@ class LitLinkSession(Session):
         artist_data = response.search_json(
             pattern=r"self.__next_f.push\(.*?({.*urlPath.*}).*?\)",
             post_process=lambda x: re.sub(r'\\+"', '\\"', x.replace('\\"', '"')),
+            marker="urlPath",
         )
         artist_data = artist_data["children"][-1]["profile"]
         return LitLinkArtistData(**artist_data)
@@ -9,7 +9,7 @@ class LofterSession(Session):
 
     def blog_data(self, blog_name: str) -> LofterBlogData:
         response = self.get(f"https://{blog_name}.lofter.com")
-        raw_data = response.search_json(pattern=r"window.__initialize_data__ = (.*)")
+        raw_data = response.search_json(pattern=r"window.__initialize_data__ = (.*)", marker="__initialize_data__")
         data = raw_data["blogData"]["data"]["blogInfo"]
         return LofterBlogData(**data)
 
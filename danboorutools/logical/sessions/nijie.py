@@ -18,7 +18,7 @@ class NijieSession(Session):
 
     @ring.lru()
     def login(self) -> None:
-        self._cached_request.storage.backend.clear()
+        self.response_cache.clear()
         try:
             self.load_cookies()
         except NoCookiesForDomainError:
@@ -24,6 +24,10 @@ DELETION_MESSAGES = [
 
 
 class PixivSession(Session):
+    CONNECTION_POOL = "pixiv"
+    PERSISTENT_CACHE_TTL = 6 * 60 * 60
+    PERSISTENT_CACHE_PATTERN = re.compile(r"/ajax/(?:user/details|illust/\d+)")
+
     def get_api(self, url: str) -> dict:
         self.cookies.clear()  # pixiv does not like it if I send it the cookies from a previous request
         resp = self.get(url)
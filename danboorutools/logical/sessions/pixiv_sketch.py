@@ -15,6 +15,8 @@ if TYPE_CHECKING:
 
 
 class PixivSketchSession(Session):
+    CONNECTION_POOL = "pixiv"
+
     def get_page_of_posts(self, url: str, headers: dict) -> PixivSketchPageData:
         cookies = {"PHPSESSID": os.environ["PIXIV_PHPSESSID_COOKIE"]}
         feed_data = self.get(url, headers=headers, cookies=cookies).json()
@@ -186,6 +186,8 @@ class SaucenaoSession(Session):
 
     API_KEY = os.environ["SAUCENAO_API_KEY"]
     MAX_CALLS_PER_SECOND = 0.5
+    # searches are metered by the site, so the rate is never probed above the starting one
+    ADAPTIVE_RATE_CEILING = 1
     DEFAULT_TIMEOUT = 10
 
     def _reverse_search_url(self, image_url: str) -> list[_SaucenaoApiResult]:
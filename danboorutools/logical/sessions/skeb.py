@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import re
 
 from danboorutools import logger, settings
 from danboorutools.exceptions import NotAuthenticatedError
@@ -21,6 +22,9 @@ from danboorutools.util.misc import BaseModel, extract_urls_from_string
 
 
 class SkebSession(Session):
+    PERSISTENT_CACHE_TTL = 6 * 60 * 60
+    PERSISTENT_CACHE_PATTERN = re.compile(r"/api/users/[^/?]+$")
+
     def request(self, *args, is_retry: bool = False, **kwargs) -> ScraperResponse:
         if is_retry:
             self.login()
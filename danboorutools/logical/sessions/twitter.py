@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import time
 from datetime import datetime
 
@@ -49,6 +50,9 @@ def _twitter_login_through_form(self: Session) -> None:
 
 
 class TwitterSession(Session):
+    PERSISTENT_CACHE_TTL = 6 * 60 * 60
+    PERSISTENT_CACHE_PATTERN = re.compile(r"/graphql/[^/]+/UserBy(?:ScreenName|RestId)")
+
     BEARER_TOKEN = "AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"  # noqa: S105
 
     graphql_limiter = Limiter(RequestRate(1, 1))
@@ -35,7 +35,7 @@ class WeiboSession(Session):
 
         response = self.get(url)
         try:
-            post_json = response.search_json(pattern=r"\$render_data = \[([\s\S]+)\]\[0\]")
+            post_json = response.search_json(pattern=r"\$render_data = \[([\s\S]+)\]\[0\]", marker="$render_data")
         except ValueError as e:
             body = response.html.body.text
             if "微博不存在或暂无查看权限!" in body or "由于博主设置，目前内容暂不可见。" in body or "暂无查看权限" in body:
@@ -19,7 +19,7 @@ class YoutubeSession(Session):
     @ring.lru()
     def channel_data(self, artist_url: str) -> YoutubeChannelData:
         response = self.get(f"{artist_url}/about")
-        starting_json = response.search_json(pattern=r"ytInitialData = ({.*?});")
+        starting_json = response.search_json(pattern=r"ytInitialData = ({.*?});", marker="ytInitialData")
 
         if (alerts := starting_json.get("alerts", [])):
             if (error := alerts[0]["alertRenderer"]["text"]["simpleText"]) == "This channel does not exist.":
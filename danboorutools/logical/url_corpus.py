@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import gzip
+from typing import IO, TYPE_CHECKING, NamedTuple
+
+from danboorutools.exceptions import NotAnUrlError
+from danboorutools.logical.parsable_url import ParsableUrl
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+# one entry per line, "domain\tresource_url\turl", gzip-compressed when the file name ends in .gz
+_ESCAPES = str.maketrans({"\t": "%09", "\n": "%0A", "\r": "%0D"})
+
+
+class CorpusEntry(NamedTuple):
+    domain: str
+    resource_url: str
+    url: str
+
+
+def domain_for(url: str) -> str:
+    try:
+        return ParsableUrl(url).domain.lower()
+    except (NotAnUrlError, ValueError):
+        return ""
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, f"{mode}t", encoding="utf-8", compresslevel=6)  # type: ignore[return-value]
+    return path.open(mode, encoding="utf-8")
+
+
+def write_corpus(path: Path, entries: Iterable[tuple[str, str]], append: bool = False) -> int:
+    """Stream (resource_url, url) pairs into a corpus file, precomputing their domain. Returns the number of entries written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with _open(path, "a" if append else "w") as corpus:
+        for resource_url, url in entries:
+            url = url.strip().translate(_ESCAPES)  # noqa: PLW2901
+            corpus.write(f"{domain_for(url)}\t{resource_url}\t{url}\n")
+            written += 1
+    return written
+
+
+def read_corpus(path: Path, domain: str | None = None, limit: int = 0) -> Iterator[CorpusEntry]:
+    """Lazily read a corpus file, optionally only yielding entries for a single domain."""
+    domain = domain.lower() if domain else None
+    yielded = 0
+    with _open(path, "r") as corpus:
+        for line in corpus:
+            entry_domain, _, rest = line.partition("\t")
+            if domain and entry_domain != domain:
+                continue
+            resource_url, _, url = rest.rstrip("\n").partition("\t")
+            yield CorpusEntry(entry_domain, resource_url, url)
+
+            yielded += 1
+            if limit and yielded >= limit:
+                return
+
+
+def count_corpus(path: Path, domain: str | None = None) -> int:
+    return sum(1 for _ in read_corpus(path, domain=domain))
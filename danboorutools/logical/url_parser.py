@@ -1,19 +1,33 @@
 from __future__ import annotations
 
+import os
 from functools import lru_cache
 from importlib import import_module
+from itertools import batched, islice
+from multiprocessing import Pool
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from danboorutools.exceptions import UnknownUrlError, UnparsableUrlError
 from danboorutools.logical.parsable_url import ParsableUrl
+from danboorutools.logical.parser_index import PARSER_MODULES
+from danboorutools.logical.url_table import UrlPattern, UrlTable
+from danboorutools.util.cache import BoundedCache
 from danboorutools.util.misc import class_name_to_string
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from danboorutools.models.url import UnsupportedUrl, Url
 
 parsers: dict[str, type[UrlParser]] = {}
 
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("URL_PARSE_CACHE_MAX_ENTRIES") or 100_000)
+PARSE_CACHE_TTL = float(_ttl) if (_ttl := os.environ.get("URL_PARSE_CACHE_TTL")) else None
+
+# only the class, raw url and parsing-time attributes are stored, so that cached urls don't keep their html, files, etc. alive
+ParsedUrlIdentity = tuple["type[Url]", str, dict, dict]
+
 UNSUPPORTED_DOMAINS = (
     "alice-books.com",      # doujinshi store
     "amebaownd.com",
@@ -42,6 +56,9 @@ UNSUPPORTED_DOMAINS = (
 
 class UrlParser:
     domains: tuple[str, ...] = ()
+    url_patterns: tuple[UrlPattern, ...] = ()
+    url_table: UrlTable | None = None
+    parse_cache: BoundedCache[str, ParsedUrlIdentity] = BoundedCache(max_entries=PARSE_CACHE_MAX_ENTRIES, ttl=PARSE_CACHE_TTL)
 
     @staticmethod
     @lru_cache
@@ -57,26 +74,53 @@ class UrlParser:
             if domain in parsers:
                 raise NotImplementedError(domain, (cls, parsers[domain]))
             parsers[domain] = cls
+            ParsableUrl.host_trie.register(domain, cls)
+        if cls.url_patterns:
+            cls.url_table = UrlTable(cls.url_patterns)
 
     @classmethod
-    @lru_cache
     def parse(cls, url: str) -> Url:
-        cls.setup_subclasses()
+        return cls._parse_or_cached(ParsableUrl(url))  # TODO: investigate pydantic v2 AnyHttpUrl
+
+    @classmethod
+    def _parse_or_cached(cls, parsable_url: ParsableUrl) -> Url:
+        url = parsable_url.raw_url
+        if (identity := cls.parse_cache.get(url)) is not None:
+            return _url_from_identity(identity)
+
         try:
-            parsed = cls._parse(url)
+            parsed = cls._parse(parsable_url)
         except Exception as e:
             e.add_note(f"Failure on: {url}")
             raise
-        if parsed:
-            return parsed
+        if not parsed:
+            from danboorutools.models.url import UnknownUrl
+            parsed = UnknownUrl(parsed_url=parsable_url)
 
-        from danboorutools.models.url import UnknownUrl
-        return UnknownUrl(parsed_url=ParsableUrl(url))
+        cls.parse_cache.set(url, _identity_from_url(parsed))
+        return parsed
+
+    @classmethod
+    def parse_many(cls, urls: Iterable[str], workers: int = 1, chunksize: int = 1000) -> Iterator[Url]:
+        """Parse a stream of urls, sharded across a pool of worker processes. Results are yielded in the same order as the input."""
+        if workers <= 1:
+            for batch in batched(urls, chunksize):
+                for parsable_url in ParsableUrl.from_many(batch):
+                    yield cls._parse_or_cached(parsable_url)
+            return
+
+        cls.setup_subclasses()  # forked workers inherit the warm registry
+        url_iterator = iter(urls)
+        with Pool(workers, initializer=cls.setup_subclasses) as pool:
+            # feed the pool a bounded window at a time, otherwise imap would read the whole input into its task queue
+            while window := list(islice(url_iterator, workers * chunksize * 4)):
+                for parsed_batch in pool.imap(_parse_batch_in_worker, batched(window, chunksize)):
+                    yield from parsed_batch
 
     @staticmethod
-    def _parse(url: str) -> Url | None:
-        parsable_url = ParsableUrl(url)  # TODO: investigate pydantic v2 AnyHttpUrl
-        parser = parsers.get(parsable_url.domain.lower())
+    def _parse(parsable_url: ParsableUrl) -> Url | None:
+        # the host trie resolves the parser in the same pass that splits the hostname
+        parser: type[UrlParser] | None = parsable_url.url_data.parser or UrlParser._import_parser_for(parsable_url.domain)
         if not parser:
             return None
 
@@ -85,20 +129,50 @@ class UrlParser:
             return UselessUrl(parsed_url=parsable_url)
 
         try:
-            parsed_url = parser.match_url(parsable_url)
+            # the declarative patterns are compiled once per parser and checked before the hand-written rules
+            parsed_url = (parser.url_table and parser.url_table.match(parsable_url)) or parser.match_url(parsable_url)
         except UnparsableUrlError:
             return None
 
         if not parsed_url:
-            raise UnknownUrlError(url, parser)
+            raise UnknownUrlError(parsable_url.raw_url, parser)
 
         return parsed_url
 
+    @staticmethod
+    def _import_parser_for(domain: str) -> type[UrlParser] | None:
+        # parser modules are only imported once a url for one of their domains shows up, since they pull in urls and sessions
+        if not (module_name := PARSER_MODULES.get(domain.lower())):
+            return None
+        import_module(f"danboorutools.logical.parsers.{module_name}")
+        return parsers.get(domain.lower())
+
     @classmethod
     def match_url(cls, parsable_url: ParsableUrl) -> Url | None:
+        if cls.url_patterns:
+            return None
         raise NotImplementedError(parsable_url)
 
 
+def _identity_from_url(url: Url) -> ParsedUrlIdentity:
+    extra_attributes = {
+        name: value for name, value in url.__dict__.items()
+        if name not in url.url_properties and name not in ("parsed_url", "url_properties")
+    }
+    return (type(url), url.parsed_url.raw_url, dict(url.url_properties), extra_attributes)
+
+
+def _url_from_identity(identity: ParsedUrlIdentity) -> Url:
+    url_type, raw_url, url_properties, extra_attributes = identity
+    url = url_type(parsed_url=ParsableUrl(raw_url), **url_properties)
+    url.__dict__.update(extra_attributes)
+    return url
+
+
+def _parse_batch_in_worker(urls: tuple[str, ...]) -> list[Url]:
+    return list(UrlParser.parse_many(urls, chunksize=len(urls)))
+
+
 class UnsupportedParser(UrlParser):
     domains = UNSUPPORTED_DOMAINS
 
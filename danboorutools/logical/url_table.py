@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from danboorutools.logical.parsable_url import ParsableUrl
+    from danboorutools.models.url import Url
+
+placeholder_pattern = re.compile(r"^\{(?P<name>\w+)(?::(?P<converter>\w+))?\}$")
+
+CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "str": str,
+}
+
+
+class UrlPattern(NamedTuple):
+    """A declarative url rule.
+
+    `subdomains` is a "|"-separated list of subdomains ("" for none). `template` is a "/"-separated list of path segments,
+    each either a literal (with "|" for alternatives), a `{name}` or `{name:int}` placeholder, or a final `*` that matches
+    any remaining segments. A `?key={name}&...` suffix requires those query parameters. Placeholders starting with "_" are
+    matched but not passed to the url. `converters` overrides the conversion of a property; a ValueError means no match.
+    """
+    subdomains: str
+    template: str
+    url_type: type[Url]
+    converters: dict[str, Callable[[str], Any]] | None = None
+
+
+class _Segment(NamedTuple):
+    literals: frozenset[str] | None
+    name: str | None
+    converter: Callable[[str], Any]
+
+
+class _CompiledPattern:
+    __slots__ = ("has_tail", "query", "segments", "url_type")
+
+    def __init__(self, pattern: UrlPattern) -> None:
+        path, _, query = pattern.template.strip("/").partition("?")
+        converters = pattern.converters or {}
+
+        parts = path.split("/") if path else []
+        self.has_tail = bool(parts) and parts[-1] == "*"
+        if self.has_tail:
+            parts.pop()
+
+        self.segments = tuple(self._compile_segment(part, converters) for part in parts)
+        self.query = tuple(
+            (key, self._compile_segment(placeholder, converters))
+            for key, _, placeholder in (parameter.partition("=") for parameter in query.split("&") if parameter)
+        )
+        self.url_type = pattern.url_type
+
+    @staticmethod
+    def _compile_segment(part: str, converters: dict[str, Callable[[str], Any]]) -> _Segment:
+        if not (placeholder := placeholder_pattern.match(part)):
+            return _Segment(frozenset(part.split("|")), None, str)
+
+        name = placeholder.group("name")
+        converter = converters.get(name) or CONVERTERS[placeholder.group("converter") or "str"]
+        return _Segment(None, None if name.startswith("_") else name, converter)
+
+    @property
+    def first_literals(self) -> frozenset[str] | None:
+        return self.segments[0].literals if self.segments else frozenset([""])
+
+    def match(self, parsable_url: ParsableUrl) -> Url | None:
+        url_parts = parsable_url.url_parts
+        if len(url_parts) < len(self.segments) or (not self.has_tail and len(url_parts) > len(self.segments)):
+            return None
+
+        properties = {}
+        try:
+            for segment, url_part in zip(self.segments, url_parts, strict=False):
+                if segment.literals is not None:
+                    if url_part not in segment.literals:
+                        return None
+                elif segment.name:
+                    properties[segment.name] = segment.converter(url_part)
+
+            if self.query:
+                query = parsable_url.query
+                for key, segment in self.query:
+                    if (value := query.get(key)) is None:
+                        return None
+                    if segment.name:
+                        properties[segment.name] = segment.converter(value)
+        except ValueError:
+            return None
+
+        return self.url_type(parsed_url=parsable_url, **properties)
+
+
+class UrlTable:
+    """A set of url patterns compiled into a dispatch on subdomain and first path segment.
+
+    Patterns with a literal first segment are tried before patterns that start with a placeholder;
+    otherwise patterns are tried in declaration order.
+    """
+
+    def __init__(self, patterns: Iterable[UrlPattern]) -> None:
+        self._dispatch: dict[str, dict[str | None, list[_CompiledPattern]]] = {}
+        for pattern in patterns:
+            compiled = _CompiledPattern(pattern)
+            for subdomain in pattern.subdomains.split("|"):
+                by_first_segment = self._dispatch.setdefault(subdomain, {})
+                for first_segment in compiled.first_literals or [None]:
+                    by_first_segment.setdefault(first_segment, []).append(compiled)
+
+    def match(self, parsable_url: ParsableUrl) -> Url | None:
+        if not (by_first_segment := self._dispatch.get(parsable_url.subdomain)):
+            return None
+
+        url_parts = parsable_url.url_parts
+        first_segment = url_parts[0] if url_parts else ""
+        for candidates in (by_first_segment.get(first_segment), by_first_segment.get(None)):
+            for compiled in candidates or ():
+                if (url := compiled.match(parsable_url)) is not None:
+                    return url
+        return None
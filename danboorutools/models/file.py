@@ -6,6 +6,7 @@ import tempfile
 from functools import cached_property
 from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import filetype
 import imagehash
@@ -15,6 +16,12 @@ from PIL import Image, ImageCms
 from danboorutools.util.misc import natsort_array, random_string
 from danboorutools.util.system import run_external_command
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# how much of the start of a file filetype needs to guess its type
+FILETYPE_HEADER_SIZE = 8192
+
 
 class File:
     def __init__(self, raw_path: str | Path) -> None:
@@ -58,6 +65,58 @@ class File:
             _file.rename(destination_dir / final_path.name)
         return cls.get_subclass_for(_file.path)
 
+    @classmethod
+    def from_stream(cls,
+                    chunks: Iterable[bytes],
+                    destination_dir: Path | None = None,
+                    with_sha256: bool = False,
+                    resume_path: Path | None = None) -> FileSubclass:
+        """Write a stream of chunks to a file named after its md5, hashing it and guessing its type while it's being written.
+
+        The data is written only once, straight into the destination folder, and never read back: md5 and sha256 come prepopulated.
+        If `resume_path` is given, the stream is appended to the partial data already in it, which is kept if the stream breaks.
+        """
+        destination_dir = destination_dir or Path(tempfile.gettempdir())
+        destination_dir.mkdir(parents=True, exist_ok=True)
+        partial_path = resume_path or destination_dir / f".{random_string(20)}.part"
+
+        hash_md5 = hashlib.md5(usedforsecurity=False)
+        hash_sha256 = hashlib.sha256() if with_sha256 else None
+        header = b""
+
+        def _consume(chunk: bytes) -> None:
+            nonlocal header
+            if len(header) < FILETYPE_HEADER_SIZE:
+                header += chunk[:FILETYPE_HEADER_SIZE - len(header)]
+            hash_md5.update(chunk)
+            if hash_sha256:
+                hash_sha256.update(chunk)
+
+        if resume_path and resume_path.exists():
+            with resume_path.open("rb") as partial_buffer:
+                for chunk in iter(lambda: partial_buffer.read(1024 * 1024), b""):
+                    _consume(chunk)
+
+        try:
+            with partial_path.open("ab" if resume_path else "wb") as dest_buffer:
+                for chunk in chunks:
+                    _consume(chunk)
+                    dest_buffer.write(chunk)
+        except BaseException:
+            if not resume_path:
+                partial_path.unlink(missing_ok=True)
+            raise
+
+        md5 = hash_md5.hexdigest()
+        final_path = destination_dir / (f"{md5}.{mime_type.extension}" if (mime_type := filetype.guess(header)) else md5)
+        partial_path.replace(final_path)
+
+        _file = cls.get_subclass_for(final_path)
+        _file.md5 = md5
+        if hash_sha256:
+            _file.sha256 = hash_sha256.hexdigest()
+        return _file
+
     def rename(self, target: str | Path) -> None:
         self.raw_path = Path(shutil.move(self.path, target))
 
@@ -76,6 +135,12 @@ class File:
 
         return hash_md5.hexdigest()
 
+    @cached_property
+    def sha256(self) -> str:
+        """Return the sha256 of this file."""
+        with self.path.open("rb") as myf:
+            return hashlib.file_digest(myf, "sha256").hexdigest()
+
     def delete(self) -> None:
         self.path.unlink()
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from functools import cached_property, lru_cache
+import sys
+from functools import cached_property
 from typing import TYPE_CHECKING, Generic, Self, TypeVar, final
 
 from backoff import expo, on_exception
@@ -8,11 +9,13 @@ from requests.exceptions import ReadTimeout
 
 from danboorutools import logger
 from danboorutools.exceptions import DeadUrlError, DuplicateAssetError, UnknownUrlError
+from danboorutools.logical.asset_downloader import DEFAULT_MAX_WORKERS, AssetDownloader
 from danboorutools.logical.parsable_url import ParsableUrl
 from danboorutools.logical.sessions import Session
-from danboorutools.logical.url_parser import UrlParser
+from danboorutools.logical.url_parser import PARSE_CACHE_MAX_ENTRIES, PARSE_CACHE_TTL, UrlParser
 from danboorutools.models.file import ArchiveFile, File
 from danboorutools.models.has_posts import HasPosts
+from danboorutools.util.cache import BoundedCache
 from danboorutools.util.misc import PseudoDataclass
 
 if TYPE_CHECKING:
@@ -29,6 +32,7 @@ class Url(metaclass=PseudoDataclass):
     session = Session()
     normalizable = True
     normalize_template = ""
+    build_cache: BoundedCache[tuple, str] = BoundedCache(max_entries=PARSE_CACHE_MAX_ENTRIES, ttl=PARSE_CACHE_TTL)
 
     parsed_url: ParsableUrl
 
@@ -74,14 +78,19 @@ class Url(metaclass=PseudoDataclass):
 
     @final
     @classmethod
-    @lru_cache
     def build(cls, /, **url_properties) -> Self:
         """Build an Url from its url properties."""
         if not cls.normalizable:
             raise NotImplementedError(f"{cls} is not buildable.")
-        normalized_url = cls.normalize(**url_properties)
-        if not normalized_url:
-            raise ValueError(normalized_url, url_properties)
+
+        # classes can't be part of the key, PseudoDataclass gives them a random hash
+        cache_key = (cls.__module__, cls.__qualname__, *sorted(url_properties.items()))
+        if (normalized_url := cls.build_cache.get(cache_key)) is None:
+            normalized_url = cls.normalize(**url_properties)
+            if not normalized_url:
+                raise ValueError(normalized_url, url_properties)
+            cls.build_cache.set(cache_key, normalized_url)
+
         return cls(parsed_url=ParsableUrl(normalized_url), **url_properties)
 
     if TYPE_CHECKING:
@@ -98,17 +107,28 @@ class Url(metaclass=PseudoDataclass):
         except NotImplementedError:
             return self.parsed_url.raw_url
 
+    @cached_property
+    def _identity_url(self) -> str:
+        # lower() might not be completely true, but frankly the chance of collision is not realistic
+        return sys.intern(self._unique_url_for_hash.lower())
+
+    @cached_property
+    def identity_key(self) -> str:
+        """The lowercased "ClassName[url]" of this url, computed once so that comparisons and hashing don't allocate."""
+        return sys.intern(f"{self.__class__.__name__.lower()}[{self._identity_url}]")
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}[{self._unique_url_for_hash}]"
 
     def __eq__(self, __o: object) -> bool:
+        if __o is self:
+            return True
         if not isinstance(__o, type(self)):
             return False
-
-        return __o.normalized_url.__repr__().lower() == self.normalized_url.__repr__().lower()
+        return __o._identity_url == self._identity_url
 
     def __hash__(self) -> int:  # needed for ring.lru
-        return hash(self.__repr__().lower())  # lower() might not be completely true, but frankly the chance of collision is not realistic
+        return hash(self.identity_key)
 
     @cached_property
     def is_deleted(self) -> bool:
@@ -294,7 +314,7 @@ class HasAssets(Generic[TypeVarAsset]):
         if isinstance(asset, str):
             asset = Url.parse(asset)
 
-        if asset._unique_url_for_hash in [a._unique_url_for_hash for a in self.assets]:
+        if any(a._identity_url == asset._identity_url for a in self.assets):
             logger.debug(f"{asset} is already inserted on {self}.")
             raise DuplicateAssetError(self, asset, self.assets)
 
@@ -318,6 +338,14 @@ class HasAssets(Generic[TypeVarAsset]):
     def _extract_assets(self) -> Sequence[TypeVarAsset]:
         raise NotImplementedError(self, "hasn't implemented asset extraction.")
 
+    def download_assets(self, max_workers: int = DEFAULT_MAX_WORKERS) -> dict[TypeVarAsset, list[File]]:
+        """Download the files of every asset concurrently. See AssetDownloader."""
+        downloader = AssetDownloader(max_workers=max_workers)
+        downloaded = downloader.download(self.assets)
+        if downloader.errors:
+            raise ExceptionGroup(f"Failed to download {len(downloader.errors)} assets of {self}.", list(downloader.errors.values()))
+        return downloaded  # type: ignore[return-value]
+
 
 ########################################################################
 
@@ -0,0 +1,84 @@
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+from bs4 import FeatureNotFound
+from requests import Response
+
+from danboorutools import logger, settings
+from danboorutools.logical.parsable_url import ParsableUrl
+from danboorutools.logical.sessions import ScraperResponse, Session
+
+FIXTURES_FOLDER = settings.BASE_FOLDER / "data" / "html_fixtures"
+SOUP_BACKENDS = ("html5lib", "html.parser", "lxml")
+
+
+@click.command()
+@click.argument("pages", nargs=-1, type=click.Path(exists=True, path_type=Path))
+@click.option("--save", "urls_to_save", multiple=True, help="Download this page into the fixtures folder before benchmarking.")
+@click.option("--selector", default="script", show_default=True, help="The CSS selector run on every page.")
+@click.option("--rounds", default=5, show_default=True)
+def main(pages: tuple[Path, ...], urls_to_save: tuple[str, ...], selector: str, rounds: int) -> None:
+    """Compare the time taken by each ScraperResponse.html backend and by ScraperResponse.css on saved pages, and their results."""
+    for url in urls_to_save:
+        save_fixture(url)
+
+    files = [file for page in (pages or [FIXTURES_FOLDER]) for file in (sorted(page.glob("*.html")) if page.is_dir() else [page])]
+    if not files:
+        raise click.UsageError(f"No pages to benchmark. Pass some .html files or save some in {FIXTURES_FOLDER} with --save.")
+    contents = [file.read_bytes() for file in files]
+    logger.info(f"Benchmarking {len(files)} pages ({sum(map(len, contents)) / 1024:.0f}KB) over {rounds} rounds.")
+
+    results: dict[str, float] = {}
+    for backend in SOUP_BACKENDS:
+        try:
+            results[f"html ({backend})"] = benchmark(contents, rounds, backend, lambda response: response.html.select(selector))
+        except FeatureNotFound:
+            logger.warning(f"Skipping {backend}: not installed.")
+    try:
+        results["css (lxml)"] = benchmark(contents, rounds, "lxml", lambda response: response.css(selector))
+    except ImportError as e:
+        logger.warning(f"Skipping css: {e}.")
+
+    compare_results(files, contents, selector)
+
+    slowest = max(results.values())
+    for name, elapsed in sorted(results.items(), key=lambda item: item[1]):
+        logger.info(f"{name:<20} {elapsed / (rounds * len(files)) * 1000:8.2f}ms per page, {slowest / elapsed:6.1f}x")
+
+
+def benchmark(contents: list[bytes], rounds: int, html_parser: str, parse: Callable[[ScraperResponse], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content in contents:
+            parse(_response_from(content, html_parser))
+    return time.perf_counter() - start
+
+
+def compare_results(files: list[Path], contents: list[bytes], selector: str) -> None:
+    """Check whether lxml selects the same elements as html5lib on every page, before switching a session's HTML_PARSER to it."""
+    for file, content in zip(files, contents, strict=True):
+        try:
+            selected = {backend: [str(tag) for tag in _response_from(content, backend).html.select(selector)] for backend in ("html5lib", "lxml")}
+        except FeatureNotFound:
+            return
+        if selected["html5lib"] == selected["lxml"]:
+            logger.info(f"{file.name}: lxml and html5lib give identical results.")
+        else:
+            logger.warning(f"{file.name}: lxml and html5lib give different results for '{selector}'.")
+
+
+def _response_from(content: bytes, html_parser: str) -> ScraperResponse:
+    response = Response()
+    response.status_code = 200
+    response._content = content  # noqa: SLF001
+    return ScraperResponse(response, html_parser)
+
+
+def save_fixture(url: str) -> None:
+    FIXTURES_FOLDER.mkdir(parents=True, exist_ok=True)
+    parsed = ParsableUrl(url)
+    path = FIXTURES_FOLDER / f"{parsed.domain}_{"_".join(parsed.url_parts) or "index"}.html".replace("/", "_")
+    path.write_bytes(Session().get(url).content)
+    logger.info(f"Saved {url} to {path}.")
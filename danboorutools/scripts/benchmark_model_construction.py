@@ -0,0 +1,82 @@
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+
+from danboorutools import logger, settings
+from danboorutools.models import danbooru as models
+
+FIXTURES_FOLDER = settings.BASE_FOLDER / "data" / "model_fixtures"
+DANBOORU_MODELS = {
+    model.danbooru_model_name: model
+    for model in vars(models).values()
+    if isinstance(model, type) and issubclass(model, models.DanbooruModel) and model.danbooru_model_name
+}
+
+
+@click.command()
+@click.argument("payloads", nargs=-1, type=click.Path(exists=True, path_type=Path))
+@click.option("--save", "models_to_save", multiple=True, type=click.Choice(sorted(DANBOORU_MODELS)),
+              help="Download a page of this model into the fixtures folder before benchmarking.")
+@click.option("--synthetic", default=0, show_default=True, help="Benchmark this many generated post versions instead.")
+@click.option("--rounds", default=3, show_default=True)
+def main(payloads: tuple[Path, ...], models_to_save: tuple[str, ...], synthetic: int, rounds: int) -> None:
+    """Compare validated and lean construction of danbooru models on saved api responses, named after their model."""
+    for model_name in models_to_save:
+        save_fixture(model_name)
+
+    if synthetic:
+        # the same generated payloads the model tests use, so only available from a checkout
+        from tests.helpers.danbooru import post_version_payloads
+        datasets = {"post_version (synthetic)": (models.DanbooruPostVersion, post_version_payloads(synthetic))}
+    else:
+        files = [file for payload in (payloads or [FIXTURES_FOLDER]) for file in (sorted(payload.glob("*.json")) if payload.is_dir() else [payload])]
+        if not files:
+            raise click.UsageError(f"Nothing to benchmark. Pass some .json responses, save some in {FIXTURES_FOLDER} or use --synthetic.")
+        datasets = {file.stem: (DANBOORU_MODELS[file.stem], json.loads(file.read_bytes())) for file in files}
+
+    for name, (model, rows) in datasets.items():
+        logger.info(f"{name}: {len(rows)} rows over {rounds} rounds.")
+        results = {
+            "validated": benchmark(rows, rounds, lambda data, model=model: model(**data)),
+            "lean": benchmark(rows, rounds, lambda data, model=model: model.construct_trusted(data)),
+            "lean, no raw data": benchmark(rows, rounds, lambda data, model=model: model.construct_trusted(data, keep_raw_data=False)),
+        }
+        slowest = max(elapsed for elapsed, _ in results.values())
+        for mode, (elapsed, memory) in results.items():
+            logger.info(f"    {mode:<20} {elapsed / (rounds * len(rows)) * 1e6:8.1f}us per row, {slowest / elapsed:5.1f}x, "
+                        f"{memory / len(rows):7.0f} bytes per row retained")
+
+
+def benchmark(rows: list[dict], rounds: int, build: Callable[[dict], object]) -> tuple[float, int]:
+    """Return the time taken to build every row `rounds` times, and the memory retained by the built objects and what they reference."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for row in rows:
+            build(row)
+    elapsed = time.perf_counter() - start
+
+    payload = json.dumps(rows)
+    gc.collect()
+    tracemalloc.start()
+    built = [build(row) for row in json.loads(payload)]
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return elapsed, memory
+
+
+def save_fixture(model_name: str) -> None:
+    from danboorutools.logical.sessions.danbooru import danbooru_api
+
+    FIXTURES_FOLDER.mkdir(parents=True, exist_ok=True)
+    params = {"only": danbooru_api.only_string_defaults[model_name]} if model_name in danbooru_api.only_string_defaults else {}
+    rows = danbooru_api.danbooru_request("GET", f"{model_name}s.json", params=params)
+    path = FIXTURES_FOLDER / f"{model_name}.json"
+    path.write_text(json.dumps(rows), encoding="utf-8")
+    logger.info(f"Saved {len(rows)} {model_name}s to {path}.")
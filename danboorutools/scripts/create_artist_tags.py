@@ -3,6 +3,7 @@ import click
 from danboorutools import logger
 from danboorutools.logical.artist_finder import ArtistFinder
 from danboorutools.logical.sessions.danbooru import danbooru_api
+from danboorutools.models.danbooru import DanbooruPost
 
 logger.log_to_file()
 
@@ -20,13 +21,6 @@ def add_artists_to_posts(search: list[str], retry_skipped: bool = False) -> None
     search = list(set(search + "arttags:0 -anime_screencap -third-party_edit -third-party_source -second-party_source".split()))
     if not any(t.startswith("limit:") for t in search):
         search += ["limit:20"]
-    page = "1"
-    while True:
-        posts = danbooru_api.posts(search, page=page)  # todo: create paginate generator that loops through 1M IDs to avoid timeouts
-        if not posts:
-            logger.info("Done!")
-            return
-        page = f"b{posts[-1].id}"
-
-        for post in posts:
-            artist_post_tagger.create_or_tag_artist_for_post(post, retry_skipped=retry_skipped)
+    for post in danbooru_api.paginate(DanbooruPost, tags=search):
+        artist_post_tagger.create_or_tag_artist_for_post(post, retry_skipped=retry_skipped)
+    logger.info("Done!")
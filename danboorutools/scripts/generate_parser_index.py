@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import click
+
+from danboorutools import logger
+from danboorutools.logical.url_parser import UrlParser, parsers
+
+INDEX_FILE = Path(__file__).parent.parent / "logical" / "parser_index.py"
+PARSERS_PACKAGE = "danboorutools.logical.parsers."
+
+INDEX_TEMPLATE = """# Generated by danboorutools/scripts/generate_parser_index.py. Do not edit manually.
+# Maps each parsable domain to the module in danboorutools/logical/parsers/ that declares its parser.
+
+PARSER_MODULES: dict[str, str] = {{
+{entries}
+}}
+"""
+
+
+@click.command()
+def main() -> None:
+    index = build_index()
+    INDEX_FILE.write_text(render_index(index), encoding="utf-8")
+    logger.info(f"Wrote {len(index)} domains to {INDEX_FILE}.")
+
+
+def build_index() -> dict[str, str]:
+    UrlParser.setup_subclasses()
+    return {
+        domain: parser.__module__.removeprefix(PARSERS_PACKAGE)
+        for domain, parser in sorted(parsers.items())
+        if parser.__module__.startswith(PARSERS_PACKAGE)
+    }
+
+
+def render_index(index: dict[str, str]) -> str:
+    entries = "\n".join(f'    "{domain}": "{module}",' for domain, module in index.items())
+    return INDEX_TEMPLATE.format(entries=entries)
@@ -9,12 +9,11 @@ import click
 
 from danboorutools import logger
 from danboorutools.logical.sessions.danbooru import danbooru_api
+from danboorutools.models.danbooru import DanbooruAppeal, DanbooruFlag
 
 if TYPE_CHECKING:
     from datetime import datetime
 
-    from danboorutools.models.danbooru import DanbooruAppeal, DanbooruFlag
-
 logger.log_to_file()
 
 
@@ -41,39 +40,14 @@ def main(sinceid: int, maxid: int) -> None:
 
 
 def collect_flags(since: datetime) -> list[DanbooruFlag]:
-
-    flags = []
-
     logger.info("Collecting flags...")
-    page = 1
-
-    while True:
-        _flags = danbooru_api.flags(
-            created_at=f">{since.isoformat()}",
-            category="normal",
-            **{"search[post][is_deleted]": True},
-            page=page,
-        )
-
-        if not _flags:
-            return flags
-
-        page += 1
-        flags += _flags
+    return list(danbooru_api.paginate(
+        DanbooruFlag,
+        created_at=f">{since.isoformat()}",
+        category="normal",
+        **{"search[post][is_deleted]": True},
+    ))
 
 
 def collect_appeals(since: datetime) -> list[DanbooruAppeal]:
-    appeals = []
-    page = 1
-
-    while True:
-        _appeals = danbooru_api.appeals(
-            created_at=f">{since.isoformat()}",
-            page=page,
-        )
-
-        if not _appeals:
-            return appeals
-
-        page += 1
-        appeals += _appeals
+    return list(danbooru_api.paginate(DanbooruAppeal, created_at=f">{since.isoformat()}"))
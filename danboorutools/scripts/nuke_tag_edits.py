@@ -1,12 +1,18 @@
+from itertools import batched
+
 import click
 
 from danboorutools import logger
+from danboorutools.logical.progress_tracker import ProgressTracker
 from danboorutools.logical.sessions.danbooru import danbooru_api
 from danboorutools.models.danbooru import DanbooruPostVersion
 from danboorutools.util.threading import run_in_parallel
 
 logger.log_to_file()
 
+# the progress tracker is advanced a page at a time, so a batch must be exactly one page for it to only count nuked versions
+BATCH_SIZE = 1000
+
 
 @click.command()
 @click.argument("user_id", type=int, required=True)
@@ -21,39 +27,36 @@ def nuke_tag_edits(user_id: int, tag: str | None, dry_run: bool = False) -> None
     if not tag:
         raise NotImplementedError
 
-    page = 1
-    printed = False
-
     was_removal = tag.startswith("-")
     tag = tag.removeprefix("-")
     search_key = "removed_tags_include_all" if was_removal else "added_tags_include_all"
 
-    while True:
-        logger.info(f"At page {page}...")
-
-        arguments: dict = {
-            "updater_id": user_id,
-            "page": page,
-            search_key: tag,
-        }
-
-        versions = danbooru_api.post_versions(**arguments)
-        if not versions:
-            logger.info("Done!")
-            return
+    # resume from the last batch that was fully nuked if the script was interrupted
+    progress = ProgressTracker(f"NUKE_TAG_EDITS_{user_id}_{"-" if was_removal else ""}{tag}", 0)
+    versions = danbooru_api.paginate(DanbooruPostVersion,
+                                     progress=None if dry_run else progress,
+                                     prefetch=1,
+                                     limit=BATCH_SIZE,
+                                     updater_id=user_id,
+                                     **{search_key: tag})
 
+    printed = False
+    for batch in batched(versions, BATCH_SIZE):
         if not printed:
             action_type = "removals" if was_removal else "additions"
-            logger.info(f"Nuking {action_type} of '{tag}' by user {versions[0].updater.name}")
+            logger.info(f"Nuking {action_type} of '{tag}' by user {batch[0].updater.name}")
             printed = True
 
-        assert all(version.updater.id == user_id for version in versions)
+        assert all(version.updater.id == user_id for version in batch)
+        logger.info(f"At version #{batch[-1].id}...")
         if dry_run:
             continue
 
-        run_in_parallel(_update_post, versions, tag, was_removal)  # type: ignore[arg-type]
+        run_in_parallel(_update_post, list(batch), tag, was_removal)  # type: ignore[arg-type]
 
-        page += 1
+    logger.info("Done!")
+    if not dry_run:
+        del progress.value
 
 
 def _update_post(version: DanbooruPostVersion, tag: str, was_removal: bool) -> None:
@@ -10,11 +10,13 @@ from typing import Literal
 from urllib.parse import quote_plus
 
 import click
+import numpy as np
 from jinja2 import Environment, FileSystemLoader, StrictUndefined
 
 from danboorutools import logger, settings
+from danboorutools.logical.columnar import value_counts
 from danboorutools.logical.sessions.danbooru import danbooru_api, kwargs_to_include
-from danboorutools.models.danbooru import DanbooruUser
+from danboorutools.models.danbooru import DanbooruPostVersion, DanbooruUser
 from danboorutools.util.misc import remove_indent
 
 f_path = logger.log_to_file()
@@ -523,52 +525,34 @@ class Candidate:
             return
 
         logger.info("Collecting post edits.")
-        page = 1
-
-        data = {}
-        total_edits = 0
-        edits_by_year = {}
+        post_edits = danbooru_api.export(
+            DanbooruPostVersion,
+            ["updated_at", "added_tags", "removed_tags", "obsolete_added_tags", "obsolete_removed_tags"],
+            updater_name=self.name,
+            is_new=False,
+            prefetch=2,
+        )
+        logger.info("Done")
 
-        while True:
-            post_edits = danbooru_api.post_versions(updater_name=self.name, is_new=False, page=page)
-            if not post_edits:
-                break
-            for post_edit in post_edits:
-                try:
-                    edits_by_year[post_edit.updated_at.year] += 1
-                except KeyError:
-                    edits_by_year[post_edit.updated_at.year] = 1
-
-                for tag in post_edit.added_tags:
-                    try:
-                        data[tag]["added"] += 1
-                    except KeyError:
-                        data[tag] = {"added": 1, "removed": 0, "revert_added": 0, "revert_removed": 0}
-                for tag in post_edit.removed_tags:
-                    try:
-                        data[tag]["removed"] += 1
-                    except KeyError:
-                        data[tag] = {"added": 0, "removed": 1, "revert_added": 0, "revert_removed": 0}
-                for tag in post_edit.obsolete_added_tags_arr:
-                    try:
-                        data[tag]["revert_added"] += 1
-                    except KeyError:
-                        data[tag] = {"added": 0, "removed": 0, "revert_added": 1, "revert_removed": 0}
-                for tag in post_edit.obsolete_removed_tags_arr:
-                    try:
-                        data[tag]["revert_removed"] += 1
-                    except KeyError:
-                        data[tag] = {"added": 0, "removed": 0, "revert_added": 0, "revert_removed": 1}
-            page += 1
-            total_edits += len(post_edits)
+        total_edits = len(post_edits)
+        edit_dates = post_edits["updated_at"][~np.isnat(post_edits["updated_at"])]
+        edits_by_year = value_counts(edit_dates.astype("datetime64[Y]").astype(int) + 1970)
 
-        logger.info("Done")
+        tag_changes = {
+            "added": post_edits["added_tags"],
+            "removed": post_edits["removed_tags"],
+            "revert_added": post_edits.words("obsolete_added_tags"),
+            "revert_removed": post_edits.words("obsolete_removed_tags"),
+        }
+        changed_tags, changed_counts = np.unique(np.concatenate([tag_changes["added"], tag_changes["removed"]]), return_counts=True)
+        top_tags = changed_tags[np.argsort(-changed_counts, kind="stable")[:10]].tolist()
 
         real_edit_url = f"https://danbooru.donmai.us/post_versions?search[updater_name]={self.safe_name}&search[is_new]=false"
 
         self.post_edit_details = "Actual edits: " + f"{total_edits:_}. Url: <c>{real_edit_url}</c>" + "\n"
         self.post_edit_details += "Top 10 tags changed: " + "\n"
-        for tag, counts in sorted(data.items(), key=lambda x: x[1]["added"] + x[1]["removed"], reverse=True)[:10]:
+        for tag in top_tags:
+            counts = {change: int(np.count_nonzero(tags == tag)) for change, tags in tag_changes.items()}
             perc_added_reverted = counts["revert_added"] / counts["added"] if counts["added"] else 0
             arc = "RED" if perc_added_reverted > 0.1 and counts["added"] > 0 else "GREEN"
             perc_added_string = f"<{arc}> {counts['revert_added']} reverted, {perc_added_reverted*100:.2f}% </>"
@@ -5,6 +5,7 @@ from pathlib import Path
 import click
 
 from danboorutools import logger, settings
+from danboorutools.logical.columnar import ColumnarResults, value_counts
 from danboorutools.logical.sessions.danbooru import danbooru_api
 from danboorutools.models.danbooru import DanbooruForumPost, DanbooruPost, DanbooruUser
 
@@ -38,17 +39,12 @@ def main(topicid: int, pick: int) -> None:
     candidates = [candidate for candidate in candidates if candidate.user.created_at < forum_topic.created_at]
     logger.info(f"Of these, {len(candidates)} are not new accounts.")
 
-    upload_data: dict[int, list[DanbooruPost]] = {}
-    for upload in uploads:
-        try:
-            upload_data[upload.uploader_id].append(upload)
-        except KeyError:
-            upload_data[upload.uploader_id] = [upload]
+    uploaded_counts = value_counts(uploads["uploader_id"])
+    approved_counts = value_counts(uploads["uploader_id"][~uploads["is_deleted"] & ~uploads["is_pending"]])
 
     for candidate in candidates:
-        candidate.uploads = upload_data.get(candidate.user.id, [])
-        candidate.uploaded_count = len([upload for upload in candidate.uploads if upload.uploader_id == candidate.user.id])
-        candidate.approved_count = sum(upload.is_active for upload in candidate.uploads if upload.uploader_id == candidate.user.id)
+        candidate.uploaded_count = uploaded_counts.get(candidate.user.id, 0)
+        candidate.approved_count = approved_counts.get(candidate.user.id, 0)
 
     def upload_count(x: int) -> int:
         return len([c for c in candidates if c.uploaded_count >= x])
@@ -99,17 +95,11 @@ def main(topicid: int, pick: int) -> None:
 
 
 def get_forum_posts(topic_id: int) -> list[DanbooruForumPost]:
-    forum_posts: list[DanbooruForumPost] = []
-    page = 1
-    while True:
-        logger.info(f"Collecting entries from topic #{topic_id}. At page {page}.")
-        forum_posts += (_forum_posts := danbooru_api.forum_posts(topic_id=topic_id, page=page))
-        if not _forum_posts:
-            return forum_posts
-        page += 1
+    logger.info(f"Collecting entries from topic #{topic_id}.")
+    return list(danbooru_api.paginate(DanbooruForumPost, topic_id=topic_id))
 
 
-def get_uploads(start_time: datetime, end_time: datetime) -> list[DanbooruPost]:
+def get_uploads(start_time: datetime, end_time: datetime) -> ColumnarResults:
     logger.info("Collecting posts...")
 
     tags = [
@@ -117,16 +107,9 @@ def get_uploads(start_time: datetime, end_time: datetime) -> list[DanbooruPost]:
         "(approver:any or status:pending or status:deleted)",
     ]
 
-    posts: list[DanbooruPost] = []
-    page_number = 0
-    while True:
-        page_number += 1
-        logger.info(f"At page {page_number}")
-        page_of_posts = danbooru_api.posts(tags=tags, page=page_number)
-        if not page_of_posts:
-            logger.info(f"Collected {len(posts)} posts.")
-            return posts
-        posts += page_of_posts
+    posts = danbooru_api.export(DanbooruPost, ["uploader_id", "is_deleted", "is_pending"], tags=tags)
+    logger.info(f"Collected {len(posts)} posts.")
+    return posts
 
 
 class Candidate:
@@ -134,7 +117,6 @@ class Candidate:
         self.user = user
         self.uploaded_count = 0
         self.approved_count = 0
-        self.uploads: list[DanbooruPost] = []
 
 
 # old raffle picker via nntbot dmail
@@ -27,19 +27,12 @@ def tag_paid_rewards_on_gelbooru(mode: Literal["all", "latest"]) -> None:
         posts = danbooru_api.all_posts(["paid_reward"])
     elif mode == "latest":
         one_month_ago = datetime.datetime.now(tz=UTC) - datetime.timedelta(days=30)
-        page = 1
-        all_versions: list[DanbooruPostVersion] = []
-        while True:
-            found_versions = danbooru_api.post_versions(updated_at=f">{one_month_ago.isoformat()}",
-                                                        added_tags_include_all="paid_reward",
-                                                        page=page)
-            if not found_versions:
-                break
-            all_versions += found_versions
-            page += 1
+        versions = danbooru_api.paginate(DanbooruPostVersion,
+                                         updated_at=f">{one_month_ago.isoformat()}",
+                                         added_tags_include_all="paid_reward")
         posts = list({
             post_version.post.id: post_version.post
-            for post_version in all_versions
+            for post_version in versions
             if "paid_reward" in post_version.post.tags
         }.values())
     else:
@@ -1,21 +1,26 @@
+import json
 import time
-from collections import Counter
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice, tee
 from pathlib import Path
 
 import click
 from line_profiler import LineProfiler
 
 from danboorutools import logger, settings
+from danboorutools.logical.parsing_benchmark import benchmark_parsers, find_regressions, sample_corpus
+from danboorutools.logical.parsing_coverage import ParsingCoverage
 from danboorutools.logical.progress_tracker import ProgressTracker
+from danboorutools.logical.url_corpus import CorpusEntry, read_corpus, write_corpus
 from danboorutools.logical.url_parser import ParsableUrl, UrlParser, parsers
 from danboorutools.models.url import UnknownUrl, UnsupportedUrl, Url, UselessUrl
 from danboorutools.util.bigquery import execute_bigquery_query
 
-log_file = logger.log_to_file()
-
 ARTIST_URLS_FILE = Path(settings.BASE_FOLDER / "data" / "artist_urls.txt")
 SOURCE_URLS_FILE = Path(settings.BASE_FOLDER / "data" / "sources.txt")
+CORPUS_FILE = Path(settings.BASE_FOLDER / "data" / "url_corpus.tsv.gz")
+BENCHMARK_SAMPLE_FILE = Path(settings.BASE_FOLDER / "data" / "parsing_benchmark_sample.tsv.gz")
+BENCHMARK_BASELINE_FILE = Path(settings.BASE_FOLDER / "data" / "parsing_benchmark_baseline.json")
 
 
 @click.command()
@@ -24,7 +29,25 @@ SOURCE_URLS_FILE = Path(settings.BASE_FOLDER / "data" / "sources.txt")
 @click.option("--resume", is_flag=True, default=False)
 @click.option("--unparsed", is_flag=True, default=False)
 @click.option("--update", is_flag=True, default=False)
-def main(times: int = 0, resume: bool = False, unparsed: bool = False, update: bool = False, domain: str | None = None) -> None:
+@click.option("--coverage", is_flag=True, default=False, help="Reparse new or changed urls into the coverage index and report the changes.")
+@click.option("--workers", type=int, default=1, help="Number of processes to parse with. Line profiling is only available with 1.")
+@click.option("--benchmark", is_flag=True, default=False, help="Time each parser on a fixed per-domain sample and compare it to the baseline.")
+@click.option("--resample", is_flag=True, default=False, help="Regenerate the benchmark sample from the current corpus.")
+@click.option("--save-baseline", is_flag=True, default=False, help="Store the benchmark results as the new baseline.")
+@click.option("--threshold", type=float, default=0.25, help="Allowed p50 slowdown per parser before the benchmark fails.")
+def main(times: int = 0,  # noqa: PLR0913
+         resume: bool = False,
+         unparsed: bool = False,
+         update: bool = False,
+         coverage: bool = False,
+         domain: str | None = None,
+         workers: int = 1,
+         benchmark: bool = False,
+         resample: bool = False,
+         save_baseline: bool = False,
+         threshold: float = 0.25) -> None:
+    log_file = logger.log_to_file()
+
     if update:
         update_urls()
         return
@@ -33,108 +56,157 @@ def main(times: int = 0, resume: bool = False, unparsed: bool = False, update: b
         domain = Url.parse(domain).parsed_url.domain
         logger.info(f"Parsing for domain {domain}")
 
+    if benchmark:
+        run_benchmark(log_file, domain=domain, resample=resample, save_baseline=save_baseline, threshold=threshold)
+        return
+
     test_set = prepare_test_set(times, domain)
 
     if unparsed:
         print_unparsed(test_set)
 
+    elif coverage:
+        print_coverage(test_set)
+
     else:
-        logger.info(f"Testing URL parsing {len(test_set)} times.")
+        logger.info(f"Testing URL parsing{f" {times} times" if times else ""}.")
 
-        bulk_parse(test_set, resume, log_urls=domain is not None)
+        bulk_parse(test_set, resume, log_file, log_urls=domain is not None, workers=workers)
 
 
 def update_urls() -> None:
-    logger.info("Fetching artist urls.")
+    # both queries go into a separate file first, so that a failed download doesn't leave the corpus half-written
+    partial_file = CORPUS_FILE.with_name(f"partial_{CORPUS_FILE.name}")
 
+    logger.info("Fetching artist urls.")
     artist_query = "SELECT artist_id, url FROM `danbooru1.danbooru_public.artist_urls` "
-    artist_query_result = execute_bigquery_query(artist_query)
-    artist_urls = tuple((f"https://danbooru.donmai.us/artists/{row.artist_id}", row.url) for row in artist_query_result)
-    logger.info(f"Found {len(artist_urls)} artist urls.")
-    ARTIST_URLS_FILE.write_text("\n".join(",".join(map(str, a)) for a in artist_urls), encoding="utf-8")
+    artist_urls = ((f"https://danbooru.donmai.us/artists/{row.artist_id}", row.url) for row in execute_bigquery_query(artist_query))
+    artist_count = write_corpus(partial_file, artist_urls)
+    logger.info(f"Found {artist_count:_} artist urls.")
 
-    source_query = "SELECT id, source FROM `danbooru1.danbooru_public.posts` where source like 'http%'"
-    source_query_result = execute_bigquery_query(source_query)
     logger.info("Fetching source urls.")
-    source_urls: list[tuple[str, str]] = []
-    for index, row in enumerate(source_query_result):
-        if index % 200_000 == 0:
-            logger.info(f"At {index:_}")
-        if not row.source.startswith(("http://", "https://")):
-            continue
-        source_urls += [(f"https://danbooru.donmai.us/posts/{row.id}", row.source)]
-    logger.info(f"Found {len(source_urls)} source urls.")
-    SOURCE_URLS_FILE.write_text("\n".join(",".join(map(str, s)) for s in source_urls), encoding="utf-8")
-
-
-def print_unparsed(test_set: list[list[str]]) -> None:
-    unparsed_domains = []
-    for index, (_resource_url, url_string) in enumerate(test_set):
-        if index % 200_000 == 0:
-            logger.info(f"Computing url {index:_} of {len(test_set):_}...")
-        parsed_url = ParsableUrl(url_string)
-        if parsed_url.domain not in parsers:
-            unparsed_domains.append(parsed_url.domain)
-    domains = Counter(unparsed_domains)
+    source_query = "SELECT id, source FROM `danbooru1.danbooru_public.posts` where source like 'http%'"
+    source_urls = (
+        (f"https://danbooru.donmai.us/posts/{row.id}", row.source)
+        for row in execute_bigquery_query(source_query)
+        if row.source.startswith(("http://", "https://"))
+    )
+    source_count = write_corpus(partial_file, source_urls, append=True)
+    logger.info(f"Found {source_count:_} source urls.")
+
+    partial_file.replace(CORPUS_FILE)
+
+
+def convert_legacy_files() -> None:
+    logger.info(f"Converting {ARTIST_URLS_FILE.name} and {SOURCE_URLS_FILE.name} to {CORPUS_FILE.name}...")
+    append = False
+    for legacy_file in [ARTIST_URLS_FILE, SOURCE_URLS_FILE]:
+        with legacy_file.open(encoding="utf-8") as myf:
+            rows = (line.strip().strip('"').split(",", 1) for line in myf if line.strip())
+            write_corpus(CORPUS_FILE, ((row[0], row[1]) for row in rows if len(row) == 2), append=append)
+        append = True
+
+
+def update_coverage(test_set: Iterable[CorpusEntry]) -> ParsingCoverage:
+    coverage = ParsingCoverage()
+    logger.info("Updating the parsing coverage index...")
+    run = coverage.update(test_set)
+    logger.info(f"Run {run.run}: {run.total:_} urls, {run.parsed:_} (re)parsed, {run.changed:_} changed class.")
+    return coverage
+
+
+def print_unparsed(test_set: Iterable[CorpusEntry]) -> None:
+    coverage = update_coverage(test_set)
     logger.info("Most common unparsed domains:")
-    for index, (domain, number) in enumerate(domains.most_common(20)):
+    for index, (domain, number) in enumerate(coverage.unparsed_domains(20)):
         logger.info(f"{index + 1:2d}: {domain} ({number})")
 
 
-def prepare_test_set(times: int, domain: str | None) -> list[list[str]]:
-    logger.info("Loading data...")
-    with ARTIST_URLS_FILE.open(encoding="utf-8") as myf:
-        test_set = [line.strip().strip('"').split(",") for line in myf if line.strip()]
-    logger.info("Loading sources...")
-    with SOURCE_URLS_FILE.open(encoding="utf-8") as myf:
-        test_set += [line.strip().strip('"').split(",") for line in myf if line.strip()]
-    logger.info("Sources loaded.")
+def print_coverage(test_set: Iterable[CorpusEntry]) -> None:
+    coverage = update_coverage(test_set)
 
-    if domain:
-        test_set = [t for t in test_set if f".{domain}" in t[1] or f"//{domain}" in t[1]]
+    logger.info("Results:")
+    for result, number in coverage.result_counts().items():
+        logger.info(f"{result:<40}{number:>10_}")
+
+    if not (changed_urls := coverage.changed_urls()):
+        logger.info("No url changed class since the last run.")
+        return
 
-    if times:
-        test_set = test_set[:times]
+    logger.info("")
+    logger.info("#### CHANGED URLS ####")
+    logger.info("")
+    for changed_url in changed_urls:
+        logger.info(f"{changed_url.previous_result} -> {changed_url.result}: {changed_url.url}")
+    logger.info(f"Total: {len(changed_urls)} urls.")
 
-    logger.info(f"{len(test_set)} total urls loaded.")
-    return test_set
+
+def prepare_corpus_file() -> Path:
+    if not CORPUS_FILE.exists():
+        if not ARTIST_URLS_FILE.exists() or not SOURCE_URLS_FILE.exists():
+            raise FileNotFoundError(f"{CORPUS_FILE} not found. Run with --update to download it.")
+        convert_legacy_files()
+    return CORPUS_FILE
+
+
+def prepare_test_set(times: int, domain: str | None) -> Iterator[CorpusEntry]:
+    corpus_file = prepare_corpus_file()
+    logger.info(f"Streaming urls from {corpus_file}.")
+    return read_corpus(corpus_file, domain=domain, limit=times)
 
     # TODO: daily bot that validates all new urls and sends me an email with the bad ones
 
 
-def bulk_parse(test_set: list[list[str]], resume: bool, log_urls: bool = False) -> None:
+def bulk_parse(test_set: Iterable[CorpusEntry], resume: bool, log_file: Path, log_urls: bool = False, workers: int = 1) -> None:
     profiler = LineProfiler()
-    parse_wrapper = prepare_profiler(profiler)
     start = time.time()
 
     last_fail = ProgressTracker("PARSING_BENCHMARK_LAST_FAIL", 0)
+    first_index = 0
     if not resume:
         del last_fail.value
     elif last_fail.value > 0:
-        logger.info(f"Resuming from {last_fail.value - 20:_}.")
+        first_index = max(last_fail.value - 20, 0)  # little wiggle room for deleting invalid sources from the files
+        logger.info(f"Resuming from {first_index:_}.")
+
+    # parse_many only reads a bounded window ahead, so the tee buffer stays small
+    entries_to_parse, entries = tee(islice(test_set, first_index, None))
+    url_strings = (entry.url for entry in entries_to_parse)
+    if workers > 1:
+        logger.info(f"Parsing with {workers} processes. Line profiling is disabled.")
+        parsed_urls = UrlParser.parse_many(url_strings, workers=workers)
+    else:
+        parse_wrapper = prepare_profiler(profiler)
+        parsed_urls = map(parse_wrapper, url_strings)
 
+    parsed_count = 0
     results: list[tuple[str, Url]] = []
-    for index, (resource_url, url_string) in enumerate(test_set):
-        if resume and index < last_fail.value - 20:  # little wiggle room for deleting invalid sources from the files
-            continue
+    for index, entry in enumerate(entries, start=first_index):
         if index % 100_000 == 0:
             logger.info(f"At url {index:_}, {int(time.time() - start)}s elapsed.")
             last_fail.value = index
         try:
-            results.append((resource_url, parse_wrapper(url_string)))
+            parsed_url = next(parsed_urls)
         except (Exception, KeyboardInterrupt) as e:
-            e.add_note(f"At url {index:_} of {len(test_set):_}, found on {resource_url}.")
+            e.add_note(f"At url {index:_}, found on {entry.resource_url}.")
             last_fail.value = index
             raise
 
+        parsed_count += 1
+        if log_urls:
+            results.append((entry.resource_url, parsed_url))
+
     # profiler.print_stats()
-    if not results:
+    if not parsed_count:
         raise ValueError("No results found.")
 
-    with log_file.open("a+", encoding="utf-8") as log_file_obj:
-        profiler.print_stats(stream=log_file_obj)
-
-    logger.info("Done.")
+    if workers <= 1:
+        with log_file.open("a+", encoding="utf-8") as log_file_obj:
+            profiler.print_stats(stream=log_file_obj)
+        # with more workers, each process fills its own cache and this one stays empty
+        logger.info(f"Done. Parse cache: {UrlParser.parse_cache.stats}.")
+    else:
+        logger.info("Done.")
 
     if log_urls:
         results.sort(key=lambda x: (isinstance(x[1], (UnknownUrl | UnsupportedUrl | UselessUrl)),
@@ -162,7 +234,46 @@ def bulk_parse(test_set: list[list[str]], resume: bool, log_urls: bool = False)
     del last_fail.value
 
 
+def run_benchmark(log_file: Path, domain: str | None, resample: bool, save_baseline: bool, threshold: float) -> None:
+    if resample or not BENCHMARK_SAMPLE_FILE.exists():
+        logger.info(f"Sampling {CORPUS_FILE.name} into {BENCHMARK_SAMPLE_FILE.name}...")
+        sampled = sample_corpus(prepare_corpus_file(), BENCHMARK_SAMPLE_FILE)
+        logger.info(f"Sampled {sampled:_} urls.")
+
+    results = benchmark_parsers(BENCHMARK_SAMPLE_FILE, domain=domain)
+
+    padding = max(len(parser_name) for parser_name in results) + 2
+    logger.info(f"{"Parser":<{padding}}{"urls":>7}{"urls/s":>12}{"p50 (µs)":>11}{"p99 (µs)":>11}")
+    for parser_name, stats in results.items():
+        logger.info(
+            f"{parser_name:<{padding}}{stats["urls"]:>7}{stats["urls_per_second"]:>12.0f}{stats["p50_us"]:>11.2f}{stats["p99_us"]:>11.2f}",
+        )
+
+    results_file = log_file.with_suffix(".json")
+    results_file.write_text(json.dumps(results, indent=4), encoding="utf-8")
+    logger.info(f"Results available at {results_file}.")
+
+    if save_baseline:
+        BENCHMARK_BASELINE_FILE.write_text(json.dumps(results, indent=4), encoding="utf-8")
+        logger.info(f"Saved the results as the new baseline at {BENCHMARK_BASELINE_FILE}.")
+        return
+
+    if not BENCHMARK_BASELINE_FILE.exists():
+        logger.info("No baseline to compare to. Run with --save-baseline to create one.")
+        return
+
+    baseline = json.loads(BENCHMARK_BASELINE_FILE.read_text(encoding="utf-8"))
+    if not (regressions := find_regressions(results, baseline, threshold)):
+        logger.info(f"No parser regressed by more than {threshold:.0%}.")
+        return
+
+    for parser_name, (previous, current) in regressions.items():
+        logger.error(f"{parser_name} regressed: p50 went from {previous:.2f}µs to {current:.2f}µs.")
+    raise SystemExit(1)
+
+
 def prepare_profiler(profiler: LineProfiler) -> Callable:
+    UrlParser.setup_subclasses()
     for parser_type in parsers.values():
         try:
             profiler.add_function(parser_type.match_url)
@@ -172,8 +283,9 @@ def prepare_profiler(profiler: LineProfiler) -> Callable:
             if method.startswith("_match"):
                 profiler.add_function(getattr(parser_type, method))
 
-    profiler.add_function(UrlParser.parse.__wrapped__)
+    profiler.add_function(UrlParser.parse.__func__)  # type: ignore[attr-defined]
     profiler.add_function(UrlParser._parse)
-    profiler.add_function(ParsableUrl.url_data.func)  # type: ignore[attr-defined]
+    profiler.add_function(ParsableUrl.url_data.fget)  # type: ignore[attr-defined]
+    profiler.add_function(ParsableUrl.host_trie.resolve)
     parse_wrapper = profiler(Url.parse)
     return parse_wrapper
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+import httpx
+from requests import Request, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+ASYNC_MAX_CONNECTIONS = 100
+ASYNC_MAX_KEEPALIVE_CONNECTIONS = 20
+
+
+class _LoopState:
+    def __init__(self) -> None:
+        self.clients: dict[str | None, httpx.AsyncClient] = {}
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+# clients and semaphores are bound to the event loop they were created in
+_loop_states: WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = WeakKeyDictionary()
+
+
+def _loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    if (state := _loop_states.get(loop)) is None:
+        state = _loop_states[loop] = _LoopState()
+    return state
+
+
+def async_client(proxy: str | None = None) -> httpx.AsyncClient:
+    """The HTTP/2 client shared by every session in the running event loop, one per proxy."""
+    state = _loop_state()
+    if (client := state.clients.get(proxy)) is None:
+        client = state.clients[proxy] = httpx.AsyncClient(
+            http2=True,
+            proxy=proxy,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS, max_keepalive_connections=ASYNC_MAX_KEEPALIVE_CONNECTIONS),
+        )
+    return client
+
+
+def domain_semaphore(domain: str, max_concurrent: int) -> asyncio.Semaphore:
+    state = _loop_state()
+    if (semaphore := state.semaphores.get(domain)) is None:
+        semaphore = state.semaphores[domain] = asyncio.Semaphore(max_concurrent)
+    return semaphore
+
+
+async def close_async_clients() -> None:
+    """Close the clients of the running event loop. Call before the loop ends to avoid unclosed connection warnings."""
+    state = _loop_state()
+    for client in state.clients.values():
+        await client.aclose()
+    state.clients.clear()
+
+
+def to_requests_response(response: httpx.Response, method: str) -> Response:
+    """Convert an httpx response into a requests one, so that it can go through the same checks and ScraperResponse helpers."""
+    converted = Response()
+    converted.status_code = response.status_code
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted._content = response.content  # noqa: SLF001
+    converted.url = str(response.url)
+    converted.reason = response.reason_phrase
+    converted.encoding = get_encoding_from_headers(converted.headers)
+    converted.elapsed = response.elapsed
+    converted.request = Request(method.upper(), str(response.request.url)).prepare()  # type: ignore[assignment]
+    return converted
+
+
+def cookie_header(*cookie_jars: Mapping[str, str] | None) -> str:
+    cookies: dict[str, str] = {}
+    for cookie_jar in cookie_jars:
+        cookies |= dict(cookie_jar or {})
+    return "; ".join(f"{name}={value}" for name, value in cookies.items())
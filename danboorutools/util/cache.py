@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Generic, TypeVar
+
+CacheKey = TypeVar("CacheKey", bound=Hashable)
+CacheValue = TypeVar("CacheValue")
+
+_MISSING = object()
+
+
+class BoundedCache(Generic[CacheKey, CacheValue]):
+    """A thread-safe LRU cache with a maximum number of entries, an optional time-to-live and an optional byte budget.
+
+    The byte budget needs a `sizeof` function; values bigger than the whole budget are never stored.
+    """
+
+    def __init__(self,
+                 max_entries: int,
+                 ttl: float | None = None,
+                 max_bytes: int | None = None,
+                 sizeof: Callable[[CacheValue], int] | None = None) -> None:
+        if max_entries < 1:
+            raise ValueError(max_entries)
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("A byte budget needs a sizeof function.")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        self._entries: OrderedDict[CacheKey, tuple[float, CacheValue]] = OrderedDict()
+        self._sizes: dict[CacheKey, int] = {}
+        self.total_bytes = 0
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey, default: CacheValue | None = None) -> CacheValue | None:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            stored_at, value = entry  # type: ignore[misc]
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                self._pop(key)
+                self.evictions += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: CacheKey, value: CacheValue) -> None:
+        size = self.sizeof(value) if self.sizeof else 0
+        with self._lock:
+            self._pop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._entries[key] = (time.monotonic(), value)
+            if self.sizeof:
+                self._sizes[key] = size
+                self.total_bytes += size
+
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.total_bytes > self.max_bytes):
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _pop(self, key: CacheKey) -> None:
+        if self._entries.pop(key, _MISSING) is not _MISSING:
+            self.total_bytes -= self._sizes.pop(key, 0)
+
+    def delete(self, key: CacheKey) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __str__(self) -> str:
+        return f"BoundedCache[{len(self._entries)}/{self.max_entries}]"
+    __repr__ = __str__
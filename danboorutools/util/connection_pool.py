@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+from cloudscraper import CipherSuiteAdapter
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+if TYPE_CHECKING:
+    from urllib3.connection import HTTPConnection
+
+
+class ConnectionStats:
+    """How many requests each host got, and how many of them had to open a new connection instead of reusing a kept-alive one."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.host_stats: defaultdict[str, dict[str, int]] = defaultdict(lambda: {"requests": 0, "new_connections": 0})
+
+    def record(self, host: str, event: str) -> None:
+        with self._lock:
+            self.host_stats[host][event] += 1
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                host: host_stats | {"reused_connections": max(0, host_stats["requests"] - host_stats["new_connections"])}
+                for host, host_stats in self.host_stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.host_stats.clear()
+
+
+connection_stats = ConnectionStats()
+
+
+class _CountingConnectionPoolMixin:
+    host: str
+
+    def _get_conn(self, timeout: float | None = None) -> HTTPConnection:
+        connection = super()._get_conn(timeout)  # type: ignore[misc]
+        # both brand new connections and kept-alive ones that the server dropped in the meantime have to open a socket
+        if connection.sock is None:
+            connection_stats.record(self.host, "new_connections")
+        return connection
+
+    def urlopen(self, *args, **kwargs) -> Any:  # noqa: ANN401
+        connection_stats.record(self.host, "requests")
+        return super().urlopen(*args, **kwargs)  # type: ignore[misc]
+
+
+class CountingHTTPConnectionPool(_CountingConnectionPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingConnectionPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+_COUNTING_POOL_CLASSES = {"http": CountingHTTPConnectionPool, "https": CountingHTTPSConnectionPool}
+
+
+class _CountingAdapterMixin:
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)  # type: ignore[misc]
+        self.poolmanager.pool_classes_by_scheme = _COUNTING_POOL_CLASSES  # type: ignore[attr-defined]
+
+    def proxy_manager_for(self, *args, **kwargs) -> Any:  # noqa: ANN401
+        manager = super().proxy_manager_for(*args, **kwargs)  # type: ignore[misc]
+        manager.pool_classes_by_scheme = _COUNTING_POOL_CLASSES
+        return manager
+
+
+class PooledHTTPAdapter(_CountingAdapterMixin, HTTPAdapter):
+    pass
+
+
+class PooledCipherSuiteAdapter(_CountingAdapterMixin, CipherSuiteAdapter):
+    """The same TLS adapter cloudscraper mounts, with a configurable pool and connection instrumentation."""
+
+
+_adapters: dict[tuple[str, str], HTTPAdapter] = {}
+_adapters_lock = Lock()
+
+
+def pooled_adapter(pool_name: str,
+                   scheme: str,
+                   pool_connections: int,
+                   pool_maxsize: int,
+                   max_retries: int,
+                   pool_block: bool,
+                   **tls_kwargs) -> HTTPAdapter:
+    """The adapter, and so the connection pools, of every session using this pool name.
+
+    It's created once and reused afterwards, so that the connections it keeps alive survive sessions being initialized again.
+    """
+    pool_kwargs = {"pool_connections": pool_connections, "pool_maxsize": pool_maxsize, "max_retries": max_retries, "pool_block": pool_block}
+    with _adapters_lock:
+        if (adapter := _adapters.get((pool_name, scheme))) is None:
+            if scheme == "https":
+                adapter = PooledCipherSuiteAdapter(**pool_kwargs, **tls_kwargs)
+            else:
+                adapter = PooledHTTPAdapter(**pool_kwargs)
+            _adapters[(pool_name, scheme)] = adapter
+        return adapter
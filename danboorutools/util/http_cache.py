@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import TYPE_CHECKING, NamedTuple
+
+from peewee import BlobField, FloatField, IntegerField, Model, SqliteDatabase, TextField, fn
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from danboorutools import settings
+
+if TYPE_CHECKING:
+    from typing import Any
+
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES") or 512 * 1024 * 1024)
+HTTP_CACHE_MAX_AGE = float(os.environ.get("HTTP_CACHE_MAX_AGE") or 7 * 24 * 60 * 60)
+
+# the body is stored already decoded, so these no longer describe it
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+_http_cache_database = SqliteDatabase(settings.BASE_FOLDER / "data" / "http_cache.sqlite", pragmas={"journal_mode": "wal"})
+
+
+class _HttpCacheModel(Model):
+    class Meta:
+        database = _http_cache_database
+        table_name = "responses"
+
+    key = TextField(primary_key=True)
+    domain = TextField(index=True)
+    url = TextField()
+    status_code = IntegerField()
+    headers = TextField()
+    content = BlobField()
+    size = IntegerField()
+    etag = TextField(null=True)
+    last_modified = TextField(null=True)
+    stored_at = FloatField(index=True)
+    accessed_at = FloatField(index=True)
+
+
+class CachedResponse(NamedTuple):
+    key: str
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """The headers needed to revalidate this response with a conditional request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> Response:
+        response = Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content  # noqa: SLF001
+        response.url = self.url
+        return response
+
+
+class HttpCache:
+    """A persistent response cache shared by every process, evicted by total size and by age."""
+
+    def __init__(self, max_bytes: int = HTTP_CACHE_MAX_BYTES, max_age: float = HTTP_CACHE_MAX_AGE, evict_every: int = 100) -> None:
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.evict_every = evict_every
+
+        self._initialized = False
+        self._writes = 0
+        self._lock = Lock()
+        self.domain_stats: defaultdict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "revalidated": 0})
+
+    def _init_database(self) -> None:
+        if not self._initialized:
+            (settings.BASE_FOLDER / "data").mkdir(exist_ok=True)
+            with _http_cache_database.connection_context():
+                _http_cache_database.create_tables([_HttpCacheModel])
+            self._initialized = True
+
+    @staticmethod
+    def key_for(method: str, url: str, params: Any = None) -> str:  # noqa: ANN401
+        params_string = json.dumps(params, sort_keys=True, default=str) if params else ""
+        return hashlib.sha256(f"{method.upper()} {url} {params_string}".encode()).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        self._init_database()
+        try:
+            row = _HttpCacheModel.get_by_id(key)
+        except _HttpCacheModel.DoesNotExist:
+            return None
+
+        _HttpCacheModel.update(accessed_at=time.time()).where(_HttpCacheModel.key == key).execute()
+        return CachedResponse(
+            key=row.key,
+            url=row.url,
+            status_code=row.status_code,
+            headers=json.loads(row.headers),
+            content=bytes(row.content),
+            etag=row.etag,
+            last_modified=row.last_modified,
+            stored_at=row.stored_at,
+        )
+
+    def set(self, key: str, domain: str, response: Response) -> None:
+        self._init_database()
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS}
+        now = time.time()
+        _HttpCacheModel.replace(
+            key=key,
+            domain=domain,
+            url=response.url,
+            status_code=response.status_code,
+            headers=json.dumps(headers),
+            content=response.content,
+            size=len(response.content),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            stored_at=now,
+            accessed_at=now,
+        ).execute()
+
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % self.evict_every == 0
+        if should_evict:
+            self.evict()
+
+    def refresh(self, key: str) -> None:
+        """Mark a response as fresh again after the server confirmed it didn't change."""
+        now = time.time()
+        _HttpCacheModel.update(stored_at=now, accessed_at=now).where(_HttpCacheModel.key == key).execute()
+
+    def delete(self, key: str) -> None:
+        self._init_database()
+        _HttpCacheModel.delete_by_id(key)
+
+    def evict(self) -> int:
+        """Delete responses older than max_age, then the least recently used ones until the cache fits in max_bytes."""
+        self._init_database()
+        with _http_cache_database.atomic():
+            evicted = _HttpCacheModel.delete().where(_HttpCacheModel.stored_at < time.time() - self.max_age).execute()
+
+            excess = (_HttpCacheModel.select(fn.SUM(_HttpCacheModel.size)).scalar() or 0) - self.max_bytes
+            if excess <= 0:
+                return evicted
+
+            to_delete = []
+            for row in _HttpCacheModel.select(_HttpCacheModel.key, _HttpCacheModel.size).order_by(_HttpCacheModel.accessed_at):
+                to_delete.append(row.key)
+                excess -= row.size
+                if excess <= 0:
+                    break
+            evicted += _HttpCacheModel.delete().where(_HttpCacheModel.key.in_(to_delete)).execute()
+        return evicted
+
+    def record(self, domain: str, event: str) -> None:
+        with self._lock:
+            self.domain_stats[domain][event] += 1
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {domain: dict(domain_stats) for domain, domain_stats in self.domain_stats.items()}
+
+
+http_cache = HttpCache()
@@ -3,7 +3,9 @@ from __future__ import annotations
 import pickle
 import random
 import re
-from typing import TYPE_CHECKING, Any, TypeVar, dataclass_transform
+from datetime import datetime
+from types import NoneType, UnionType
+from typing import TYPE_CHECKING, Any, NamedTuple, Self, TypeVar, Union, dataclass_transform, get_args, get_origin
 
 from pydantic import BaseModel as BadBaseModel
 from pydantic import PrivateAttr, ValidationError
@@ -85,6 +87,7 @@ def remove_indent(string: str) -> str:
 class BaseModel(BadBaseModel):
 
     _raw_data: dict[str, Any] = PrivateAttr()
+    _lazy_values: dict[str, Any] | None = PrivateAttr(default=None)
 
     def __init__(self, **data):
         try:
@@ -100,6 +103,108 @@ class BaseModel(BadBaseModel):
         else:
             self._raw_data = data
 
+    @classmethod
+    def construct_trusted(cls, data: dict[str, Any], keep_raw_data: bool = True) -> Self:
+        """Build an instance out of trusted data, like danbooru's own json, without validating it.
+
+        Nested models are built the same way, and datetimes are only parsed the first time they're accessed.
+        Without keep_raw_data the payload isn't kept around in _raw_data, so properties that read from it won't work.
+        """
+        plan = _construction_plan(cls)
+        values = plan.defaults.copy()
+        fields_set = set()
+        lazy_values: dict[str, Any] = {}
+        for name, value in data.items():
+            if (field := plan.fields.get(name)) is None:
+                continue
+            kind, model = field
+            fields_set.add(name)
+            if value is None or kind is None:
+                values[name] = value
+            elif kind == "datetime" and isinstance(value, str):
+                values.pop(name, None)
+                lazy_values[name] = value
+            elif kind == "model":
+                values[name] = model.construct_trusted(value, keep_raw_data=keep_raw_data)  # type: ignore[union-attr]
+            elif kind == "models":
+                values[name] = [model.construct_trusted(v, keep_raw_data=keep_raw_data) for v in value]  # type: ignore[union-attr]
+            else:
+                values[name] = value
+
+        # the same state model_construct() would set up, minus all the bookkeeping that makes it slower than validation itself
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        private = {"_lazy_values": lazy_values}
+        if keep_raw_data:
+            private["_raw_data"] = data
+        object.__setattr__(instance, "__pydantic_private__", private)
+        return instance
+
+    def model_dump(self, **kwargs) -> dict[str, Any]:
+        self._resolve_lazy_values()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        self._resolve_lazy_values()
+        return super().model_dump_json(**kwargs)
+
+    def _resolve_lazy_values(self) -> None:
+        """Parse what a trusted instance didn't parse yet, down to its nested models, and put its fields back in order for serialization."""
+        if (lazy_values := (self.__pydantic_private__ or {}).get("_lazy_values")) is None:
+            return
+        for name in list(lazy_values):
+            getattr(self, name)
+        ordered = {name: self.__dict__[name] for name in type(self).model_fields if name in self.__dict__}
+        object.__setattr__(self, "__dict__", ordered)
+        for value in ordered.values():
+            for nested in value if isinstance(value, list) else [value]:
+                if isinstance(nested, BaseModel):
+                    nested._resolve_lazy_values()  # noqa: SLF001
+
+    if not TYPE_CHECKING:
+        def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+            lazy_values = (self.__pydantic_private__ or {}).get("_lazy_values")
+            if lazy_values and name in lazy_values:
+                value = self.__dict__[name] = datetime.fromisoformat(lazy_values.pop(name))
+                return value
+            return super().__getattr__(name)
+
+
+class _ConstructionPlan(NamedTuple):
+    fields: dict[str, tuple[str | None, type[BaseModel] | None]]
+    defaults: dict[str, Any]
+
+
+_construction_plans: dict[type[BaseModel], _ConstructionPlan] = {}
+
+
+def _construction_plan(model: type[BaseModel]) -> _ConstructionPlan:
+    """Which fields of a model need to be built as nested models or parsed as datetimes when it's constructed without validation."""
+    if (plan := _construction_plans.get(model)) is not None:
+        return plan
+
+    model.model_rebuild()
+    plan = _ConstructionPlan({}, {})
+    for name, field in model.model_fields.items():
+        if not field.is_required() and field.default_factory is None:
+            plan.defaults[name] = field.default
+
+        annotation = field.annotation
+        if get_origin(annotation) in (Union, UnionType) and len(not_none := [a for a in get_args(annotation) if a is not NoneType]) == 1:
+            annotation, = not_none
+        if get_origin(annotation) is list and (args := get_args(annotation)) and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            plan.fields[name] = ("models", args[0])
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            plan.fields[name] = ("model", annotation)
+        elif annotation is datetime:
+            plan.fields[name] = ("datetime", None)
+        else:
+            plan.fields[name] = (None, None)
+    _construction_plans[model] = plan
+    return plan
+
 
 def value_from_validation_error(data: dict, exception: ValidationError) -> dict:
     values = {}
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import TYPE_CHECKING
+
+import redis
+
+from danboorutools import logger, settings
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+    from types import TracebackType
+
+RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL")
+RATE_LIMIT_FOLDER = settings.BASE_FOLDER / "data" / "rate_limits"
+
+MIN_CALLS_PER_SECOND = 0.01
+MULTIPLICATIVE_DECREASE = 0.5  # the rate is multiplied by this on every 429
+ADDITIVE_INCREASE = 0.05  # and increased by this fraction of the starting rate after every REWARD_EVERY healthy responses
+REWARD_EVERY = 10
+DEFAULT_BLOCK = 30  # seconds to stop sending requests for after a 429 that didn't say for how long
+
+# GCRA in a single atomic step: reserve the next slot and return how long the caller has to wait for it
+_REDIS_RESERVE_SCRIPT = """
+local redis_time = redis.call("TIME")
+local now = tonumber(redis_time[1]) + tonumber(redis_time[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tat", "rate")
+
+local rate = math.min(tonumber(state[2]) or tonumber(ARGV[1]), tonumber(ARGV[2]))
+local emission_interval = 1 / rate
+local burst_tolerance = (math.max(1, math.floor(rate)) - 1) * emission_interval
+
+local tat = math.max(tonumber(state[1]) or now, now)
+redis.call("HSET", KEYS[1], "tat", tostring(tat + emission_interval), "rate", tostring(rate))
+return tostring(math.max(0, tat - burst_tolerance - now))
+"""
+
+_REDIS_ADJUST_SCRIPT = """
+local redis_time = redis.call("TIME")
+local now = tonumber(redis_time[1]) + tonumber(redis_time[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tat", "rate")
+
+local rate = tonumber(state[2]) or tonumber(ARGV[4])
+rate = math.max(tonumber(ARGV[5]), math.min(rate * tonumber(ARGV[1]) + tonumber(ARGV[2]), tonumber(ARGV[6])))
+local burst_tolerance = (math.max(1, math.floor(rate)) - 1) / rate
+
+local tat = math.max(tonumber(state[1]) or now, now)
+local block_for = tonumber(ARGV[3])
+if block_for > 0 then
+    tat = math.max(tat, now + block_for + burst_tolerance)
+end
+redis.call("HSET", KEYS[1], "tat", tostring(tat), "rate", tostring(rate))
+return tostring(rate)
+"""
+
+
+def _burst_tolerance(rate: float) -> float:
+    return (max(1, int(rate)) - 1) / rate
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> float | None:
+    """How long the server asked to wait, from Retry-After or from an exhausted X-RateLimit-* quota."""
+    if retry_after := headers.get("Retry-After"):
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+
+    remaining = headers.get("X-RateLimit-Remaining") or headers.get("X-Rate-Limit-Remaining")
+    reset = headers.get("X-RateLimit-Reset") or headers.get("X-Rate-Limit-Reset")
+    if remaining != "0" or not reset:
+        return None
+    try:
+        reset_value = float(reset)
+    except ValueError:
+        return None
+    # some sites send the reset as a unix timestamp, others as the seconds left
+    return max(0.0, reset_value - time.time()) if reset_value > 1_000_000_000 else reset_value
+
+
+class RateLimiter(ABC):
+    """A per-identity rate limiter whose budget is shared by every process using the same backend.
+
+    It uses the generic cell rate algorithm: each call reserves the next free slot, `rate` slots are spread evenly
+    over a second, and up to one second's worth of calls can burst through at once.
+    The rate of each identity starts at `calls_per_second`, is halved on 429s and probed back up to `max_calls_per_second`
+    while responses stay healthy. It's stored alongside the bucket, so it's remembered between runs.
+    Its `ratelimit(identity, delay=True)` has the same sync/async context manager interface as pyrate_limiter's Limiter.
+    """
+
+    def __init__(self, calls_per_second: float, namespace: str, max_calls_per_second: float | None = None) -> None:
+        if calls_per_second <= 0:
+            raise ValueError(calls_per_second)
+
+        self.calls_per_second = calls_per_second
+        self.max_calls_per_second = max(max_calls_per_second or calls_per_second, calls_per_second)
+        self.namespace = namespace
+
+        self._stats_lock = Lock()
+        self.wait_stats: defaultdict[str, dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "waited": 0.0, "max_wait": 0.0, "throttled": 0},
+        )
+        self._healthy_responses: defaultdict[str, int] = defaultdict(int)
+
+    def ratelimit(self, identity: str, delay: bool = True) -> _RateLimitContext:
+        if not delay:
+            raise NotImplementedError("Only delaying rate limits are supported.")
+        return _RateLimitContext(self, identity)
+
+    def reserve(self, identity: str) -> float:
+        """Reserve a slot for the identity and return how many seconds to wait before using it."""
+        wait = self._reserve(self._key(identity))
+
+        with self._stats_lock:
+            stats = self.wait_stats[identity]
+            stats["calls"] += 1
+            stats["waited"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+        if wait > 0:
+            logger.debug(f"Rate limited on {identity} for {wait:.2f}s.")
+        return wait
+
+    def feedback(self, identity: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt the rate of an identity to a response received from it."""
+        retry_after = retry_after_seconds(headers)
+
+        if status_code == 429:
+            block_for = DEFAULT_BLOCK if retry_after is None else retry_after
+            rate = self._adjust(self._key(identity), factor=MULTIPLICATIVE_DECREASE, block_for=block_for)
+            logger.info(f"Rate limited by {identity}: pausing for {block_for:.0f}s and lowering the rate to {rate:.2f} calls per second.")
+            with self._stats_lock:
+                self.wait_stats[identity]["throttled"] += 1
+                self._healthy_responses[identity] = 0
+
+        elif retry_after:
+            # the quota ran out, but the rate itself was fine
+            self._adjust(self._key(identity), block_for=retry_after)
+
+        elif status_code < 400:
+            with self._stats_lock:
+                self._healthy_responses[identity] += 1
+                should_increase = self._healthy_responses[identity] % REWARD_EVERY == 0
+            if should_increase:
+                self._adjust(self._key(identity), increase=ADDITIVE_INCREASE * self.calls_per_second)
+
+    def _key(self, identity: str) -> str:
+        return f"{self.namespace}:{identity}"
+
+    @abstractmethod
+    def _reserve(self, key: str) -> float:
+        ...
+
+    @abstractmethod
+    def _adjust(self, key: str, factor: float = 1, increase: float = 0, block_for: float = 0) -> float:
+        """Scale and increase the rate of a key, optionally blocking it for a while, and return the new rate."""
+
+    def _reserved_state(self, stored_tat: float | None, stored_rate: float | None, now: float) -> tuple[float, float, float]:
+        rate = min(stored_rate or self.calls_per_second, self.max_calls_per_second)
+        tat = max(stored_tat or now, now)
+        return tat + 1 / rate, rate, max(0.0, tat - _burst_tolerance(rate) - now)
+
+    def _adjusted_state(self, stored_tat: float | None, stored_rate: float | None, now: float,
+                        factor: float, increase: float, block_for: float) -> tuple[float, float]:
+        rate = (stored_rate or self.calls_per_second) * factor + increase
+        rate = max(MIN_CALLS_PER_SECOND, min(rate, self.max_calls_per_second))
+        tat = max(stored_tat or now, now)
+        if block_for > 0:
+            tat = max(tat, now + block_for + _burst_tolerance(rate))
+        return tat, rate
+
+    def rate(self, identity: str) -> float:
+        """The current shared rate of an identity."""
+        return self._adjust(self._key(identity))
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._stats_lock:
+            return {identity: dict(stats) for identity, stats in self.wait_stats.items()}
+
+
+class _RateLimitContext:
+    def __init__(self, limiter: RateLimiter, identity: str) -> None:
+        self.limiter = limiter
+        self.identity = identity
+
+    def __enter__(self) -> None:
+        if (wait := self.limiter.reserve(self.identity)) > 0:
+            time.sleep(wait)
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None) -> None:
+        pass
+
+    async def __aenter__(self) -> None:
+        if (wait := self.limiter.reserve(self.identity)) > 0:
+            await asyncio.sleep(wait)
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None) -> None:
+        pass
+
+
+class FileLockRateLimiter(RateLimiter):
+    """Shared between local processes through a locked file per identity."""
+
+    def _reserve(self, key: str) -> float:
+        with _LockedStateFile(self._path(key)) as state:
+            tat, rate, wait = self._reserved_state(*state.read(), time.time())
+            state.write(tat, rate)
+        return wait
+
+    def _adjust(self, key: str, factor: float = 1, increase: float = 0, block_for: float = 0) -> float:
+        with _LockedStateFile(self._path(key)) as state:
+            tat, rate = self._adjusted_state(*state.read(), time.time(), factor, increase, block_for)
+            state.write(tat, rate)
+        return rate
+
+    @staticmethod
+    def _path(key: str) -> Path:
+        RATE_LIMIT_FOLDER.mkdir(parents=True, exist_ok=True)
+        return RATE_LIMIT_FOLDER / re.sub(r"[^\w.-]", "_", key)
+
+
+class _LockedStateFile:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def __enter__(self) -> _LockedStateFile:
+        self.file = self.path.open("a+", encoding="utf-8")
+        fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None) -> None:
+        self.file.close()
+
+    def read(self) -> tuple[float | None, float | None]:
+        self.file.seek(0)
+        match self.file.read().split():
+            case [tat, rate]:
+                return float(tat), float(rate)
+            case [tat]:
+                return float(tat), None
+            case _:
+                return None, None
+
+    def write(self, tat: float, rate: float) -> None:
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write(f"{tat!r} {rate!r}")
+
+
+class RedisRateLimiter(RateLimiter):
+    """Shared between every process, container and host connected to the same redis."""
+
+    def __init__(self, calls_per_second: float, namespace: str, connection: redis.Redis, max_calls_per_second: float | None = None) -> None:
+        super().__init__(calls_per_second, namespace, max_calls_per_second)
+        self.connection = connection
+        self._reserve_script = connection.register_script(_REDIS_RESERVE_SCRIPT)
+        self._adjust_script = connection.register_script(_REDIS_ADJUST_SCRIPT)
+
+    def _reserve(self, key: str) -> float:
+        return float(self._reserve_script(keys=[f"rate_limit:{key}"], args=[self.calls_per_second, self.max_calls_per_second]))
+
+    def _adjust(self, key: str, factor: float = 1, increase: float = 0, block_for: float = 0) -> float:
+        args = [factor, increase, block_for, self.calls_per_second, MIN_CALLS_PER_SECOND, self.max_calls_per_second]
+        return float(self._adjust_script(keys=[f"rate_limit:{key}"], args=args))
+
+
+_redis_connection: redis.Redis | None = None
+_redis_checked = False
+
+
+def _shared_redis_connection() -> redis.Redis | None:
+    global _redis_connection, _redis_checked  # noqa: PLW0603
+    if _redis_checked or not RATE_LIMIT_REDIS_URL:
+        return _redis_connection
+
+    _redis_checked = True
+    connection = redis.Redis.from_url(RATE_LIMIT_REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5)
+    try:
+        connection.ping()
+    except redis.RedisError as e:
+        logger.warning(f"Couldn't connect to {RATE_LIMIT_REDIS_URL} ({e}), falling back to file-locked rate limits.")
+    else:
+        _redis_connection = connection
+    return _redis_connection
+
+
+def rate_limiter_for(calls_per_second: float, namespace: str, max_calls_per_second: float | None = None) -> RateLimiter:
+    """A redis-backed limiter if RATE_LIMIT_REDIS_URL is set and reachable, otherwise a file-locked one."""
+    if (connection := _shared_redis_connection()) is not None:
+        return RedisRateLimiter(calls_per_second, namespace, connection, max_calls_per_second)
+    return FileLockRateLimiter(calls_per_second, namespace, max_calls_per_second)
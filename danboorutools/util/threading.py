@@ -3,16 +3,21 @@ from __future__ import annotations
 from itertools import repeat
 from multiprocessing import Value
 from multiprocessing.pool import ThreadPool
+from queue import Full, Queue
+from threading import Event, Thread
 from typing import TYPE_CHECKING, TypeVar
 
 from danboorutools import logger
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable, Iterator
 
 ParallelItem = TypeVar("ParallelItem")
 Args = TypeVar("Args")
 ReturnTypeOfFunc = TypeVar("ReturnTypeOfFunc")
+ReadAheadItem = TypeVar("ReadAheadItem")
+
+_EXHAUSTED = object()
 
 
 def run_in_parallel(function: Callable[[ParallelItem, Args], ReturnTypeOfFunc],
@@ -26,6 +31,46 @@ def run_in_parallel(function: Callable[[ParallelItem, Args], ReturnTypeOfFunc],
     pool.close()
 
 
+def read_ahead(iterable: Iterable[ReadAheadItem], depth: int) -> Iterator[ReadAheadItem]:
+    """Iterate over an iterable in a background thread, keeping up to `depth` items ready while the current one is consumed.
+
+    Exceptions raised by the iterable are re-raised in the consumer, and the thread stops as soon as the consumer does.
+    """
+    queue: Queue[tuple[object, Exception | None]] = Queue(maxsize=depth)
+    stopped = Event()
+
+    def put(item: object, error: Exception | None = None) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put((item, error), timeout=0.1)
+            except Full:
+                continue
+            return True
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:  # noqa: BLE001
+            put(_EXHAUSTED, e)
+        else:
+            put(_EXHAUSTED)
+
+    Thread(target=produce, name="read_ahead", daemon=True).start()
+    try:
+        while True:
+            item, error = queue.get()
+            if item is _EXHAUSTED:
+                if error:
+                    raise error
+                return
+            yield item  # type: ignore[misc]
+    finally:
+        stopped.set()
+
+
 class Counter:
     def __init__(self, print_progress: bool = False) -> None:
         self.counter = Value("i", 0)
@@ -0,0 +1,136 @@
+import hashlib
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from requests import Response
+from requests.exceptions import ChunkedEncodingError
+from requests.structures import CaseInsensitiveDict
+
+from danboorutools.logical.asset_downloader import AssetDownloader
+from danboorutools.logical.sessions import Session
+
+CONTENT = b"a" * 100 + b"b" * 100
+
+
+def stream_response(status_code: int, chunks: list[bytes], headers: dict[str, str] | None = None, broken: bool = False) -> Response:
+    def iter_content(chunk_size: int) -> Iterator[bytes]:  # noqa: ARG001
+        yield from chunks
+        if broken:
+            raise ChunkedEncodingError("Connection broken")
+
+    response = Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = "https://example.com/file"
+    response.iter_content = iter_content  # type: ignore[method-assign]
+    return response
+
+
+class FakeServer:
+    """Stands in for Session.get, answering with queued responses and recording the headers sent."""
+
+    def __init__(self) -> None:
+        self.responses: list[Response] = []
+        self.sent_headers: list[dict] = []
+
+    def __call__(self, url: str, *args, headers: dict, **kwargs) -> Response:  # noqa: ARG002
+        self.sent_headers.append(headers)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> FakeServer:
+    server = FakeServer()
+    monkeypatch.setattr(Session, "get", server)
+    return server
+
+
+def part_files(folder: Path) -> list[str]:
+    return sorted(file.suffix for file in folder.iterdir() if file.name.startswith("."))
+
+
+def test_interrupted_downloads_are_resumed(server: FakeServer, tmp_path: Path) -> None:
+    server.responses.append(stream_response(200, [CONTENT[:100]], {"ETag": '"v1"'}, broken=True))
+    with pytest.raises(ChunkedEncodingError):
+        Session().download_file("https://example.com/file", download_dir=tmp_path)
+    assert part_files(tmp_path) == [".part", ".validator"]
+
+    server.responses.append(stream_response(206, [CONTENT[100:]], {"ETag": '"v1"'}))
+    downloaded = Session().download_file("https://example.com/file", download_dir=tmp_path)
+
+    assert server.sent_headers[1]["Range"] == "bytes=100-"
+    assert server.sent_headers[1]["If-Range"] == '"v1"'
+    assert downloaded.path.read_bytes() == CONTENT
+    assert downloaded.md5 == hashlib.md5(CONTENT, usedforsecurity=False).hexdigest()
+    assert part_files(tmp_path) == []
+
+
+def test_downloads_restart_when_the_file_changed(server: FakeServer, tmp_path: Path) -> None:
+    server.responses.append(stream_response(200, [b"old data"], {"ETag": '"v1"'}, broken=True))
+    with pytest.raises(ChunkedEncodingError):
+        Session().download_file("https://example.com/file", download_dir=tmp_path)
+
+    # If-Range didn't match, so the whole new file is sent back
+    server.responses.append(stream_response(200, [CONTENT], {"ETag": '"v2"'}))
+    downloaded = Session().download_file("https://example.com/file", download_dir=tmp_path)
+
+    assert downloaded.path.read_bytes() == CONTENT
+    assert part_files(tmp_path) == []
+
+
+def test_unsatisfiable_ranges_restart_the_download(server: FakeServer, tmp_path: Path) -> None:
+    server.responses.append(stream_response(200, [CONTENT], {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, broken=True))
+    with pytest.raises(ChunkedEncodingError):
+        Session().download_file("https://example.com/file", download_dir=tmp_path)
+
+    server.responses.append(stream_response(416, []))
+    server.responses.append(stream_response(200, [CONTENT]))
+    downloaded = Session().download_file("https://example.com/file", download_dir=tmp_path)
+
+    assert "Range" in server.sent_headers[1]
+    assert "Range" not in server.sent_headers[2]
+    assert downloaded.path.read_bytes() == CONTENT
+    assert part_files(tmp_path) == []
+
+
+def test_downloads_without_validators_are_not_resumed(server: FakeServer, tmp_path: Path) -> None:
+    server.responses.append(stream_response(200, [CONTENT[:100]], broken=True))
+    with pytest.raises(ChunkedEncodingError):
+        Session().download_file("https://example.com/file", download_dir=tmp_path)
+    assert part_files(tmp_path) == [".part"]
+
+    server.responses.append(stream_response(200, [CONTENT]))
+    downloaded = Session().download_file("https://example.com/file", download_dir=tmp_path)
+
+    assert "Range" not in server.sent_headers[1]
+    assert downloaded.path.read_bytes() == CONTENT
+
+
+class FakeAsset:
+    def __init__(self, domain: str, file_size: int, error: Exception | None = None) -> None:
+        self.parsed_url = SimpleNamespace(domain=domain)
+        self.session = SimpleNamespace(MAX_CONCURRENT_REQUESTS_PER_DOMAIN=1)
+        self.file_size = file_size
+        self.error = error
+
+    @property
+    def files(self) -> list:
+        if self.error:
+            raise self.error
+        return [SimpleNamespace(file_size=self.file_size)]
+
+
+def test_asset_downloader_keeps_order_and_errors() -> None:
+    error = ValueError("gone")
+    assets = [FakeAsset("a.com", 10), FakeAsset("b.com", 20), FakeAsset("a.com", 0, error=error), FakeAsset("a.com", 30)]
+    downloader = AssetDownloader(max_workers=4)
+
+    results = downloader.download([*assets, assets[0]])
+
+    assert list(results) == [assets[0], assets[1], assets[3]]
+    assert downloader.errors == {assets[2]: error}
+    stats = downloader.stats
+    assert {domain: (domain_stats["total"], domain_stats["done"], domain_stats["failed"], domain_stats["bytes"])
+            for domain, domain_stats in stats.items()} == {"a.com": (3, 2, 1, 40), "b.com": (1, 1, 0, 20)}
@@ -0,0 +1,80 @@
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+import requests
+
+from danboorutools.util.connection_pool import (
+    ConnectionStats,
+    PooledCipherSuiteAdapter,
+    PooledHTTPAdapter,
+    connection_stats,
+    pooled_adapter,
+)
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    connection_stats.reset()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+    connection_stats.reset()
+
+
+def pooled_session() -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", PooledHTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0))
+    return session
+
+
+def test_kept_alive_connections_are_counted_as_reused(server_url: str) -> None:
+    with pooled_session() as session:
+        for _ in range(3):
+            assert session.get(server_url).content == b"ok"
+
+    assert connection_stats.stats == {"127.0.0.1": {"requests": 3, "new_connections": 1, "reused_connections": 2}}
+
+
+def test_closed_connections_are_counted_as_new(server_url: str) -> None:
+    with pooled_session() as session:
+        for _ in range(3):
+            session.get(server_url, headers={"Connection": "close"})
+
+    assert connection_stats.stats == {"127.0.0.1": {"requests": 3, "new_connections": 3, "reused_connections": 0}}
+
+
+def test_reused_connections_are_never_negative() -> None:
+    stats = ConnectionStats()
+    stats.record("example.com", "new_connections")
+
+    assert stats.stats == {"example.com": {"requests": 0, "new_connections": 1, "reused_connections": 0}}
+    stats.reset()
+    assert stats.stats == {}
+
+
+def test_pooled_adapters_are_shared_by_pool_name() -> None:
+    pool_kwargs = {"pool_connections": 2, "pool_maxsize": 4, "max_retries": 0, "pool_block": False}
+
+    adapter = pooled_adapter("ConnectionPoolTest", "http", **pool_kwargs)
+
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert pooled_adapter("ConnectionPoolTest", "http", **pool_kwargs) is adapter
+    assert pooled_adapter("OtherConnectionPoolTest", "http", **pool_kwargs) is not adapter
+    assert isinstance(pooled_adapter("ConnectionPoolTest", "https", **pool_kwargs, cipherSuite="DEFAULT"), PooledCipherSuiteAdapter)
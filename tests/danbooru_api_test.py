@@ -1,8 +1,13 @@
 import random
+from pathlib import Path
 
+import numpy as np
 import pytest
 
+from danboorutools.logical.columnar import ColumnarBuffer, ColumnarResults, value_counts
 from danboorutools.logical.sessions.danbooru import danbooru_api, kwargs_to_include
+from danboorutools.models.danbooru import DanbooruPostVersion
+from tests.helpers.danbooru import post_version_payloads
 
 
 @pytest.mark.danbooru
@@ -79,3 +84,28 @@ def test_comment_votes() -> None:
     comment_vote = random.choice(comment_votes[1:-2])
     assert comment_votes[comment_votes.index(comment_vote) + 1].id + 1 == comment_vote.id
     assert comment_votes[comment_votes.index(comment_vote) - 1].id - 1 == comment_vote.id
+
+
+def test_columnar_buffer(tmp_path: Path) -> None:
+    versions = post_version_payloads(3)
+    versions[1]["updated_at"] = None
+    versions[2]["added_tags"] = []
+
+    buffer = ColumnarBuffer(DanbooruPostVersion, ["updated_at", "added_tags", "obsolete_added_tags", "post.uploader_id"])
+    assert buffer.only_string == "id,updated_at,added_tags,obsolete_added_tags,post[uploader_id]"
+    buffer.append(versions[:2])
+    buffer.append(versions[2:])
+    results = buffer.finish()
+
+    assert len(results) == 3
+    assert results["id"].tolist() == [1, 2, 3]
+    assert results["updated_at"][0] == np.datetime64("2024-05-01T16:34:56.789")
+    assert np.isnat(results["updated_at"][1])
+    assert results["added_tags"].tolist() == ["tag_1", "tag_2", "tag_1", "tag_2"]
+    assert results.row_indexes("added_tags").tolist() == [0, 0, 1, 1]
+    assert value_counts(results["post.uploader_id"]) == {1234: 3}
+
+    results.save(tmp_path / "versions.npz")
+    loaded = ColumnarResults.load(tmp_path / "versions.npz")
+    assert loaded["added_tags"].tolist() == results["added_tags"].tolist()
+    assert loaded.row_lengths("added_tags").tolist() == [2, 2, 0]
@@ -0,0 +1,157 @@
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
+import pytest
+from requests.exceptions import ReadTimeout
+
+from danboorutools.logical import progress_tracker
+from danboorutools.logical.progress_tracker import ProgressTracker
+from danboorutools.logical.sessions.danbooru import danbooru_api
+from danboorutools.models.danbooru import DanbooruPost, DanbooruTag
+from tests.helpers.danbooru import DanbooruSearchStub
+
+
+@pytest.fixture
+def progress_database(tmp_path: Path) -> Iterator[None]:
+    original_path = progress_tracker._progress_database.database
+    progress_tracker._progress_database.init(tmp_path / "progress.sqlite")
+    yield
+    progress_tracker._progress_database.init(original_path)
+
+
+def stub_search(monkeypatch: pytest.MonkeyPatch, *args, **kwargs) -> DanbooruSearchStub:
+    stub = DanbooruSearchStub(*args, **kwargs)
+    monkeypatch.setattr(danbooru_api, "danbooru_request", stub)
+    return stub
+
+
+def test_paginate_walks_id_cursors(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = stub_search(monkeypatch, range(1, 2501))
+
+    tags = list(danbooru_api.paginate(DanbooruTag, lean=True))
+
+    assert [tag.id for tag in tags] == list(range(2500, 0, -1))
+    assert stub.pages == [1, "b1501", "b501"]
+
+
+def test_paginate_ascending(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = stub_search(monkeypatch, range(1, 2501))
+
+    tags = list(danbooru_api.paginate(DanbooruTag, ascending=True, lean=True))
+
+    assert [tag.id for tag in tags] == list(range(1, 2501))
+    assert stub.pages == ["a0", "a1000", "a2000"]
+
+
+def test_paginate_max_items(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = stub_search(monkeypatch, range(1, 5001))
+
+    tags = list(danbooru_api.paginate(DanbooruTag, max_items=1500, lean=True))
+
+    assert len(tags) == 1500
+    assert stub.pages == [1, "b4001"]
+
+
+def test_paginate_posts_past_short_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = stub_search(monkeypatch, range(1, 451), hidden_ids=range(300, 320))
+
+    posts = list(danbooru_api.paginate(DanbooruPost, tags=["some_tag"], lean=True))
+
+    assert [post.id for post in posts] == [post_id for post_id in range(450, 0, -1) if not 300 <= post_id < 320]
+    assert stub.pages == [1, "b251", "b51", "b1"]
+    assert all(params["tags"] == "some_tag" for params in stub.requests)
+
+
+@pytest.mark.usefixtures("progress_database")
+def test_paginate_saves_progress_per_consumed_page(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub_search(monkeypatch, range(1, 2501))
+    progress = ProgressTracker("PAGINATION_TEST", 0)
+
+    # the page isn't done until the consumer asks for what comes after it
+    list(islice(danbooru_api.paginate(DanbooruTag, progress=progress, lean=True), 1000))
+    assert progress.value == 0
+    list(islice(danbooru_api.paginate(DanbooruTag, progress=progress, lean=True), 1001))
+    assert progress.value == 1501
+
+
+@pytest.mark.usefixtures("progress_database")
+def test_paginate_resumes_from_progress(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = stub_search(monkeypatch, range(1, 2501))
+    progress = ProgressTracker("PAGINATION_TEST", 0)
+    progress.value = 1501
+
+    tags = list(danbooru_api.paginate(DanbooruTag, progress=progress, lean=True))
+
+    assert [tag.id for tag in tags] == list(range(1500, 0, -1))
+    assert stub.pages == ["b1501", "b501"]
+    assert progress.value == 1
+
+
+def test_paginate_prefetch_matches_sequential(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub_search(monkeypatch, range(1, 2501))
+
+    sequential = [tag.id for tag in danbooru_api.paginate(DanbooruTag, lean=True)]
+    prefetched = [tag.id for tag in danbooru_api.paginate(DanbooruTag, prefetch=2, lean=True)]
+
+    assert prefetched == sequential
+
+
+def test_id_windows_split_the_id_range(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub_search(monkeypatch, range(1, 10001))
+
+    assert danbooru_api._id_windows(DanbooruTag, 4) == {1: 2500, 2501: 5000, 5001: 7500, 7501: 10000}
+
+
+def test_id_windows_of_an_empty_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub_search(monkeypatch, [])
+
+    assert danbooru_api._id_windows(DanbooruTag, 4) == {}
+
+
+def test_sharded_walk_yields_every_id_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = stub_search(monkeypatch, range(1, 10001))
+
+    tags = list(danbooru_api.paginate(DanbooruTag, shards=4, lean=True))
+
+    assert sorted(tag.id for tag in tags) == list(range(1, 10001))
+    assert {params.get("search[id]") for params in stub.requests} >= {"1..2500", "2501..5000", "5001..7500", "7501..10000"}
+
+
+def test_sharded_post_walk_yields_every_id_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = stub_search(monkeypatch, range(1, 3001), hidden_ids=range(1000, 1100))
+
+    posts = list(danbooru_api.paginate(DanbooruPost, tags=["some_tag"], shards=3, lean=True))
+
+    assert sorted(post.id for post in posts) == [post_id for post_id in range(1, 3001) if not 1000 <= post_id < 1100]
+    assert {params["tags"] for params in stub.requests} >= {"some_tag id:1..1000", "some_tag id:1001..2000", "some_tag id:2001..3000"}
+
+
+def test_sharded_walk_splits_windows_that_time_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    # the bounds lookups aren't filtered on an id range, so they're the only searches starting at 0
+    stub = stub_search(monkeypatch, range(1, 10001), times_out=lambda lowest_id, highest_id: 0 < lowest_id and highest_id - lowest_id >= 2500)
+
+    tags = list(danbooru_api.paginate(DanbooruTag, shards=2, lean=True))
+
+    assert sorted(tag.id for tag in tags) == list(range(1, 10001))
+    assert {params.get("search[id]") for params in stub.requests} >= {"1..2500", "2501..5000", "5001..7500", "7501..10000"}
+
+
+def test_sharded_walk_raises_when_windows_cant_be_split(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub_search(monkeypatch, range(1, 1501), times_out=lambda lowest_id, highest_id: 0 < lowest_id)
+
+    with pytest.raises(ReadTimeout):
+        list(danbooru_api.paginate(DanbooruTag, shards=1, lean=True))
+
+
+@pytest.mark.usefixtures("progress_database")
+def test_sharded_walk_resumes_from_remaining_windows(monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = stub_search(monkeypatch, range(1, 10001))
+    progress = ProgressTracker[dict[int, int]]("SHARDED_PAGINATION_TEST", {})
+    progress.value = {1: 500, 5001: 6000}
+
+    tags = list(danbooru_api.paginate(DanbooruTag, shards=4, progress=progress, lean=True))
+
+    assert sorted(tag.id for tag in tags) == [*range(1, 501), *range(5001, 6001)]
+    assert {params.get("search[id]") for params in stub.requests} == {"1..500", "5001..6000"}
+    assert progress.value == {}
@@ -1,5 +1,8 @@
 # NOTE: these tests only work on imagemagick 7.1
 
+import hashlib
+from pathlib import Path
+
 import pytest
 
 from danboorutools.models.file import File, ImageFile
@@ -65,3 +68,14 @@ def test_different_hash() -> None:
     f4 = File.identify("tests/files/countergirl-adobergb.jpg")
     assert len({f1.md5, f2.md5, f3.md5, f4.md5}) == 4
     assert len({f1.pixel_hash, f2.pixel_hash, f3.pixel_hash, f4.pixel_hash}) == 4
+
+
+@pytest.mark.file
+def test_from_stream(tmp_path: Path) -> None:
+    data = Path("tests/files/transparent.png").read_bytes()
+    f = File.from_stream((data[i:i + 100] for i in range(0, len(data), 100)), destination_dir=tmp_path, with_sha256=True)
+    assert isinstance(f, ImageFile)
+    assert f.path == tmp_path / "200be2be97a465ecd2054a51522f65b5.png"
+    assert f.path.read_bytes() == data
+    assert f.sha256 == hashlib.sha256(data).hexdigest()
+    assert [p.name for p in tmp_path.iterdir()] == [f.path.name]
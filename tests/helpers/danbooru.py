@@ -0,0 +1,103 @@
+from collections.abc import Callable, Iterable
+
+from requests.exceptions import ReadTimeout
+
+
+class DanbooruSearchStub:
+    """Stands in for DanbooruApi.danbooru_request, answering searches from a fixed set of ids like danbooru would.
+
+    Results only have an id. `hidden_ids` are dropped from post pages after the limit is applied, like danbooru does with hidden posts,
+    and the search times out whenever `times_out(lowest_id, highest_id)` is true for the id range it's filtered on.
+    """
+
+    def __init__(self,
+                 ids: Iterable[int],
+                 hidden_ids: Iterable[int] = (),
+                 times_out: Callable[[int, int], bool] | None = None,
+                 ) -> None:
+        self.ids = sorted(ids, reverse=True)
+        self.hidden_ids = set(hidden_ids)
+        self.times_out = times_out
+        self.requests: list[dict] = []
+
+    def __call__(self, method: str, endpoint: str, params: dict) -> list[dict]:
+        assert method == "GET"
+        self.requests.append(params.copy())
+
+        if endpoint == "posts.json":
+            id_range = next((tag.removeprefix("id:") for tag in params["tags"].split() if tag.startswith("id:")), None)
+        else:
+            id_range = params.get("search[id]")
+        lowest_id, highest_id = (int(bound) for bound in id_range.split("..")) if id_range else (0, max(self.ids, default=0))
+        if self.times_out and self.times_out(lowest_id, highest_id):
+            raise ReadTimeout
+
+        matching = [found_id for found_id in self.ids if lowest_id <= found_id <= highest_id]
+        page, limit = params["page"], params["limit"]
+        if page == 1:
+            results = matching[:limit]
+        elif page.startswith("b"):
+            results = [found_id for found_id in matching if found_id < int(page[1:])][:limit]
+        else:
+            results = [found_id for found_id in reversed(matching) if found_id > int(page[1:])][:limit]
+
+        if endpoint == "posts.json":
+            results = [found_id for found_id in results if found_id not in self.hidden_ids]
+        return [{"id": found_id} for found_id in results]
+
+    @property
+    def pages(self) -> list[int | str]:
+        return [params["page"] for params in self.requests]
+
+
+def post_version_payloads(count: int) -> list[dict]:
+    """Raw post version json, shaped like what danbooru's api sends."""
+    return [
+        {
+            "id": version_id,
+            "updated_at": "2024-05-01T12:34:56.789-04:00",
+            "updater": {
+                "id": 1000 + version_id,
+                "created_at": "2015-01-01T00:00:00.000-05:00",
+                "name": f"user_{version_id}",
+                "level": 20,
+                "level_string": "Member",
+                "post_update_count": 12345,
+                "note_update_count": 12,
+                "post_upload_count": 345,
+                "is_banned": False,
+            },
+            "post": {
+                "id": version_id,
+                "created_at": "2024-04-30T01:02:03.456-04:00",
+                "updated_at": "2024-05-01T12:34:56.789-04:00",
+                "is_pending": False,
+                "is_deleted": False,
+                "score": 12,
+                "uploader_id": 1234,
+                "source": "https://twitter.com/i/web/status/1234567890",
+                "tag_string": "tag_1 tag_2 character_(copyright) copyright artist highres",
+                "tag_string_character": "character_(copyright)",
+                "tag_string_copyright": "copyright",
+                "tag_string_artist": "artist",
+                "tag_string_meta": "highres",
+                "media_asset": {
+                    "id": version_id,
+                    "created_at": "2024-04-30T01:02:03.456-04:00",
+                    "md5": "d34e4cf0a437a5d65f8e82b7bcd02606",
+                    "pixel_hash": "9c877dd5674d7fa251ce2de0c956fd36",
+                    "file_ext": "jpg",
+                    "image_height": 2000,
+                    "image_width": 1500,
+                    "file_size": 1234567,
+                    "duration": None,
+                    "variants": [{"type": "original", "url": "https://cdn.donmai.us/original/d3/4e/d34e4cf0a437a5d65f8e82b7bcd02606.jpg"}],
+                },
+            },
+            "added_tags": ["tag_1", "tag_2"],
+            "removed_tags": ["tag_3"],
+            "obsolete_added_tags": "",
+            "obsolete_removed_tags": "",
+        }
+        for version_id in range(1, count + 1)
+    ]
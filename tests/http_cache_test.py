@@ -0,0 +1,125 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from danboorutools.logical import sessions
+from danboorutools.logical.sessions import Session
+from danboorutools.util import http_cache as http_cache_module
+from danboorutools.util.http_cache import HttpCache, _HttpCacheModel
+
+
+def make_response(status_code: int, content: bytes = b"", headers: dict[str, str] | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = content
+    response.url = "https://example.com/page"
+    return response
+
+
+class CachedTestSession(Session):
+    PERSISTENT_CACHE_TTL = 60
+
+
+@pytest.fixture
+def http_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[HttpCache]:
+    database = http_cache_module._http_cache_database
+    original_path = database.database
+    database.init(tmp_path / "http_cache.sqlite", pragmas={"journal_mode": "wal"})
+    cache = HttpCache()
+    monkeypatch.setattr(sessions, "http_cache", cache)
+    yield cache
+    database.init(original_path, pragmas={"journal_mode": "wal"})
+
+
+class FakeServer:
+    """Stands in for Session._request_with_retries, answering with queued responses and recording the headers sent."""
+
+    def __init__(self) -> None:
+        self.responses: list[Response] = []
+        self.sent_headers: list[dict] = []
+
+    def __call__(self, http_method: str, url: str, *args, **kwargs) -> Response:  # noqa: ARG002
+        self.sent_headers.append(kwargs.get("headers", {}))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> FakeServer:
+    server = FakeServer()
+    monkeypatch.setattr(Session, "_request_with_retries", server)
+    return server
+
+
+def test_set_and_get(http_cache: HttpCache) -> None:
+    response = make_response(200, b"body", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT", "Content-Encoding": "gzip"})
+    http_cache.set("key", "example.com", response)
+
+    cached = http_cache.get("key")
+    assert cached is not None
+    assert cached.content == b"body"
+    assert "Content-Encoding" not in cached.headers
+    assert cached.validators == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert cached.to_response().content == b"body"
+    assert http_cache.get("missing") is None
+
+
+def test_evict_by_age_and_size(http_cache: HttpCache) -> None:
+    http_cache.max_bytes = 10
+    for key in ("old", "a", "b"):
+        http_cache.set(key, "example.com", make_response(200, b"12345678"))
+    _HttpCacheModel.update(stored_at=0).where(_HttpCacheModel.key == "old").execute()
+
+    assert http_cache.evict() == 2
+    assert http_cache.get("old") is None
+    assert http_cache.get("a") is None
+    assert http_cache.get("b") is not None
+
+
+def test_fresh_responses_are_served_from_the_cache(http_cache: HttpCache, server: FakeServer) -> None:
+    server.responses.append(make_response(200, b"first", {"ETag": '"v1"'}))
+    session = CachedTestSession()
+
+    assert session.get("https://example.com/page").content == b"first"
+    assert session.get("https://example.com/page").content == b"first"
+
+    assert len(server.sent_headers) == 1
+    assert http_cache.stats == {"example.com": {"hits": 1, "misses": 1, "revalidated": 0}}
+
+
+def test_stale_responses_are_revalidated(http_cache: HttpCache, server: FakeServer) -> None:
+    server.responses.append(make_response(200, b"first", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}))
+    server.responses.append(make_response(304))
+    session = CachedTestSession()
+
+    session.get("https://example.com/page")
+    _HttpCacheModel.update(stored_at=0).execute()
+    response = session.get("https://example.com/page")
+
+    assert response.status_code == 200
+    assert response.content == b"first"
+    assert server.sent_headers[1]["If-None-Match"] == '"v1"'
+    assert server.sent_headers[1]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert http_cache.stats["example.com"]["revalidated"] == 1
+
+    # the 304 made it fresh again
+    cached = http_cache.get(http_cache.key_for("GET", "https://example.com/page"))
+    assert cached is not None
+    assert cached.age < 60
+
+
+def test_changed_responses_replace_the_cached_one(http_cache: HttpCache, server: FakeServer) -> None:
+    server.responses.append(make_response(200, b"first", {"ETag": '"v1"'}))
+    server.responses.append(make_response(200, b"second", {"ETag": '"v2"'}))
+    session = CachedTestSession()
+
+    session.get("https://example.com/page")
+    _HttpCacheModel.update(stored_at=0).execute()
+
+    assert session.get("https://example.com/page").content == b"second"
+    cached = http_cache.get(http_cache.key_for("GET", "https://example.com/page"))
+    assert cached is not None
+    assert cached.etag == '"v2"'
@@ -1,7 +1,8 @@
 import pytest
 
 from danboorutools.logical.sessions.danbooru import danbooru_api
-from danboorutools.models.danbooru import DanbooruPost, DanbooruUser
+from danboorutools.models.danbooru import DanbooruPost, DanbooruPostVersion, DanbooruUser
+from tests.helpers.danbooru import post_version_payloads
 
 
 @pytest.mark.danbooru
@@ -57,3 +58,20 @@ def post_t(post: DanbooruPost) -> None:
     assert post.media_asset.file_ext == "jpg"
 
     assert post.media_asset.pixel_hash == "9c877dd5674d7fa251ce2de0c956fd36"
+
+
+def test_construct_trusted() -> None:
+    version_data, = post_version_payloads(1)
+    validated = DanbooruPostVersion(**version_data)
+
+    lean = DanbooruPostVersion.construct_trusted(version_data)
+    assert "updated_at" not in lean.__dict__
+    assert lean.updated_at == validated.updated_at
+    assert lean.post.tags == validated.post.tags
+    assert lean.post.source == validated.post.source
+    assert lean.model_dump() == validated.model_dump()
+
+    lean = DanbooruPostVersion.construct_trusted(version_data, keep_raw_data=False)
+    assert lean.model_dump_json() == validated.model_dump_json()
+    with pytest.raises(AttributeError):
+        assert lean.post.source
@@ -1,5 +1,6 @@
 import pytest
 
+from danboorutools.exceptions import NotAnUrlError
 from danboorutools.logical.parsable_url import ParsableUrl
 
 
@@ -7,3 +8,37 @@ from danboorutools.logical.parsable_url import ParsableUrl
 def test_parameter_parsing() -> None:
     url = "https://www.patreon.com/bePatron?c=170214\u0026rid=218676\u0026redirect_uri=/posts/makoto-nanaya-8366347"
     assert ParsableUrl(url).query == {"c": "170214", "rid": "218676", "redirect_uri": "/posts/makoto-nanaya-8366347"}
+
+
+@pytest.mark.parsing
+def test_hostname_splitting() -> None:
+    url = ParsableUrl("https://www.dlsite.co.jp:443/home/circle/profile/=/maker_id/RG12345.html")
+    assert (url.subdomain, url.domain, url.tld) == ("www", "dlsite.co.jp", "co.jp")
+
+    url = ParsableUrl("https://a.b.pixiv.net/")
+    assert (url.subdomain, url.domain, url.tld) == ("a.b", "pixiv.net", "net")
+    assert url.is_base_url is False
+
+
+@pytest.mark.parsing
+def test_lazy_query() -> None:
+    query = ParsableUrl("https://www.pixiv.net/member_illust.php?mode=medium&illust_id=18557054").query
+    assert query.get("return_to") is None
+    assert "page" not in query
+    assert query._parameters is None
+
+    assert query["illust_id"] == "18557054"
+    assert query.copy() == {"mode": "medium", "illust_id": "18557054"}
+
+    encoded = ParsableUrl("https://www.google.com/url?sa=i%26url%3Dhttps://example.com").query
+    assert encoded.get("url") == "https://example.com"
+
+
+@pytest.mark.parsing
+def test_from_many() -> None:
+    urls = ParsableUrl.from_many(["https://www.pixiv.net/users/1?p=2", "not an url", "https://localhost/"])
+    assert [url.raw_url for url in urls] == ["https://www.pixiv.net/users/1?p=2", "not an url", "https://localhost/"]
+    assert urls[0]._record is not None
+    assert (urls[0].subdomain, urls[0].url_parts, urls[0].query) == ("www", ["users", "1"], {"p": "2"})
+    with pytest.raises(NotAnUrlError):
+        urls[1].domain  # noqa: B018
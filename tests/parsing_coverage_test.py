@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from danboorutools.logical import parsing_coverage
+from danboorutools.logical.parsing_coverage import ChangedUrl, CoverageRun, ParsingCoverage
+from danboorutools.logical.url_corpus import CorpusEntry
+
+ENTRIES = [
+    CorpusEntry("pixiv.net", "https://danbooru.donmai.us/artists/1", "https://www.pixiv.net/users/1"),
+    CorpusEntry("pixiv.net", "https://danbooru.donmai.us/posts/2", "https://www.pixiv.net/artworks/2"),
+    CorpusEntry("example.com", "https://danbooru.donmai.us/posts/3", "https://example.com/3"),
+]
+
+
+@pytest.fixture
+def coverage(tmp_path: Path) -> Iterator[ParsingCoverage]:
+    original_path = parsing_coverage._coverage_database.database
+    parsing_coverage._coverage_database.init(tmp_path / "parsing_coverage.sqlite", pragmas={"journal_mode": "wal"})
+    yield ParsingCoverage()
+    parsing_coverage._coverage_database.init(original_path, pragmas={"journal_mode": "wal"})
+
+
+@pytest.mark.parsing
+def test_parser_version_per_domain(coverage: ParsingCoverage) -> None:
+    assert coverage.parser_version("amazon.com") == coverage.parser_version("amazon.co.jp")
+    assert coverage.parser_version("pixiv.net") != coverage.parser_version("twitter.com")
+    assert coverage.parser_version("example.com") == coverage.parser_version("unknown.example")
+    assert coverage.parser_version("example.com") not in (coverage.parser_version("pixiv.net"), coverage.parser_version("twitter.com"))
+
+
+@pytest.mark.parsing
+def test_parser_version_covers_imported_url_modules() -> None:
+    closure = parsing_coverage._module_closure(parsing_coverage._LOGICAL_FOLDER / "parsers" / "pixiv_net.py")
+
+    assert {f"{file.parent.name}/{file.name}" for file in closure} == {
+        "parsers/pixiv_net.py", "urls/fanbox.py", "urls/pixiv.py", "urls/pixiv_comic.py", "urls/pixiv_sketch.py",
+    }
+
+
+@pytest.mark.parsing
+def test_update_only_reparses_new_or_changed_parsers(coverage: ParsingCoverage, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert coverage.update(ENTRIES) == CoverageRun(run=1, total=3, parsed=3, changed=0)
+    assert coverage.unparsed_domains() == [("example.com", 1)]
+    assert coverage.changed_urls() == []
+
+    assert coverage.update(ENTRIES) == CoverageRun(run=2, total=3, parsed=0, changed=0)
+    assert sum(coverage.result_counts().values()) == 3
+
+    pixiv_version = coverage.parser_version("pixiv.net")
+    monkeypatch.setitem(coverage._versions, "pixiv_net", pixiv_version + "-changed")
+    monkeypatch.setattr(ParsingCoverage, "_parse_result", staticmethod(lambda url: "ChangedUrl" if url.endswith("/2") else "UnknownUrl"))
+
+    assert coverage.update(ENTRIES) == CoverageRun(run=3, total=3, parsed=2, changed=2)
+    assert coverage.changed_urls() == [
+        ChangedUrl("https://www.pixiv.net/users/1", "PixivArtistUrl", "UnknownUrl"),
+        ChangedUrl("https://www.pixiv.net/artworks/2", "PixivPostUrl", "ChangedUrl"),
+    ]
+    assert coverage.changed_urls(run=2) == []
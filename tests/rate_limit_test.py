@@ -0,0 +1,114 @@
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+import pytest
+
+from danboorutools.util import rate_limit
+from danboorutools.util.rate_limit import DEFAULT_BLOCK, REWARD_EVERY, FileLockRateLimiter, retry_after_seconds
+
+NOW = 1_700_000_000.0
+
+
+@pytest.mark.parametrize(("headers", "expected"), [
+    ({}, None),
+    ({"Retry-After": "12"}, 12),
+    ({"Retry-After": "-5"}, 0),
+    ({"Retry-After": "soon"}, None),
+    ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"}, 30),
+    ({"X-Rate-Limit-Remaining": "0", "X-Rate-Limit-Reset": str(NOW + 45)}, 45),
+    ({"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": "30"}, None),
+    ({"X-RateLimit-Remaining": "0"}, None),
+])
+def test_retry_after_seconds(monkeypatch: pytest.MonkeyPatch, headers: dict[str, str], expected: float | None) -> None:
+    monkeypatch.setattr(rate_limit.time, "time", lambda: NOW)
+    assert retry_after_seconds(headers) == expected
+
+
+def test_retry_after_seconds_http_date() -> None:
+    wait = retry_after_seconds({"Retry-After": formatdate(time.time() + 60, usegmt=True)})
+    assert wait is not None
+    assert 55 < wait <= 60
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = NOW
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_FOLDER", tmp_path)
+    return clock
+
+
+def test_reserve_spaces_out_calls_after_a_burst(clock: Clock) -> None:
+    limiter = FileLockRateLimiter(2, "test")
+
+    assert [limiter.reserve("site") for _ in range(4)] == [0, 0, 0.5, 1]
+    assert limiter.stats["site"] == {"calls": 4, "waited": 1.5, "max_wait": 1, "throttled": 0}
+
+    clock.now += 10
+    assert limiter.reserve("site") == 0
+
+
+@pytest.mark.usefixtures("clock")
+def test_reserve_is_shared_between_limiters() -> None:
+    FileLockRateLimiter(1, "test").reserve("site")
+
+    assert FileLockRateLimiter(1, "test").reserve("site") == 1
+    assert FileLockRateLimiter(1, "other").reserve("site") == 0
+
+
+def test_feedback_429_halves_the_rate_and_blocks(clock: Clock) -> None:
+    limiter = FileLockRateLimiter(2, "test", max_calls_per_second=4)
+
+    limiter.feedback("site", 429, {})
+    assert limiter.rate("site") == 1
+    assert limiter.reserve("site") == DEFAULT_BLOCK
+    assert limiter.stats["site"]["throttled"] == 1
+
+    clock.now += 100
+    limiter.feedback("site", 429, {"Retry-After": "5"})
+    assert limiter.rate("site") == 0.5
+    assert limiter.reserve("site") == 5
+
+
+@pytest.mark.usefixtures("clock")
+def test_feedback_exhausted_quota_blocks_without_lowering_the_rate() -> None:
+    limiter = FileLockRateLimiter(2, "test")
+
+    limiter.feedback("site", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "10"})
+    assert limiter.rate("site") == 2
+    assert limiter.reserve("site") == 10
+
+
+def test_feedback_healthy_responses_raise_the_rate_up_to_the_ceiling(clock: Clock) -> None:
+    limiter = FileLockRateLimiter(2, "test", max_calls_per_second=2.1)
+    limiter.feedback("site", 429, {})
+    clock.now += 100
+
+    for _ in range(REWARD_EVERY - 1):
+        limiter.feedback("site", 200, {})
+    assert limiter.rate("site") == 1
+    limiter.feedback("site", 200, {})
+    assert limiter.rate("site") == pytest.approx(1.1)
+
+    for _ in range(REWARD_EVERY * 20):
+        limiter.feedback("site", 200, {})
+    assert limiter.rate("site") == 2.1
+
+
+@pytest.mark.usefixtures("clock")
+def test_feedback_ignores_errors() -> None:
+    limiter = FileLockRateLimiter(2, "test")
+
+    for _ in range(REWARD_EVERY):
+        limiter.feedback("site", 500, {})
+    assert limiter.rate("site") == 2
+    assert limiter.reserve("site") == 0
@@ -0,0 +1,40 @@
+from collections.abc import Iterator
+import time
+from itertools import islice
+
+import pytest
+
+from danboorutools.util.threading import read_ahead
+
+
+def test_read_ahead_keeps_order() -> None:
+    assert list(read_ahead(range(100), depth=3)) == list(range(100))
+
+
+def test_read_ahead_raises_after_earlier_items() -> None:
+    def failing() -> Iterator[int]:
+        yield 1
+        yield 2
+        raise ValueError("broken page")
+
+    consumed = []
+    with pytest.raises(ValueError, match="broken page"):
+        consumed.extend(read_ahead(failing(), depth=2))
+    assert consumed == [1, 2]
+
+
+def test_read_ahead_stops_with_the_consumer() -> None:
+    produced = []
+
+    def counting() -> Iterator[int]:
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    reader = read_ahead(counting(), depth=2)
+    assert list(islice(reader, 5)) == [0, 1, 2, 3, 4]
+    reader.close()
+    time.sleep(0.3)
+
+    # the items already queued, plus the one blocked on a full queue
+    assert len(produced) <= 5 + 2 + 1
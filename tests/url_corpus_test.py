@@ -0,0 +1,26 @@
+from pathlib import Path
+
+import pytest
+
+from danboorutools.logical.url_corpus import CorpusEntry, read_corpus, write_corpus
+
+
+@pytest.mark.parsing
+def test_corpus_round_trip(tmp_path: Path) -> None:
+    corpus_file = tmp_path / "corpus.tsv.gz"
+    rows = [
+        ("https://danbooru.donmai.us/artists/1", "https://www.pixiv.net/users/1"),
+        ("https://danbooru.donmai.us/posts/2", "https://www.dlsite.co.jp/home/work/=/product_id/RJ1.html"),
+        ("https://danbooru.donmai.us/posts/3", "https://twitter.com/a\tb"),
+        ("https://danbooru.donmai.us/posts/4", "not an url"),
+    ]
+    assert write_corpus(corpus_file, rows) == 4
+
+    assert list(read_corpus(corpus_file)) == [
+        CorpusEntry("pixiv.net", "https://danbooru.donmai.us/artists/1", "https://www.pixiv.net/users/1"),
+        CorpusEntry("dlsite.co.jp", "https://danbooru.donmai.us/posts/2", "https://www.dlsite.co.jp/home/work/=/product_id/RJ1.html"),
+        CorpusEntry("twitter.com", "https://danbooru.donmai.us/posts/3", "https://twitter.com/a%09b"),
+        CorpusEntry("", "https://danbooru.donmai.us/posts/4", "not an url"),
+    ]
+    assert [e.resource_url for e in read_corpus(corpus_file, domain="DLSITE.co.jp")] == ["https://danbooru.donmai.us/posts/2"]
+    assert len(list(read_corpus(corpus_file, limit=2))) == 2
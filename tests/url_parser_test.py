@@ -0,0 +1,118 @@
+import pytest
+
+from danboorutools.logical.parsable_url import ParsableUrl
+from danboorutools.logical.parser_index import PARSER_MODULES
+from danboorutools.logical.url_parser import UrlParser, UrlPattern, parsers
+from danboorutools.logical.url_table import UrlTable
+from danboorutools.logical.urls.pixiv import PixivArtistUrl, PixivPostUrl
+from danboorutools.models.url import UnknownUrl
+from danboorutools.util.cache import BoundedCache
+
+
+@pytest.mark.parsing
+def test_parse_many_keeps_order() -> None:
+    urls = [
+        "https://www.pixiv.net/en/artworks/46324488",
+        "https://www.pixiv.net/users/9202877",
+        "https://www.example.com/some/path",
+    ] * 5
+
+    parsed = list(UrlParser.parse_many(urls, workers=2, chunksize=2))
+
+    assert [type(url) for url in parsed] == [PixivPostUrl, PixivArtistUrl, UnknownUrl] * 5
+    assert [url.parsed_url.raw_url for url in parsed] == urls
+    assert parsed == [UrlParser.parse(url) for url in urls]
+
+
+@pytest.mark.parsing
+def test_parse_cache_rebuilds_urls() -> None:
+    url_string = "https://patron.naver.com/grafolio/p/intro/138694"
+    UrlParser.parse_cache.delete(url_string)
+
+    first = UrlParser.parse(url_string)
+    hits = UrlParser.parse_cache.hits
+    second = UrlParser.parse(url_string)
+
+    assert UrlParser.parse_cache.hits == hits + 1
+    assert first == second
+    assert first is not second
+    assert second.parsed_url is not first.parsed_url
+    assert second.parsed_url.raw_url == first.parsed_url.raw_url
+    # attributes set by the parser, like is_deleted, must survive the cache too
+    assert _url_attributes(second) == _url_attributes(first)
+
+
+def _url_attributes(url: object) -> dict:
+    return {name: value for name, value in vars(url).items() if name != "parsed_url"}
+
+
+@pytest.mark.parsing
+def test_bounded_cache_eviction() -> None:
+    cache: BoundedCache[str, int] = BoundedCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats == {"entries": 2, "max_entries": 2, "bytes": 0, "hits": 1, "misses": 1, "evictions": 1}
+
+
+@pytest.mark.parsing
+def test_bounded_cache_byte_budget() -> None:
+    cache: BoundedCache[str, bytes] = BoundedCache(max_entries=10, max_bytes=10, sizeof=len)
+    cache.set("a", b"12345")
+    cache.set("b", b"1234")
+    cache.set("c", b"123")
+    cache.set("huge", b"12345678901")
+
+    assert "a" not in cache
+    assert "huge" not in cache
+    assert cache.total_bytes == 7
+    cache.set("b", b"1")
+    assert cache.total_bytes == 4
+
+
+@pytest.mark.parsing
+def test_parser_index_is_up_to_date() -> None:
+    # if this fails, run generate_parser_index
+    UrlParser.setup_subclasses()
+    declared_modules = {
+        domain: parser.__module__.removeprefix("danboorutools.logical.parsers.")
+        for domain, parser in parsers.items()
+        if parser.__module__.startswith("danboorutools.logical.parsers.")
+    }
+    assert PARSER_MODULES == declared_modules
+
+
+@pytest.mark.parsing
+def test_url_table_dispatch() -> None:
+    table = UrlTable([
+        UrlPattern("www|", "users/{user_id:int}/*", PixivArtistUrl),
+        UrlPattern("www", "{_lang}/artworks/{post_id:int}", PixivPostUrl),
+        UrlPattern("", "member_illust.php?illust_id={post_id:int}", PixivPostUrl),
+    ])
+
+    def match(url: str) -> object:
+        return table.match(ParsableUrl(url))
+
+    assert match("https://pixiv.net/users/123/novels") == PixivArtistUrl(parsed_url=ParsableUrl("https://pixiv.net/users/123"), user_id=123)
+    assert match("https://www.pixiv.net/en/artworks/456").post_id == 456
+    assert match("https://pixiv.net/member_illust.php?mode=big&illust_id=789").post_id == 789
+    assert match("https://pixiv.net/member_illust.php?mode=big") is None
+    assert match("https://www.pixiv.net/users/abc") is None
+    assert match("https://pixiv.net/en/artworks/456") is None
+    assert match("https://sketch.pixiv.net/users/123") is None
+
+
+@pytest.mark.parsing
+def test_url_identity_key() -> None:
+    first = UrlParser.parse("https://www.pixiv.net/en/artworks/46324488")
+    second = UrlParser.parse("http://pixiv.net/i/46324488")
+
+    assert first.identity_key == "pixivposturl[https://www.pixiv.net/en/artworks/46324488]"
+    assert first.identity_key is second.identity_key
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second, UrlParser.parse("https://www.pixiv.net/users/9202877")}) == 2
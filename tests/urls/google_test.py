@@ -1,10 +1,12 @@
 import pytest
 
+from danboorutools.exceptions import UnknownUrlError
 from danboorutools.logical.urls import google as g
 from danboorutools.logical.urls import google_drive as gd
 from danboorutools.logical.urls import google_photos as gph
 from danboorutools.logical.urls import google_plus as gpl
 from danboorutools.logical.urls import google_sites as gs
+from danboorutools.models.url import Url
 from tests.helpers.parsing import generate_parsing_test
 from tests.helpers.scraping import _TestArtistUrl, _TestInfoUrl
 
@@ -86,6 +88,19 @@ def test_parsing(raw_url, normalized_url, expected_class) -> None:
     generate_parsing_test(raw_url=raw_url, normalized_url=normalized_url, expected_class=expected_class)
 
 
+@pytest.mark.parametrize(
+    "raw_url",
+    [
+        "https://drive.google.com/folderview?usp=sharing",
+        "https://drive.google.com/open",
+        "https://drive.google.com/uc?export=download",
+    ],
+)
+def test_parsing_drive_without_id(raw_url) -> None:
+    with pytest.raises(UnknownUrlError):
+        Url.parse(raw_url)
+
+
 class TestGooglePlusArtistUrl1(_TestArtistUrl):
     url_string = "https://plus.google.com/+KazuhiroMizushima"
     url_type = gpl.GooglePlusArtistUrl
@@ -1,6 +1,8 @@
 import pytest
 
+from danboorutools.exceptions import UnknownUrlError
 from danboorutools.logical.urls import pixiv as p
+from danboorutools.models.url import Url
 from tests.helpers.parsing import generate_parsing_test
 from tests.helpers.scraping import _TestArtistUrl, _TestInfoUrl, _TestPostUrl, _TestRedirectUrl
 
@@ -59,6 +61,8 @@ urls = {
         "https://www.pixiv.net/user/13569921/series/81967": "https://www.pixiv.net/en/users/13569921",
         "https://www.pixiv.net/en/users/9202877": "https://www.pixiv.net/en/users/9202877",
         "https://www.pixiv.net/en/users/76567/novels": "https://www.pixiv.net/en/users/76567",
+        "https://www.pixiv.net/users/9202877/illustrations/tag": "https://www.pixiv.net/en/users/9202877",
+        "https://www.pixiv.net/en/users/9202877/illustrations/tag": "https://www.pixiv.net/en/users/9202877",
 
         "https://www.pixiv.net/member.php?id=339253": "https://www.pixiv.net/en/users/339253",
         "http://www.pixiv.net/novel/member.php?id=76567": "https://www.pixiv.net/en/users/76567",
@@ -111,6 +115,33 @@ def test_parsing(raw_url, normalized_url, expected_class) -> None:
     generate_parsing_test(raw_url=raw_url, normalized_url=normalized_url, expected_class=expected_class)
 
 
+@pytest.mark.parametrize(
+    "raw_url, page",
+    [
+        ("https://www.pixiv.net/en/artworks/92045058#big_11", 11),
+        ("https://www.pixiv.net/artworks/92045058#big_0", 0),
+        ("http://www.pixiv.net/i/92045058#big_2", 2),
+    ],
+)
+def test_parsing_page_fragments(raw_url, page) -> None:
+    url = Url.parse(raw_url)
+    assert isinstance(url, p.PixivImageUrl)
+    assert url.post_id == 92045058
+    assert url.page == page
+
+
+@pytest.mark.parametrize(
+    "raw_url",
+    [
+        "http://www.pixiv.net/member_illust.php?mode=medium",
+        "https://www.pixiv.net/index.php",
+    ],
+)
+def test_parsing_without_illust_id(raw_url) -> None:
+    with pytest.raises(UnknownUrlError):
+        Url.parse(raw_url)
+
+
 class TestPixivArtistUrl(_TestArtistUrl):
     url_string = "https://www.pixiv.net/en/users/10183321/artworks"
     url_type = p.PixivArtistUrl